@@ -0,0 +1,36 @@
+"""baseline articles table
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+Existing databases created by Base.metadata.create_all() before migrations
+were introduced should be stamped at this revision: ``alembic stamp 0001``.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "articles",
+        sa.Column("article_id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("summary", sa.Text(), nullable=True),
+        sa.Column("link", sa.String(length=500), nullable=False),
+        sa.Column("publication_date", sa.DateTime(), nullable=False),
+        sa.Column("source", sa.String(length=100), nullable=False),
+    )
+    op.create_index("ix_articles_article_id", "articles", ["article_id"])
+
+
+def downgrade():
+    op.drop_index("ix_articles_article_id", table_name="articles")
+    op.drop_table("articles")
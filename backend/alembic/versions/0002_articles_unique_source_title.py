@@ -0,0 +1,37 @@
+"""unique (source, title) on articles
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+Removes duplicates left behind by the old SELECT-then-INSERT refresh loop,
+keeping the oldest row of each (source, title), then adds the constraint
+used by the bulk ingestion path.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        """
+        DELETE FROM articles
+        WHERE article_id NOT IN (
+            SELECT MIN(article_id) FROM articles GROUP BY source, title
+        )
+        """
+    )
+    with op.batch_alter_table("articles") as batch_op:
+        batch_op.create_unique_constraint("uq_articles_source_title", ["source", "title"])
+
+
+def downgrade():
+    with op.batch_alter_table("articles") as batch_op:
+        batch_op.drop_constraint("uq_articles_source_title", type_="unique")
@@ -0,0 +1,61 @@
+"""read path indexes and sources table
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+Adds descending publication_date indexes for /articles/ and a sources table
+that replaces the SELECT DISTINCT behind /sources/, filled from the
+existing articles. On PostgreSQL the indexes are built CONCURRENTLY so large
+archives stay writable meanwhile.
+
+Databases served by the app before being stamped may already hold an empty
+sources table made by create_all(); it is kept and refilled.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ("ix_articles_source_publication_date", [sa.text("source"), sa.text("publication_date DESC")]),
+    ("ix_articles_publication_date", [sa.text("publication_date DESC")]),
+)
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table("sources"):
+        op.execute("DELETE FROM sources")
+    else:
+        op.create_table(
+            "sources",
+            sa.Column("name", sa.String(length=100), primary_key=True),
+            sa.Column("article_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("last_ingested_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        )
+    op.execute(
+        """
+        INSERT INTO sources (name, article_count, last_ingested_at)
+        SELECT source, COUNT(*), MAX(publication_date) FROM articles GROUP BY source
+        """
+    )
+
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, columns in INDEXES:
+                op.create_index(name, "articles", columns, postgresql_concurrently=True)
+    else:
+        for name, columns in INDEXES:
+            op.create_index(name, "articles", columns)
+
+
+def downgrade():
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name="articles")
+    op.drop_table("sources")
@@ -0,0 +1,55 @@
+"""extend read path indexes with article_id for keyset pagination
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+/articles/ pages on (publication_date, article_id). The new indexes are
+built before the old ones are dropped so reads are never left unindexed.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+NEW_INDEXES = (
+    (
+        "ix_articles_source_publication_date_id",
+        [sa.text("source"), sa.text("publication_date DESC"), sa.text("article_id DESC")],
+    ),
+    ("ix_articles_publication_date_id", [sa.text("publication_date DESC"), sa.text("article_id DESC")]),
+)
+
+OLD_INDEXES = (
+    ("ix_articles_source_publication_date", [sa.text("source"), sa.text("publication_date DESC")]),
+    ("ix_articles_publication_date", [sa.text("publication_date DESC")]),
+)
+
+
+def _swap(create, drop):
+    concurrently = op.get_bind().dialect.name == "postgresql"
+    if concurrently:
+        with op.get_context().autocommit_block():
+            for name, columns in create:
+                op.create_index(name, "articles", columns, postgresql_concurrently=True)
+            for name, _ in drop:
+                op.drop_index(name, table_name="articles", postgresql_concurrently=True)
+    else:
+        for name, columns in create:
+            op.create_index(name, "articles", columns)
+        for name, _ in drop:
+            op.drop_index(name, table_name="articles")
+
+
+def upgrade():
+    _swap(NEW_INDEXES, OLD_INDEXES)
+
+
+def downgrade():
+    _swap(OLD_INDEXES, NEW_INDEXES)
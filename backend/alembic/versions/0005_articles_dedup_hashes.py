@@ -0,0 +1,133 @@
+"""url_hash / title_hash dedup keys on articles
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+Adds the canonical URL and title fingerprint hashes used by the in-memory
+dedup index, fills them for existing rows, removes the duplicates they
+reveal (revised arXiv versions, edited headlines) keeping the oldest row,
+and adds the unique (source, url_hash) index.
+
+The hashing is a copy of app.dedup as of this revision, so the migration
+keeps computing the same keys whatever later becomes of the app code.
+"""
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src", "guccounter", "guce_referrer"}
+_ARXIV_VERSION = re.compile(r"^/(?:abs|pdf)/(.+?)(?:v\d+)?(?:\.pdf)?$")
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def _hash64(value):
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def canonical_url(url):
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host.endswith(":443") or host.endswith(":80"):
+        host = host.rsplit(":", 1)[0]
+    path = parts.path or "/"
+    if host.endswith("arxiv.org"):
+        host = "arxiv.org"
+        match = _ARXIV_VERSION.match(path)
+        if match:
+            path = "/abs/" + match.group(1)
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def url_hash(url):
+    if not url or not url.strip():
+        return None
+    return _hash64(canonical_url(url))
+
+
+def title_hash(title):
+    fingerprint = " ".join(_NON_WORD.sub(" ", (title or "").casefold()).split())
+    return _hash64(fingerprint) if fingerprint else None
+
+
+def _backfill():
+    conn = op.get_bind()
+    articles = sa.table(
+        "articles",
+        sa.column("article_id", sa.Integer),
+        sa.column("link", sa.String),
+        sa.column("title", sa.String),
+        sa.column("url_hash", sa.BigInteger),
+        sa.column("title_hash", sa.BigInteger),
+    )
+    update = (
+        articles.update()
+        .where(articles.c.article_id == sa.bindparam("id"))
+        .values(url_hash=sa.bindparam("u"), title_hash=sa.bindparam("t"))
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select([articles.c.article_id, articles.c.link, articles.c.title])
+            .where(articles.c.article_id > last_id)
+            .order_by(articles.c.article_id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        conn.execute(update, [{"id": row[0], "u": url_hash(row[1]), "t": title_hash(row[2])} for row in rows])
+        last_id = rows[-1][0]
+
+
+def upgrade():
+    with op.batch_alter_table("articles") as batch_op:
+        batch_op.add_column(sa.Column("url_hash", sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column("title_hash", sa.BigInteger(), nullable=True))
+
+    _backfill()
+    op.execute(
+        """
+        DELETE FROM articles
+        WHERE url_hash IS NOT NULL AND article_id NOT IN (
+            SELECT MIN(article_id) FROM articles WHERE url_hash IS NOT NULL GROUP BY source, url_hash
+        )
+        """
+    )
+    op.execute("UPDATE sources SET article_count = (SELECT COUNT(*) FROM articles WHERE articles.source = sources.name)")
+
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "uq_articles_source_url_hash", "articles", ["source", "url_hash"],
+                unique=True, postgresql_concurrently=True,
+            )
+    else:
+        op.create_index("uq_articles_source_url_hash", "articles", ["source", "url_hash"], unique=True)
+
+
+def downgrade():
+    op.drop_index("uq_articles_source_url_hash", table_name="articles")
+    with op.batch_alter_table("articles") as batch_op:
+        batch_op.drop_column("title_hash")
+        batch_op.drop_column("url_hash")
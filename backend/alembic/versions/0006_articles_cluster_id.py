@@ -0,0 +1,43 @@
+"""cluster_id on articles for near-duplicate collapsing
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+Existing rows start as singleton clusters keyed by their own dedup hash;
+only articles ingested from now on are matched against each other.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+INDEX = (
+    "ix_articles_cluster_publication_date_id",
+    [sa.text("cluster_id"), sa.text("publication_date DESC"), sa.text("article_id DESC")],
+)
+
+
+def upgrade():
+    with op.batch_alter_table("articles") as batch_op:
+        batch_op.add_column(sa.Column("cluster_id", sa.BigInteger(), nullable=True))
+    op.execute("UPDATE articles SET cluster_id = COALESCE(url_hash, title_hash)")
+
+    name, columns = INDEX
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(name, "articles", columns, postgresql_concurrently=True)
+    else:
+        op.create_index(name, "articles", columns)
+
+
+def downgrade():
+    op.drop_index(INDEX[0], table_name="articles")
+    with op.batch_alter_table("articles") as batch_op:
+        batch_op.drop_column("cluster_id")
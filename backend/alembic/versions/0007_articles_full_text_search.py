@@ -0,0 +1,84 @@
+"""full-text search over article titles and summaries
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+
+PostgreSQL gets a stored generated tsvector column with a GIN index (12+),
+SQLite an FTS5 table kept in sync by triggers.
+
+The statements are a copy of app.search as of this revision (which applies
+them to databases built by create_all()), so later edits to the app code
+do not change what this migration does.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+POSTGRES_COLUMN = """
+    ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(summary, '')), 'B')
+    ) STORED
+"""
+
+POSTGRES_INDEX = "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_articles_search_vector ON articles USING GIN (search_vector)"
+
+SQLITE_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        title, summary, content='articles', content_rowid='article_id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts(rowid, title, summary) VALUES (new.article_id, new.title, new.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, summary)
+        VALUES ('delete', old.article_id, old.title, old.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, summary ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, summary)
+        VALUES ('delete', old.article_id, old.title, old.summary);
+        INSERT INTO articles_fts(rowid, title, summary) VALUES (new.article_id, new.title, new.summary);
+    END
+    """,
+    # Index the rows stored before the table existed
+    "INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')",
+)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute(POSTGRES_COLUMN)
+        with op.get_context().autocommit_block():
+            op.execute(POSTGRES_INDEX)
+    elif dialect == "sqlite":
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index("ix_articles_search_vector", table_name="articles", postgresql_concurrently=True)
+        op.drop_column("articles", "search_vector")
+    elif dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS articles_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS articles_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS articles_fts_insert")
+        op.execute("DROP TABLE IF EXISTS articles_fts")
@@ -0,0 +1,66 @@
+"""refresh runs and jobs shared by the workers
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+
+refresh_runs keeps the outcome of the latest refresh of each source, which
+workers that waited on another worker's run return instead of scraping the
+source again. refresh_jobs makes /refresh-articles/{job_id} answerable from
+any worker.
+
+Both tables are skipped when create_all() already made them on a database
+served by the app before being stamped.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if "refresh_runs" not in existing:
+        _create_refresh_runs()
+    if "refresh_jobs" not in existing:
+        _create_refresh_jobs()
+
+
+def _create_refresh_runs():
+    op.create_table(
+        "refresh_runs",
+        sa.Column("source", sa.String(length=100), primary_key=True),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("fetched", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("inserted", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text()),
+        sa.Column("started_at", sa.DateTime(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=False),
+    )
+
+
+def _create_refresh_jobs():
+    op.create_table(
+        "refresh_jobs",
+        sa.Column("job_id", sa.String(length=32), primary_key=True),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("sources", sa.JSON(), nullable=False),
+        sa.Column("results", sa.JSON(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text()),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime()),
+        sa.Column("finished_at", sa.DateTime()),
+    )
+    op.create_index("ix_refresh_jobs_created_at", "refresh_jobs", ["created_at"])
+
+
+def downgrade():
+    op.drop_index("ix_refresh_jobs_created_at", table_name="refresh_jobs")
+    op.drop_table("refresh_jobs")
+    op.drop_table("refresh_runs")
@@ -0,0 +1,40 @@
+"""
+Backfill arXiv papers for a past window over OAI-PMH without moving the
+incremental harvest position.
+
+    cd backend && python -m app.backfill --since 2026-01-01 --until 2026-01-31
+"""
+import argparse
+import asyncio
+from datetime import date, datetime
+from typing import Optional
+from .ingestion import ingest_articles
+from .scrapers.arxiv_scraper import ArxivScraper
+
+
+def _day(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+async def backfill_arxiv(since: date, until: Optional[date] = None) -> int:
+    scraper = ArxivScraper(mode="oai")
+    try:
+        articles = await scraper.harvest(since=since, until=until)
+    finally:
+        if scraper.http is not None:
+            await scraper.http.close()
+    inserted = ingest_articles(articles)
+    return inserted.get(scraper.source_name, 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--since", type=_day, required=True, help="first datestamp to harvest (YYYY-MM-DD)")
+    parser.add_argument("--until", type=_day, help="last datestamp to harvest (YYYY-MM-DD)")
+    args = parser.parse_args()
+    count = asyncio.run(backfill_arxiv(args.since, args.until))
+    print(f"Backfill stored {count} new articles")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+from fastapi import Request, Response
+from .config import settings
+from .export import json_default
+
+# Tag carried by entries that depend on every source (unfiltered lists, /sources/)
+ALL_SOURCES = "*"
+
+CacheKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class CacheEntry:
+    __slots__ = ("body", "etag", "headers", "tags", "expires_at")
+
+    def __init__(self, body: bytes, headers: Dict[str, str], tags: Tuple[str, ...], expires_at: float):
+        self.body = body
+        self.etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        self.headers = headers
+        self.tags = tags
+        self.expires_at = expires_at
+
+
+def dump_json(content) -> bytes:
+    """Serialize like JSONResponse does, without going through Pydantic"""
+    return json.dumps(
+        content,
+        default=json_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class ResponseCache:
+    """
+    In-process TTL + LRU cache of pre-serialized JSON responses.
+
+    Entries are tagged with the source they depend on (or ALL_SOURCES) so a
+    refresh only evicts what its newly inserted rows can actually change.
+    Inserts made by other worker processes reach this cache through
+    sync_versions().
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        self.max_entries = max_entries or settings.RESPONSE_CACHE_MAX_ENTRIES
+        self.ttl = ttl if ttl is not None else settings.RESPONSE_CACHE_TTL
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._versions: Optional[Dict[str, int]] = None
+
+    @staticmethod
+    def key(request: Request) -> CacheKey:
+        """Path plus sorted, non-empty query params"""
+        params = tuple(sorted((k, v) for k, v in request.query_params.multi_items() if v != ""))
+        return request.url.path, params
+
+    def get(self, key: CacheKey) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(
+        self,
+        key: CacheKey,
+        body: bytes,
+        source: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> CacheEntry:
+        entry = CacheEntry(
+            body,
+            headers or {},
+            (source or ALL_SOURCES,),
+            time.monotonic() + self.ttl,
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate_sources(self, sources: Iterable[str]) -> int:
+        """Drop entries that can change when the given sources get new rows"""
+        affected = set(sources)
+        if not affected:
+            return 0
+        affected.add(ALL_SOURCES)
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if affected.intersection(entry.tags)]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def sync_versions(self, versions: Dict[str, int]) -> int:
+        """
+        Evict the entries of the sources whose version (article count) moved
+        since the last call, whichever worker inserted the rows
+        """
+        previous, self._versions = self._versions, dict(versions)
+        if previous is None:
+            return 0
+        changed = [name for name, version in versions.items() if previous.get(name) != version]
+        return self.invalidate_sources(changed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def respond(entry: CacheEntry, request: Request) -> Response:
+        """Build the response, answering 304 when the client already has it"""
+        headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            candidates = {tag.strip().replace("W/", "", 1) for tag in if_none_match.split(",")}
+            if entry.etag in candidates or "*" in candidates:
+                return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+response_cache = ResponseCache()
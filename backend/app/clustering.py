@@ -0,0 +1,213 @@
+"""
+Near-duplicate clustering of articles across sources with MinHash + LSH.
+
+Each article is reduced to the set of word shingles of its (weighted)
+title and the start of its summary, summarized by a MinHash signature.
+Signatures are cut into bands and indexed by band hash, so finding the
+near-duplicates of a new article only looks at the recent articles sharing
+at least one band (sublinear in the number of indexed articles) instead of
+comparing every pair.
+
+The cluster id of an article is the dedup key (app.dedup) of the first
+article of its cluster, so it is known before the row is inserted.
+"""
+import random
+import threading
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from .config import settings
+from .dedup import title_fingerprint, title_hash, url_hash
+
+_PRIME = (1 << 61) - 1
+
+Signature = Tuple[int, ...]
+# (dedup key, cluster_id, signature, publication_date)
+Entry = Tuple[int, int, Signature, datetime]
+# dedup key -> (cluster_id, signature, publication_date)
+Entries = Dict[int, Tuple[int, Signature, datetime]]
+Buckets = Dict[Tuple[int, Signature], Set[int]]
+
+
+def _ngrams(text: str, size: int) -> List[str]:
+    words = text.split()
+    if len(words) <= size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+def shingles(
+    title: Optional[str],
+    summary: Optional[str],
+    size: int = 2,
+    title_weight: int = 3,
+    summary_words: int = 15,
+) -> Set[int]:
+    """
+    Hashed word n-grams of the normalized title and the first words of the
+    summary. Summaries of one story differ a lot between sources (an excerpt
+    on one, "By author | likes" on another), so every title shingle is
+    counted title_weight times to keep the title the main signal.
+    """
+    result = set()
+    for gram in _ngrams(title_fingerprint(title), size):
+        for copy in range(title_weight):
+            result.add(zlib.crc32(f"{copy}\x00{gram}".encode("utf-8")))
+    summary_text = " ".join(title_fingerprint(summary).split()[:summary_words])
+    for gram in _ngrams(summary_text, size):
+        result.add(zlib.crc32(gram.encode("utf-8")))
+    return result
+
+
+class MinHasher:
+    """MinHash over 32-bit shingle hashes with universal hash permutations"""
+
+    def __init__(self, num_perm: int, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    def signature(self, hashed: Set[int]) -> Signature:
+        if not hashed:
+            return ()
+        return tuple(min((a * x + b) % _PRIME for x in hashed) for a, b in self._params)
+
+
+def similarity(a: Signature, b: Signature) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    if not a or len(a) != len(b):
+        return 0.0
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class ClusterIndex:
+    """
+    LSH index over the signatures of recent articles (CLUSTER_WINDOW_DAYS).
+
+    With b bands of r rows, two articles become candidates with probability
+    1 - (1 - s^r)^b for Jaccard similarity s; candidates are then confirmed
+    against CLUSTER_THRESHOLD using the full signatures.
+    """
+
+    def __init__(
+        self,
+        num_perm: Optional[int] = None,
+        bands: Optional[int] = None,
+        threshold: Optional[float] = None,
+        window_days: Optional[float] = None,
+    ):
+        num_perm = num_perm or settings.MINHASH_PERMUTATIONS
+        self.bands = bands or settings.LSH_BANDS
+        if num_perm % self.bands:
+            raise ValueError("MINHASH_PERMUTATIONS must be a multiple of LSH_BANDS")
+        self.rows = num_perm // self.bands
+        self.threshold = settings.CLUSTER_THRESHOLD if threshold is None else threshold
+        self.window = timedelta(days=window_days or settings.CLUSTER_WINDOW_DAYS)
+        self.hasher = MinHasher(num_perm)
+        self._lock = threading.Lock()
+        self._entries: Entries = {}
+        self._buckets: Buckets = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _band_keys(self, signature: Signature) -> List[Tuple[int, Signature]]:
+        return [(band, signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    def signature(self, article: Dict) -> Signature:
+        return self.hasher.signature(shingles(article.get("title"), article.get("summary")))
+
+    def _best_match(self, signature: Signature, *indexes: Tuple[Entries, Buckets]) -> Optional[int]:
+        best, best_score = None, self.threshold
+        for entries, buckets in indexes:
+            candidates: Set[int] = set()
+            for band_key in self._band_keys(signature):
+                candidates.update(buckets.get(band_key, ()))
+            for key in candidates:
+                cluster_id, other, _ = entries[key]
+                score = similarity(signature, other)
+                if score >= best_score:
+                    best, best_score = cluster_id, score
+        return best
+
+    def _add(self, entry: Entry, entries: Entries, buckets: Buckets) -> None:
+        key, cluster_id, signature, published = entry
+        if key in entries:
+            self._remove(key, entries, buckets)
+        entries[key] = (cluster_id, signature, published)
+        for band_key in self._band_keys(signature):
+            buckets.setdefault(band_key, set()).add(key)
+
+    def _remove(self, key: int, entries: Entries, buckets: Buckets) -> None:
+        _, signature, _ = entries.pop(key)
+        for band_key in self._band_keys(signature):
+            bucket = buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del buckets[band_key]
+
+    def prune(self, now: Optional[datetime] = None) -> int:
+        """Forget articles published before the window; returns how many"""
+        horizon = (now or datetime.utcnow()) - self.window
+        expired = [key for key, (_, _, published) in self._entries.items() if published < horizon]
+        for key in expired:
+            self._remove(key, self._entries, self._buckets)
+        return len(expired)
+
+    def assign(self, articles: Iterable[Dict]) -> List[Entry]:
+        """
+        Set article["cluster_id"] on every article: the cluster of its
+        closest recent near-duplicate, earlier articles of the same batch
+        included, or a new cluster keyed by its own dedup key.
+
+        The index is not changed: the returned entries are added with add()
+        once the articles are committed, so a rolled back batch leaves no
+        cluster behind that later articles could join.
+        """
+        horizon = datetime.utcnow() - self.window
+        pending: List[Entry] = []
+        # The batch's own entries, for its near-duplicates of each other
+        batch: Tuple[Entries, Buckets] = ({}, {})
+        with self._lock:
+            self.prune()
+            for article in articles:
+                key = url_hash(article.get("link")) or title_hash(article.get("title"))
+                if key is None:
+                    continue
+                signature = self.signature(article)
+                if not signature:
+                    article["cluster_id"] = key
+                    continue
+                cluster_id = self._best_match(signature, (self._entries, self._buckets), batch) or key
+                article["cluster_id"] = cluster_id
+                published = article.get("publication_date") or datetime.utcnow()
+                if published.tzinfo is not None:
+                    published = published.astimezone(timezone.utc).replace(tzinfo=None)
+                if published >= horizon:
+                    entry = (key, cluster_id, signature, published)
+                    self._add(entry, *batch)
+                    pending.append(entry)
+        return pending
+
+    def add(self, entries: Iterable[Entry]) -> None:
+        """Index the entries returned by assign() for a committed batch"""
+        with self._lock:
+            for entry in entries:
+                self._add(entry, self._entries, self._buckets)
+
+    def load(self, rows: Iterable[Tuple[Optional[int], Optional[int], str, Optional[str], datetime]]) -> int:
+        """Rebuild from (url_hash, cluster_id, title, summary, publication_date) rows of the window"""
+        with self._lock:
+            self._entries, self._buckets = {}, {}
+            for key, cluster_id, title, summary, published in rows:
+                key = key or title_hash(title)
+                if key is None:
+                    continue
+                signature = self.hasher.signature(shingles(title, summary))
+                if signature:
+                    self._add((key, cluster_id or key, signature, published), self._entries, self._buckets)
+        return len(self._entries)
+
+
+cluster_index = ClusterIndex()
@@ -8,4 +8,139 @@ class Settings:
     CORS_ORIGINS: list = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
     PORT: int = int(os.getenv("PORT", "8000"))
 
-settings = Settings() 
\ No newline at end of file
+    # Scraper fan-out
+    SCRAPER_CONCURRENCY: int = int(os.getenv("SCRAPER_CONCURRENCY", "6"))
+    SCRAPER_SOURCE_TIMEOUT: float = float(os.getenv("SCRAPER_SOURCE_TIMEOUT", "45"))
+    SCRAPER_DEADLINE: float = float(os.getenv("SCRAPER_DEADLINE", "90"))
+
+    # Shared scraper HTTP client
+    SCRAPER_USER_AGENT: str = os.getenv(
+        "SCRAPER_USER_AGENT",
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    )
+    HTTP_TIMEOUT: float = float(os.getenv("HTTP_TIMEOUT", "30"))
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "50"))
+    HTTP_MAX_KEEPALIVE: int = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "120"))
+    HTTP_PER_HOST_LIMIT: int = int(os.getenv("HTTP_PER_HOST_LIMIT", "4"))
+    HTTP2: bool = os.getenv("HTTP2", "true").lower() in ("1", "true", "yes")
+
+    # Conditional GET validator cache
+    HTTP_CACHE_ENABLED: bool = os.getenv("HTTP_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    HTTP_CACHE_PATH: str = os.getenv("HTTP_CACHE_PATH", ".cache/http_validators.json")
+
+    # Bulk ingestion
+    INSERT_BATCH_SIZE: int = int(os.getenv("INSERT_BATCH_SIZE", "500"))
+
+    # /articles/ pagination
+    ARTICLES_DEFAULT_LIMIT: int = int(os.getenv("ARTICLES_DEFAULT_LIMIT", "100"))
+    ARTICLES_MAX_LIMIT: int = int(os.getenv("ARTICLES_MAX_LIMIT", "500"))
+
+    # In-process response cache for /articles/ and /sources/
+    RESPONSE_CACHE_TTL: float = float(os.getenv("RESPONSE_CACHE_TTL", "60"))
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+
+    # Background refresh scheduler
+    SCHEDULER_ENABLED: bool = os.getenv("SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes")
+    SCHEDULER_INTERVAL: float = float(os.getenv("SCHEDULER_INTERVAL", "1800"))
+    SCHEDULER_SOURCE_INTERVALS: str = os.getenv("SCHEDULER_SOURCE_INTERVALS", "")
+    SCHEDULER_JITTER: float = float(os.getenv("SCHEDULER_JITTER", "0.1"))
+    SCHEDULER_INITIAL_DELAY: float = float(os.getenv("SCHEDULER_INITIAL_DELAY", "30"))
+    SCHEDULER_BACKOFF_BASE: float = float(os.getenv("SCHEDULER_BACKOFF_BASE", "60"))
+    SCHEDULER_MAX_BACKOFF: float = float(os.getenv("SCHEDULER_MAX_BACKOFF", "3600"))
+
+    # HTML parsing off the event loop: "process", "thread", "inline" or
+    # "auto" (process, a small thread pool per worker when WEB_CONCURRENCY > 1)
+    PARSE_POOL: str = os.getenv("PARSE_POOL", "auto")
+    PARSE_WORKERS: int = int(os.getenv("PARSE_WORKERS", "0"))
+    # HTML parser backend: "lxml", "selectolax" or "html.parser"
+    HTML_PARSER: str = os.getenv("HTML_PARSER", "lxml")
+
+    # arXiv ingestion: "oai" harvests incrementally over OAI-PMH, "html"
+    # scrapes the /list/<category>/new page
+    ARXIV_MODE: str = os.getenv("ARXIV_MODE", "oai")
+    ARXIV_OAI_URL: str = os.getenv("ARXIV_OAI_URL", "https://export.arxiv.org/oai2")
+    ARXIV_OAI_SET: str = os.getenv("ARXIV_OAI_SET", "cs")
+    ARXIV_CATEGORY: str = os.getenv("ARXIV_CATEGORY", "cs.AI")
+    ARXIV_STATE_PATH: str = os.getenv("ARXIV_STATE_PATH", ".cache/arxiv_oai_state.json")
+    # How far back the first harvest (no stored high-water mark) reaches
+    ARXIV_INITIAL_DAYS: int = int(os.getenv("ARXIV_INITIAL_DAYS", "3"))
+    # Budget of one harvest run in place of SCRAPER_SOURCE_TIMEOUT; a run
+    # cut short resumes from its last stored resumption token
+    ARXIV_HARVEST_TIMEOUT: float = float(os.getenv("ARXIV_HARVEST_TIMEOUT", "600"))
+
+    # Listing pagination: pages walked per refresh at most, and how many are
+    # fetched at once past the first
+    SCRAPER_MAX_PAGES: int = int(os.getenv("SCRAPER_MAX_PAGES", "5"))
+    SCRAPER_PAGE_CONCURRENCY: int = int(os.getenv("SCRAPER_PAGE_CONCURRENCY", "2"))
+
+    # Near-duplicate clustering (MinHash + LSH) of recent articles
+    CLUSTER_ENABLED: bool = os.getenv("CLUSTER_ENABLED", "true").lower() in ("1", "true", "yes")
+    CLUSTER_WINDOW_DAYS: float = float(os.getenv("CLUSTER_WINDOW_DAYS", "7"))
+    CLUSTER_THRESHOLD: float = float(os.getenv("CLUSTER_THRESHOLD", "0.5"))
+    MINHASH_PERMUTATIONS: int = int(os.getenv("MINHASH_PERMUTATIONS", "64"))
+    LSH_BANDS: int = int(os.getenv("LSH_BANDS", "16"))
+
+    # /search page size
+    SEARCH_DEFAULT_LIMIT: int = int(os.getenv("SEARCH_DEFAULT_LIMIT", "20"))
+    SEARCH_MAX_LIMIT: int = int(os.getenv("SEARCH_MAX_LIMIT", "100"))
+
+    # Logging: level name and "text" or "json" output
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")
+
+    # Database pools (PostgreSQL) and the async engine used by the API handlers.
+    # DB_ASYNC=false, or a missing asyncpg / aiosqlite driver, runs the
+    # handlers' queries on the sync engine in the threadpool instead
+    DB_ASYNC: bool = os.getenv("DB_ASYNC", "true").lower() in ("1", "true", "yes")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+
+    # Politeness: per-host token bucket (HTTP_HOST_RATE requests/s, 0 for no
+    # limit, lowered by robots.txt Crawl-delay), retries with exponential
+    # backoff and jitter or Retry-After, and a circuit breaker per source
+    HTTP_HOST_RATE: float = float(os.getenv("HTTP_HOST_RATE", "1"))
+    HTTP_HOST_BURST: float = float(os.getenv("HTTP_HOST_BURST", "3"))
+    HTTP_MAX_RETRIES: int = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+    HTTP_BACKOFF_BASE: float = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+    HTTP_BACKOFF_MAX: float = float(os.getenv("HTTP_BACKOFF_MAX", "30"))
+    HTTP_MAX_RETRY_AFTER: float = float(os.getenv("HTTP_MAX_RETRY_AFTER", "60"))
+    HTTP_RESPECT_ROBOTS: bool = os.getenv("HTTP_RESPECT_ROBOTS", "true").lower() in ("1", "true", "yes")
+    HTTP_ROBOTS_TTL: float = float(os.getenv("HTTP_ROBOTS_TTL", "21600"))
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_COOLDOWN: float = float(os.getenv("CIRCUIT_COOLDOWN", "300"))
+
+    # Streaming ingestion pipeline: page batches buffered between stages,
+    # and rows per insert / longest wait before a partial batch is written
+    PIPELINE_QUEUE_SIZE: int = int(os.getenv("PIPELINE_QUEUE_SIZE", "8"))
+    PIPELINE_BATCH_SIZE: int = int(os.getenv("PIPELINE_BATCH_SIZE", "200"))
+    PIPELINE_FLUSH_SECONDS: float = float(os.getenv("PIPELINE_FLUSH_SECONDS", "1"))
+
+    # JSON file of declarative source specs; empty uses the bundled
+    # app/scrapers/sources.json
+    SCRAPER_SOURCES_PATH: str = os.getenv("SCRAPER_SOURCES_PATH", "")
+
+    # Raw listing page archive (app/scrapers/archive.py) for offline re-parsing
+    # with python -m app.reparse; zstd level, or gzip's when zstandard is missing
+    SNAPSHOT_ARCHIVE_ENABLED: bool = os.getenv("SNAPSHOT_ARCHIVE_ENABLED", "true").lower() in ("1", "true", "yes")
+    SNAPSHOT_DIR: str = os.getenv("SNAPSHOT_DIR", ".cache/snapshots")
+    SNAPSHOT_RETENTION_DAYS: float = float(os.getenv("SNAPSHOT_RETENTION_DAYS", "30"))
+    SNAPSHOT_COMPRESSION_LEVEL: int = int(os.getenv("SNAPSHOT_COMPRESSION_LEVEL", "10"))
+
+    # Multi-worker serving: gunicorn/uvicorn worker processes (0 = one per
+    # core), the directory of the cross-worker file locks used when the
+    # database is not PostgreSQL, how often a refresh waiting for another
+    # worker's run checks its lock, how often each worker picks up the
+    # others' inserts to evict its response cache (0 disables), and how long
+    # refresh jobs stay readable
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "0"))
+    LOCK_DIR: str = os.getenv("LOCK_DIR", ".cache/locks")
+    REFRESH_LOCK_POLL_SECONDS: float = float(os.getenv("REFRESH_LOCK_POLL_SECONDS", "1"))
+    RESPONSE_CACHE_SYNC_SECONDS: float = float(os.getenv("RESPONSE_CACHE_SYNC_SECONDS", "2"))
+    REFRESH_JOB_RETENTION_HOURS: float = float(os.getenv("REFRESH_JOB_RETENTION_HOURS", "24"))
+
+settings = Settings() 
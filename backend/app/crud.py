@@ -0,0 +1,364 @@
+import base64
+import binascii
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.orm import Session, aliased
+from . import models
+from .config import settings
+from .dedup import article_keys
+
+logger = logging.getLogger(__name__)
+
+ARTICLE_COLUMNS = ("title", "summary", "link", "source", "publication_date")
+ARTICLE_FIELDS = ("article_id",) + ARTICLE_COLUMNS + ("cluster_id",)
+INSERT_COLUMNS = ARTICLE_COLUMNS + ("url_hash", "title_hash", "cluster_id")
+
+# SQLite builds without SQLITE_MAX_VARIABLE_NUMBER raised cap bound parameters at 999
+SQLITE_MAX_VARIABLES = 999
+
+
+def _fit(article: Dict) -> Dict:
+    """
+    Keep only table columns and truncate strings to their column length so one
+    oversized title cannot fail a whole batch
+    """
+    row = {}
+    table = models.Article.__table__
+    for name in ARTICLE_COLUMNS:
+        value = article.get(name)
+        length = getattr(table.c[name].type, "length", None)
+        if length and isinstance(value, str) and len(value) > length:
+            value = value[:length]
+        row[name] = value
+    row["url_hash"], row["title_hash"] = article_keys(row)
+    row["cluster_id"] = article.get("cluster_id")
+    return row
+
+
+def _unique_rows(articles: Iterable[Dict]) -> List[Dict]:
+    """Drop rows repeating a (source, title) or (source, url_hash) key within the same refresh"""
+    seen = set()
+    rows = []
+    for article in articles:
+        if not article.get("title"):
+            continue
+        row = _fit(article)
+        keys = [(row["source"], "title", row["title"])]
+        if row["url_hash"] is not None:
+            keys.append((row["source"], "url", row["url_hash"]))
+        if any(key in seen for key in keys):
+            continue
+        seen.update(keys)
+        rows.append(row)
+    return rows
+
+
+def _batches(rows: List[Dict], size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _dialect_insert(dialect_name: str):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
+def bulk_insert_articles(db: Session, articles: Iterable[Dict], batch_size: Optional[int] = None) -> int:
+    """
+    Insert scraped articles in a few multi-row statements, skipping any that
+    already exist under the (source, title) or (source, url_hash) unique
+    keys, and bump the per-source
+    counters in the sources table.
+
+    Returns the number of rows actually inserted. The caller owns the
+    transaction and must commit.
+    """
+    return sum(bulk_insert_articles_by_source(db, articles, batch_size).values())
+
+
+def bulk_insert_articles_by_source(
+    db: Session, articles: Iterable[Dict], batch_size: Optional[int] = None
+) -> Dict[str, int]:
+    """Same as bulk_insert_articles but returns the inserted count per source"""
+    rows = _unique_rows(articles)
+    if not rows:
+        return {}
+
+    dialect_name = db.get_bind().dialect.name
+    batch_size = batch_size or settings.INSERT_BATCH_SIZE
+    if dialect_name == "sqlite":
+        batch_size = min(batch_size, SQLITE_MAX_VARIABLES // len(INSERT_COLUMNS))
+
+    insert = _dialect_insert(dialect_name)
+    by_source: Dict[str, List[Dict]] = {}
+    for row in rows:
+        by_source.setdefault(row["source"], []).append(row)
+
+    # Batches never mix sources so rowcount gives an exact per-source count
+    inserted_by_source: Dict[str, int] = {}
+    for source, source_rows in by_source.items():
+        inserted = 0
+        for batch in _batches(source_rows, batch_size):
+            if insert is None:
+                batch = _without_existing(db, batch)
+                if not batch:
+                    continue
+                db.execute(models.Article.__table__.insert(), batch)
+                inserted += len(batch)
+            else:
+                statement = insert(models.Article.__table__).values(batch).on_conflict_do_nothing()
+                inserted += max(db.execute(statement).rowcount, 0)
+        inserted_by_source[source] = inserted
+
+    record_sources(db, inserted_by_source)
+    total = sum(inserted_by_source.values())
+    logger.info(f"Bulk insert stored {total} of {len(rows)} scraped articles")
+    return inserted_by_source
+
+
+def record_sources(db: Session, inserted_by_source: Dict[str, int]) -> None:
+    """Upsert the sources table with the article counts of one ingest"""
+    if not inserted_by_source:
+        return
+    table = models.Source.__table__
+    now = datetime.utcnow()
+    insert = _dialect_insert(db.get_bind().dialect.name)
+    for name, count in inserted_by_source.items():
+        if insert is not None:
+            statement = insert(table).values(name=name, article_count=count, last_ingested_at=now)
+            statement = statement.on_conflict_do_update(
+                index_elements=[table.c.name],
+                set_={
+                    "article_count": table.c.article_count + statement.excluded.article_count,
+                    "last_ingested_at": statement.excluded.last_ingested_at,
+                },
+            )
+            db.execute(statement)
+            continue
+        source = db.query(models.Source).get(name)
+        if source is None:
+            db.add(models.Source(name=name, article_count=count, last_ingested_at=now))
+        else:
+            source.article_count += count
+            source.last_ingested_at = now
+
+
+def list_sources(db: Session) -> List[str]:
+    """Names of all sources that have stored articles"""
+    rows = (
+        db.query(models.Source.name)
+        .filter(models.Source.article_count > 0)
+        .order_by(models.Source.name)
+        .all()
+    )
+    return [row[0] for row in rows]
+
+
+def _without_existing(db: Session, batch: List[Dict]) -> List[Dict]:
+    """Fallback for dialects without ON CONFLICT: two lookups per batch"""
+    Article = models.Article
+    titles = [(row["source"], row["title"]) for row in batch]
+    existing_titles = set(
+        db.query(Article.source, Article.title).filter(tuple_(Article.source, Article.title).in_(titles)).all()
+    )
+    hashes = [(row["source"], row["url_hash"]) for row in batch if row["url_hash"] is not None]
+    existing_hashes = set(
+        db.query(Article.source, Article.url_hash).filter(tuple_(Article.source, Article.url_hash).in_(hashes)).all()
+    ) if hashes else set()
+    return [
+        row for row in batch
+        if (row["source"], row["title"]) not in existing_titles
+        and (row["source"], row["url_hash"]) not in existing_hashes
+    ]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(publication_date: datetime, article_id: int) -> str:
+    payload = json.dumps([publication_date.isoformat(), article_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        published, article_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(published), int(article_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def parse_fields(fields: Optional[str]) -> Sequence[str]:
+    """Validate a comma separated ?fields= projection"""
+    if not fields:
+        return ARTICLE_FIELDS
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in ARTICLE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return tuple(name for name in ARTICLE_FIELDS if name in requested)
+
+
+def get_articles_page(
+    db: Session,
+    timeframe: Optional[int],
+    source: Optional[str],
+    limit: int,
+    cursor: Optional[str] = None,
+    fields: Sequence[str] = ARTICLE_FIELDS,
+    collapse: bool = False,
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    One page of articles, newest first, using keyset pagination on
+    (publication_date, article_id) so every page costs the same index range
+    scan however deep the client has paged.
+
+    With collapse=True only the newest article of each near-duplicate
+    cluster (within the source filter) is returned.
+
+    Only the requested columns are selected. Returns the rows as dicts and
+    the cursor for the next page (None on the last page).
+    """
+    Article = models.Article
+    # The sort key is always selected so the next cursor can be built
+    selected = list(dict.fromkeys(tuple(fields) + ("publication_date", "article_id")))
+    query = db.query(*[getattr(Article, name) for name in selected])
+
+    if timeframe:
+        time_threshold = datetime.utcnow() - timedelta(hours=timeframe)
+        query = query.filter(Article.publication_date >= time_threshold)
+
+    if source:
+        query = query.filter(Article.source == source)
+
+    if collapse:
+        newer = aliased(Article)
+        conditions = [
+            newer.cluster_id == Article.cluster_id,
+            tuple_(newer.publication_date, newer.article_id) > tuple_(Article.publication_date, Article.article_id),
+        ]
+        if source:
+            conditions.append(newer.source == source)
+        exists_newer = db.query(newer.article_id).filter(and_(*conditions)).exists()
+        query = query.filter(or_(Article.cluster_id.is_(None), ~exists_newer))
+
+    if cursor:
+        published, article_id = decode_cursor(cursor)
+        query = query.filter(tuple_(Article.publication_date, Article.article_id) < tuple_(published, article_id))
+
+    rows = (
+        query.order_by(Article.publication_date.desc(), Article.article_id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.publication_date, last.article_id)
+
+    return [{name: getattr(row, name) for name in fields} for row in rows], next_cursor
+
+
+def iter_dedup_keys(db: Session, batch_size: int = 10000) -> Iterable[Tuple[str, Optional[int], Optional[int]]]:
+    """Stream the (source, url_hash, title_hash) keys of every stored article"""
+    Article = models.Article
+    query = db.query(Article.source, Article.url_hash, Article.title_hash)
+    for source, url_key, title_key in query.yield_per(batch_size):
+        yield source, url_key, title_key
+
+
+def iter_recent_for_clustering(db: Session, since: datetime, batch_size: int = 5000) -> Iterable[Tuple]:
+    """Stream (url_hash, cluster_id, title, summary, publication_date) of articles published since"""
+    Article = models.Article
+    query = db.query(Article.url_hash, Article.cluster_id, Article.title, Article.summary, Article.publication_date)
+    query = query.filter(Article.publication_date >= since).order_by(Article.publication_date)
+    for row in query.yield_per(batch_size):
+        yield tuple(row)
+
+
+def iter_articles(
+    db: Session,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    source: Optional[str] = None,
+    fields: Sequence[str] = ARTICLE_FIELDS,
+    batch_size: int = 1000,
+) -> Iterable[Tuple]:
+    """
+    Stream matching articles newest first as row tuples ordered like fields.
+
+    yield_per() makes the psycopg2 driver use a server-side cursor, so only
+    one batch of rows is held in memory whatever the size of the range.
+    """
+    Article = models.Article
+    query = db.query(*[getattr(Article, name) for name in fields])
+    if since:
+        query = query.filter(Article.publication_date >= since)
+    if until:
+        query = query.filter(Article.publication_date < until)
+    if source:
+        query = query.filter(Article.source == source)
+    query = query.order_by(Article.publication_date.desc(), Article.article_id.desc())
+    for row in query.yield_per(batch_size):
+        yield tuple(row)
+
+
+def source_versions(db: Session) -> Dict[str, int]:
+    """Article count per source: it changes exactly when a source gets new rows"""
+    return dict(db.query(models.Source.name, models.Source.article_count).all())
+
+
+def record_refresh_run(db: Session, source: str, result: Dict, started_at: datetime, finished_at: datetime) -> None:
+    db.merge(models.RefreshRun(
+        source=source,
+        status=result["status"],
+        fetched=result.get("fetched", 0),
+        inserted=result.get("inserted", 0),
+        error=result.get("error"),
+        started_at=started_at,
+        finished_at=finished_at,
+    ))
+
+
+def get_refresh_run(db: Session, source: str) -> Optional[Dict]:
+    """The latest recorded refresh of a source, as the scheduler reports it"""
+    run = db.query(models.RefreshRun).get(source)
+    if run is None:
+        return None
+    result = {"status": run.status, "fetched": run.fetched, "inserted": run.inserted, "finished_at": run.finished_at}
+    if run.error:
+        result["error"] = run.error
+    return result
+
+
+REFRESH_JOB_FIELDS = ("job_id", "status", "sources", "results", "count", "error", "created_at", "started_at", "finished_at")
+
+
+def save_refresh_job(db: Session, job: Dict) -> None:
+    """Insert or update a job record, dropping jobs past REFRESH_JOB_RETENTION_HOURS"""
+    db.merge(models.RefreshJob(**{name: job.get(name) for name in REFRESH_JOB_FIELDS}))
+    horizon = datetime.utcnow() - timedelta(hours=settings.REFRESH_JOB_RETENTION_HOURS)
+    db.query(models.RefreshJob).filter(models.RefreshJob.created_at < horizon).delete(synchronize_session=False)
+
+
+def get_refresh_job(db: Session, job_id: str) -> Optional[Dict]:
+    row = db.query(models.RefreshJob).get(job_id)
+    if row is None:
+        return None
+    job = {name: getattr(row, name) for name in REFRESH_JOB_FIELDS}
+    job["timed_out"] = [name for name, result in job["results"].items() if result.get("status") == "timed_out"]
+    if job["error"] is None:
+        del job["error"]
+    return job
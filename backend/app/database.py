@@ -1,13 +1,39 @@
+import importlib.util
 import os
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from .config import settings
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-engine = create_engine(DATABASE_URL)
+# Async drivers for the API handlers; scripts, ingestion and migrations keep the sync engine
+ASYNC_DRIVERS = {"postgresql": ("asyncpg", "asyncpg"), "sqlite": ("aiosqlite", "aiosqlite")}
+
+connect_args = {}
+if DATABASE_URL and DATABASE_URL.startswith("sqlite"):
+    # FastAPI runs sync dependencies in a threadpool
+    connect_args["check_same_thread"] = False
+
+
+def _pool_options(url) -> dict:
+    """Pool sizing for server databases; SQLite keeps SQLAlchemy's own per-file pooling"""
+    if url.get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+
+engine = create_engine(DATABASE_URL, connect_args=connect_args, **_pool_options(make_url(DATABASE_URL)))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -16,4 +42,69 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+def _create_async_engine():
+    """
+    The async engine, or None when disabled (DB_ASYNC=false) or when the
+    async driver for the database is not installed
+    """
+    url = make_url(DATABASE_URL)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if not settings.DB_ASYNC or driver is None or importlib.util.find_spec(driver[1]) is None:
+        return None
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = url.set(drivername=f"{url.get_backend_name()}+{driver[0]}")
+    async_connect_args = {}
+    if driver[0] == "asyncpg":
+        # SQLAlchemy's prepared statement LRU and asyncpg's own cache; set
+        # DB_STATEMENT_CACHE_SIZE=0 behind pgbouncer in transaction mode
+        url = url.update_query_dict({"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)})
+        async_connect_args["statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+    return create_async_engine(url, connect_args=async_connect_args, **_pool_options(url))
+
+
+async_engine = _create_async_engine()
+AsyncSessionLocal = None
+if async_engine is not None:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    # Handlers only read, and rows must stay usable after the session closes
+    AsyncSessionLocal = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+class ThreadpoolSession:
+    """
+    A sync Session behind the AsyncSession.run_sync() interface, used when
+    no async driver is available: each call runs in the threadpool instead
+    of on the event loop
+    """
+
+    def __init__(self, session):
+        self.session = session
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.session, *args, **kwargs)
+
+    async def close(self):
+        await run_in_threadpool(self.session.close)
+
+
+async def get_async_db():
+    """
+    Session dependency for async handlers. Query code is shared with the
+    sync callers through run_sync(): crud functions take a Session and run
+    unchanged, while the driver I/O is awaited on the event loop.
+    """
+    db = AsyncSessionLocal() if AsyncSessionLocal is not None else ThreadpoolSession(SessionLocal())
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def dispose_async_engine() -> None:
+    if async_engine is not None:
+        await async_engine.dispose()
@@ -0,0 +1,188 @@
+"""
+Parsing of scraped timestamps, relative ("about 3 hours ago") and absolute.
+
+A DateParser tries its formats in the order that has worked best so far for
+its source, so a page full of one format costs one attempt per string.
+Each strptime pattern is matched against a regex compiled from it before
+strptime is called, so a miss never raises. Results are memoized per
+string: absolute dates as datetimes, relative ones as offsets applied to
+the caller's reference time (one fetch time per scrape run, so all the
+items of a page agree on "now").
+
+Every result is a naive UTC datetime, like the rest of the database.
+"""
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+ISO = "iso"
+RELATIVE = "relative"
+
+# Rough lengths are fine for "N months ago" style listings
+_UNITS = {
+    "second": timedelta(seconds=1),
+    "sec": timedelta(seconds=1),
+    "minute": timedelta(minutes=1),
+    "min": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "hr": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+}
+_RELATIVE = re.compile(
+    r"\b(\d+|an?|one)\s+(second|sec|minute|min|hour|hr|day|week|month|year)s?\s+ago\b", re.IGNORECASE
+)
+_ISO_SHAPE = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?)?(?:Z|[+-]\d{2}:?\d{2})?")
+
+_DIRECTIVES = {
+    "Y": r"\d{4}",
+    "y": r"\d{2}",
+    "m": r"\d{1,2}",
+    "d": r"\d{1,2}",
+    "H": r"\d{1,2}",
+    "I": r"\d{1,2}",
+    "M": r"\d{1,2}",
+    "S": r"\d{1,2}",
+    "f": r"\d{1,6}",
+    "j": r"\d{1,3}",
+    "b": r"[^\W\d_]{3,}",
+    "B": r"[^\W\d_]{3,}",
+    "a": r"[^\W\d_]{3,}",
+    "A": r"[^\W\d_]{3,}",
+    "p": r"[AaPp]\.?[Mm]\.?",
+    "z": r"(?:Z|[+-]\d{2}:?\d{2}(?::?\d{2})?)",
+    "Z": r"[A-Za-z]{1,5}",
+    "%": "%",
+}
+_DIRECTIVE = re.compile(r"%(.)|(\s+)|([^%\s]+)")
+
+Parsed = Union[datetime, timedelta, None]
+_MISSING = object()
+
+
+def to_utc_naive(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def format_pattern(fmt: str):
+    """Compile a regex accepting what strptime(text, fmt) could accept"""
+    parts = []
+    for directive, space, literal in _DIRECTIVE.findall(fmt):
+        if directive:
+            parts.append(_DIRECTIVES.get(directive, r".+?"))
+        elif space:
+            parts.append(r"\s+")
+        else:
+            parts.append(re.escape(literal))
+    return re.compile("".join(parts), re.IGNORECASE)
+
+
+class DateParser:
+    """
+    Parses strings with a list of formats: ISO, RELATIVE or strptime
+    patterns. Thread-safe; the learned order and the memo are per instance,
+    cache_size=0 disables the memo.
+    """
+
+    def __init__(self, formats: Sequence[str], cache_size: int = 4096):
+        if not formats:
+            raise ValueError("DateParser needs at least one format")
+        self._order = list(formats)
+        self._hits: Dict[str, int] = {fmt: 0 for fmt in formats}
+        self._patterns = {fmt: format_pattern(fmt) for fmt in formats if fmt not in (ISO, RELATIVE)}
+        self._cache: Dict[str, Parsed] = {}
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+
+    @property
+    def order(self) -> Tuple[str, ...]:
+        return tuple(self._order)
+
+    def parse(self, text: Optional[str], reference: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        The date in text, or None when no format matches. Relative dates are
+        taken back from reference (default: now).
+        """
+        if not text:
+            return None
+        text = " ".join(text.split())
+        parsed = self._cache.get(text, _MISSING)
+        if parsed is _MISSING:
+            parsed = self._parse(text)
+            if self.cache_size:
+                if len(self._cache) >= self.cache_size:
+                    self._cache.clear()
+                self._cache[text] = parsed
+        if isinstance(parsed, timedelta):
+            return (reference or datetime.utcnow()) - parsed
+        return parsed
+
+    def _parse(self, text: str) -> Parsed:
+        for position, fmt in enumerate(self._order):
+            parsed = self._try(fmt, text)
+            if parsed is not None:
+                if position:
+                    self._learn(fmt)
+                else:
+                    self._hits[fmt] += 1
+                return parsed
+        return None
+
+    def _learn(self, fmt: str) -> None:
+        """Move a format ahead of the ones that matched less often"""
+        with self._lock:
+            hits = self._hits[fmt] = self._hits[fmt] + 1
+            order = self._order
+            position = order.index(fmt)
+            while position and self._hits[order[position - 1]] < hits:
+                order[position - 1], order[position] = order[position], order[position - 1]
+                position -= 1
+
+    def _try(self, fmt: str, text: str) -> Parsed:
+        if fmt == ISO:
+            if not _ISO_SHAPE.fullmatch(text):
+                return None
+            try:
+                return to_utc_naive(datetime.fromisoformat(text.replace("Z", "+00:00")))
+            except ValueError:
+                return None
+        if fmt == RELATIVE:
+            lowered = text.lower()
+            if "just now" in lowered or lowered in ("now", "today"):
+                return timedelta()
+            if lowered == "yesterday":
+                return timedelta(days=1)
+            match = _RELATIVE.search(text)
+            if match is None:
+                return None
+            count = match.group(1).lower()
+            return _UNITS[match.group(2).lower()] * (int(count) if count.isdigit() else 1)
+        if not self._patterns[fmt].fullmatch(text):
+            return None
+        try:
+            return to_utc_naive(datetime.strptime(text, fmt))
+        except ValueError:
+            # Shape matched but not the values (e.g. "31 Feb 2024")
+            return None
+
+
+_parsers: Dict[Tuple[str, Tuple[str, ...]], DateParser] = {}
+_parsers_lock = threading.Lock()
+
+
+def parser_for(key: str, formats: Sequence[str]) -> DateParser:
+    """
+    The process-wide parser of a source (key) and format list, so what it
+    learns survives across pages and runs, parse pool workers included
+    """
+    formats = tuple(formats)
+    parser = _parsers.get((key, formats))
+    if parser is None:
+        with _parsers_lock:
+            parser = _parsers.setdefault((key, formats), DateParser(formats))
+    return parser
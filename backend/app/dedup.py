@@ -0,0 +1,241 @@
+"""
+Article identity and the in-memory index of already stored articles.
+
+An article is identified by the hash of its canonical URL, with a
+fingerprint of its normalized title as the fallback for items without a
+usable link. Both are signed 64-bit integers stored on the row (url_hash,
+title_hash) so the index can be warmed without reading any text columns.
+"""
+import hashlib
+import re
+import threading
+from array import array
+from functools import lru_cache
+from bisect import bisect_left
+from math import ceil, log
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that never change which article a URL points to
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src", "guccounter", "guce_referrer"}
+
+# Lengths of the articles.link / title columns. Keys are hashed from the
+# value as stored (crud truncates it), so the keys of a long title are the
+# same whether computed at ingestion or read back from the database
+LINK_MAX_LENGTH = 500
+TITLE_MAX_LENGTH = 255
+
+_ARXIV_VERSION = re.compile(r"^/(?:abs|pdf)/(.+?)(?:v\d+)?(?:\.pdf)?$")
+TITLE_SALT = "\x00title"
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def _hash64(value: str) -> int:
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+@lru_cache(maxsize=1024)
+def _salt(source: str) -> int:
+    return _hash64(source) & 0xFFFFFFFFFFFFFFFF
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL so the variants of one article compare equal: https
+    scheme, lower-case host without "www.", no fragment, tracking parameters
+    or trailing slash, sorted query, and arXiv links without their version
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host.endswith(":443") or host.endswith(":80"):
+        host = host.rsplit(":", 1)[0]
+    path = parts.path or "/"
+    if host.endswith("arxiv.org"):
+        host = "arxiv.org"
+        match = _ARXIV_VERSION.match(path)
+        if match:
+            path = "/abs/" + match.group(1)
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def url_hash(url: Optional[str]) -> Optional[int]:
+    if not url or not url.strip():
+        return None
+    return _hash64(canonical_url(url[:LINK_MAX_LENGTH]))
+
+
+def title_fingerprint(title: Optional[str]) -> str:
+    """Case, punctuation and whitespace insensitive form of a title"""
+    return " ".join(_NON_WORD.sub(" ", (title or "").casefold()).split())
+
+
+def title_hash(title: Optional[str]) -> Optional[int]:
+    fingerprint = title_fingerprint((title or "")[:TITLE_MAX_LENGTH])
+    return _hash64(fingerprint) if fingerprint else None
+
+
+def article_keys(article: Dict) -> Tuple[Optional[int], Optional[int]]:
+    """(url_hash, title_hash) of a scraped article"""
+    return url_hash(article.get("link")), title_hash(article.get("title"))
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over 64-bit integer keys; the k bit positions
+    come from double hashing the two halves of the key
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1024)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = ceil(-capacity * log(error_rate) / (log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: int):
+        key &= 0xFFFFFFFFFFFFFFFF
+        h1 = key & 0xFFFFFFFF
+        h2 = (key >> 32) | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: int) -> None:
+        bits = self._bits
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def update(self, keys: Iterable[int]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: int) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+
+class SeenIndex:
+    """
+    Keys of every stored article: a Bloom filter answers "never seen" without
+    touching the exact store, which is a sorted array of 64-bit keys (8 bytes
+    per key) plus a small set of recent inserts merged into it in bulk.
+
+    Keys mix the source into the article hash, so the same URL may exist
+    once per source, like the (source, url_hash) unique index. The index is
+    per process and may lag behind other workers; a miss only means the
+    database rejects the duplicate instead.
+    """
+
+    MERGE_THRESHOLD = 50_000
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.01):
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self._reset(capacity)
+
+    def _reset(self, capacity: int) -> None:
+        self._bloom = BloomFilter(capacity, self.error_rate)
+        self._sorted = array("q")
+        self._recent = set()
+
+    @staticmethod
+    def _key(source: str, article_hash: int) -> int:
+        mixed = (article_hash & 0xFFFFFFFFFFFFFFFF) ^ _salt(source)
+        return mixed - (1 << 64) if mixed >= 1 << 63 else mixed
+
+    @classmethod
+    def keys_for(cls, source: str, url_key: Optional[int], title_key: Optional[int]) -> List[int]:
+        keys = []
+        # Title keys are salted apart so they never collide with URL keys
+        if url_key is not None:
+            keys.append(cls._key(source, url_key))
+        if title_key is not None:
+            keys.append(cls._key(source + TITLE_SALT, title_key))
+        return keys
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._recent)
+
+    def load(self, rows: Iterable[Tuple[str, Optional[int], Optional[int]]]) -> int:
+        """Rebuild from (source, url_hash, title_hash) rows; returns the number of keys"""
+        keys = array("q")
+        for source, url_key, title_key in rows:
+            keys.extend(self.keys_for(source, url_key, title_key))
+        ordered = array("q", sorted(set(keys)))
+        bloom = BloomFilter(len(ordered) * 2, self.error_rate)
+        bloom.update(ordered)
+        with self._lock:
+            self._bloom, self._sorted, self._recent = bloom, ordered, set()
+        return len(ordered)
+
+    def _contains_key(self, key: int) -> bool:
+        if key not in self._bloom:
+            return False
+        if key in self._recent:
+            return True
+        i = bisect_left(self._sorted, key)
+        return i < len(self._sorted) and self._sorted[i] == key
+
+    def contains(self, source: str, link: Optional[str] = None, title: Optional[str] = None) -> bool:
+        """True when an article with this canonical URL (or, lacking one, title) is stored"""
+        url_key = url_hash(link)
+        if url_key is not None:
+            return self._contains_key(self._key(source, url_key))
+        title_key = title_hash(title)
+        return title_key is not None and self._contains_key(self._key(source + TITLE_SALT, title_key))
+
+    def is_known(self, article: Dict) -> bool:
+        """
+        An article is known when its URL or its title fingerprint was seen
+        for its source: covers both re-published links and edited titles
+        """
+        url_key, title_key = article_keys(article)
+        return any(self._contains_key(key) for key in self.keys_for(article["source"], url_key, title_key))
+
+    def filter_new(self, articles: Iterable[Dict]) -> List[Dict]:
+        return [article for article in articles if not self.is_known(article)]
+
+    def add_articles(self, articles: Iterable[Dict]) -> None:
+        with self._lock:
+            for article in articles:
+                url_key = article.get("url_hash")
+                title_key = article.get("title_hash")
+                if url_key is None and title_key is None:
+                    url_key, title_key = article_keys(article)
+                for key in self.keys_for(article["source"], url_key, title_key):
+                    if not self._contains_key(key):
+                        self._recent.add(key)
+                        self._bloom.add(key)
+            if len(self) > self._bloom.capacity:
+                self._grow()
+            elif len(self._recent) > self.MERGE_THRESHOLD:
+                self._sorted = array("q", sorted(self._sorted.tolist() + list(self._recent)))
+                self._recent = set()
+
+    def _grow(self) -> None:
+        ordered = array("q", sorted(self._sorted.tolist() + list(self._recent)))
+        bloom = BloomFilter(len(ordered) * 2, self.error_rate)
+        bloom.update(ordered)
+        self._bloom, self._sorted, self._recent = bloom, ordered, set()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "keys": len(self),
+            "bloom_bytes": self._bloom.nbytes,
+            "store_bytes": self._sorted.itemsize * len(self._sorted),
+        }
+
+
+seen_index = SeenIndex()
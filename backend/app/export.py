@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterator, Optional, Sequence
+from . import crud
+from .database import SessionLocal
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Rows per chunk written to the socket
+CHUNK_ROWS = 500
+
+
+def json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _ndjson_chunks(rows: Iterator[tuple], fields: Sequence[str]) -> Iterator[str]:
+    buffer = []
+    for row in rows:
+        buffer.append(json.dumps(dict(zip(fields, row)), default=json_default, ensure_ascii=False))
+        if len(buffer) >= CHUNK_ROWS:
+            yield "\n".join(buffer) + "\n"
+            buffer = []
+    if buffer:
+        yield "\n".join(buffer) + "\n"
+
+
+def _csv_chunks(rows: Iterator[tuple], fields: Sequence[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    count = 0
+    for row in rows:
+        writer.writerow([value.isoformat() if isinstance(value, datetime) else value for value in row])
+        count += 1
+        if count >= CHUNK_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            count = 0
+    # The header alone when nothing matched, nothing after a full last chunk
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def stream_export(
+    export_format: str,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    source: Optional[str],
+    fields: Sequence[str],
+) -> Iterator[str]:
+    """
+    Yield an export of the matching articles in chunks.
+
+    The generator owns its own session so the server-side cursor stays open
+    for exactly as long as the response is being streamed.
+    """
+    db = SessionLocal()
+    try:
+        rows = crud.iter_articles(db, since=since, until=until, source=source, fields=fields)
+        chunks = _csv_chunks if export_format == "csv" else _ndjson_chunks
+        yield from chunks(rows, fields)
+    finally:
+        db.close()
@@ -0,0 +1,87 @@
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List
+from . import crud
+from .cache import response_cache
+from .clustering import cluster_index
+from .config import settings
+from .database import SessionLocal
+from .dedup import seen_index
+from .metrics import ARTICLES_INSERTED, DEDUP_CHECKS, INGEST_STAGE_SECONDS, timed
+
+logger = logging.getLogger(__name__)
+
+
+def load_seen_index() -> int:
+    """Fill the dedup index with the keys of every stored article. Blocking."""
+    db = SessionLocal()
+    try:
+        return seen_index.load(crud.iter_dedup_keys(db))
+    finally:
+        db.close()
+
+
+def load_cluster_index() -> int:
+    """Fill the cluster index with the stored articles of its window. Blocking."""
+    db = SessionLocal()
+    try:
+        since = datetime.utcnow() - cluster_index.window
+        return cluster_index.load(crud.iter_recent_for_clustering(db, since))
+    finally:
+        db.close()
+
+
+def filter_new_articles(articles: List[Dict]) -> List[Dict]:
+    """Drop the articles the in-memory dedup index already knows"""
+    with timed(INGEST_STAGE_SECONDS.labels(stage="dedup")):
+        new_articles = seen_index.filter_new(articles)
+    DEDUP_CHECKS.labels(result="hit").inc(len(articles) - len(new_articles))
+    DEDUP_CHECKS.labels(result="miss").inc(len(new_articles))
+    return new_articles
+
+
+def store_articles(articles: List[Dict]) -> Dict[str, int]:
+    """
+    Cluster and insert already deduplicated articles in their own
+    transaction, then invalidate the cached responses of the sources that
+    received rows and add the articles to the dedup and cluster indexes.
+
+    Returns the number of inserted rows per source. Blocking.
+    """
+    if not articles:
+        return {}
+    clustered = []
+    if settings.CLUSTER_ENABLED:
+        with timed(INGEST_STAGE_SECONDS.labels(stage="cluster")):
+            clustered = cluster_index.assign(articles)
+    db = SessionLocal()
+    try:
+        with timed(INGEST_STAGE_SECONDS.labels(stage="insert")):
+            inserted_by_source = crud.bulk_insert_articles_by_source(db, articles)
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    for name, count in inserted_by_source.items():
+        ARTICLES_INSERTED.labels(source=name).inc(count)
+    response_cache.invalidate_sources(name for name, count in inserted_by_source.items() if count)
+    seen_index.add_articles(articles)
+    cluster_index.add(clustered)
+    return inserted_by_source
+
+
+def ingest_articles(articles: Iterable[Dict]) -> Dict[str, int]:
+    """
+    Store scraped articles in their own transaction and invalidate the cached
+    responses of every source that received new rows.
+
+    Articles already in the in-memory dedup index are dropped before the
+    database is touched; the rest are assigned a near-duplicate cluster and
+    added to the index once committed.
+
+    Returns the number of inserted rows per source. Blocking; call it from a
+    worker thread when running on the event loop.
+    """
+    return store_articles(filter_new_articles(list(articles)))
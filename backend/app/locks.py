@@ -0,0 +1,125 @@
+import hashlib
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from .config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single local process, nothing to coordinate
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def lock_key(name: str) -> int:
+    """Stable signed 64-bit key for pg_advisory_lock derived from a name"""
+    digest = hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class AdvisoryLock:
+    """
+    Non-blocking, session-level PostgreSQL advisory lock.
+
+    Held on a dedicated connection for as long as the work it guards runs, so
+    several uvicorn workers sharing a database never scrape the same source at
+    once. On other databases the lock always succeeds; named_lock() picks a
+    FileLock there instead.
+    """
+
+    def __init__(self, engine: Engine, name: str):
+        self.engine = engine
+        self.name = name
+        self.key = lock_key(name)
+        self._conn: Optional[Connection] = None
+
+    def acquire(self) -> bool:
+        if self.engine.dialect.name != "postgresql":
+            return True
+        conn = self.engine.connect()
+        try:
+            acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}).scalar()
+        except Exception:
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return False
+        self._conn = conn
+        return True
+
+    def release(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+        except Exception as e:
+            # Closing the session below releases the lock regardless
+            logger.warning(f"Could not release advisory lock {self.name}: {e}")
+        finally:
+            self._conn.close()
+            self._conn = None
+
+
+class FileLock:
+    """
+    Non-blocking exclusive lock on a file under settings.LOCK_DIR, with the
+    AdvisoryLock interface: the stand-in that coordinates the workers of one
+    host when the database is not PostgreSQL. The OS drops it if the
+    process dies.
+    """
+
+    def __init__(self, name: str, directory: Optional[str] = None):
+        self.name = name
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+        self.path = os.path.join(directory or settings.LOCK_DIR, f"{slug}-{lock_key(name) & 0xFFFFFFFF:08x}.lock")
+        self._fd: Optional[int] = None
+
+    def acquire(self, blocking: bool = False) -> bool:
+        if fcntl is None:
+            return True
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+
+def named_lock(engine: Engine, name: str) -> Union[AdvisoryLock, FileLock]:
+    """
+    A lock shared by every worker: a PostgreSQL advisory lock (cluster-wide)
+    or, on other databases, a file lock (workers of the same host)
+    """
+    if engine.dialect.name == "postgresql":
+        return AdvisoryLock(engine, name)
+    return FileLock(name)
+
+
+@contextmanager
+def holding(lock: Union[AdvisoryLock, FileLock], poll: float = 0.1) -> Iterator[None]:
+    """Block until the lock is acquired, for startup work every worker repeats"""
+    while not lock.acquire():
+        time.sleep(poll)
+    try:
+        yield
+    finally:
+        lock.release()
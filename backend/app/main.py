@@ -1,22 +1,34 @@
-from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi import FastAPI, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
-from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime, timedelta
-from . import models, schemas, database
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
+from datetime import datetime
+import asyncio
+from . import schemas, database, crud, export, search
 from .database import engine, SessionLocal
+from .cache import response_cache, dump_json
+from .dedup import seen_index
+from .ingestion import load_cluster_index, load_seen_index
+from .locks import holding, named_lock
+from .schema import ensure_schema
 from .scrapers.scraper_manager import ScraperManager
+from .scheduler import RefreshScheduler
+from .metrics import CONTENT_TYPE_LATEST, MetricsMiddleware, render_latest
+from .logging_config import configure_logging
 import logging
 from .config import settings
 import os
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 
-models.Base.metadata.create_all(bind=engine)
+# Workers start together: one at a time checks (or, when empty, creates) the schema
+with holding(named_lock(engine, "schema")):
+    ensure_schema(engine)
 
 app = FastAPI(title="AI News Aggregator")
 
@@ -27,9 +39,55 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Link"],
 )
 
+app.add_middleware(MetricsMiddleware, router=app.router)
+
 scraper_manager = ScraperManager()
+scheduler = RefreshScheduler(scraper_manager)
+
+def load_source_versions():
+    db = SessionLocal()
+    try:
+        return crud.source_versions(db)
+    finally:
+        db.close()
+
+async def sync_response_cache():
+    # Other workers' inserts only show up here through the sources table
+    while True:
+        try:
+            response_cache.sync_versions(await run_in_threadpool(load_source_versions))
+        except Exception as e:
+            logger.warning(f"Response cache sync failed: {e}")
+        await asyncio.sleep(settings.RESPONSE_CACHE_SYNC_SECONDS)
+
+background_tasks: List[asyncio.Task] = []
+
+@app.on_event("startup")
+async def startup():
+    # Known articles are then rejected (and listing crawls stopped) without a query
+    count = await run_in_threadpool(load_seen_index)
+    logger.info(f"Dedup index warmed with {count} keys: {seen_index.stats()}")
+    if settings.CLUSTER_ENABLED:
+        count = await run_in_threadpool(load_cluster_index)
+        logger.info(f"Cluster index warmed with {count} recent articles")
+    await scraper_manager.startup()
+    if settings.SCHEDULER_ENABLED:
+        scheduler.start()
+    if settings.RESPONSE_CACHE_SYNC_SECONDS > 0 and response_cache.ttl > 0:
+        background_tasks.append(asyncio.ensure_future(sync_response_cache()))
+
+@app.on_event("shutdown")
+async def shutdown():
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    background_tasks.clear()
+    await scheduler.stop()
+    await scraper_manager.shutdown()
+    await database.dispose_async_engine()
 
 # In production
 if os.getenv("ENVIRONMENT") == "production":
@@ -39,65 +97,106 @@ if os.getenv("ENVIRONMENT") == "production":
         allowed_hosts=["your-domain.com", "*.your-domain.com"]
     )
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus exposition of scrape, ingest and request metrics"""
+    return Response(render_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST})
+
 @app.get("/articles/", response_model=List[schemas.Article])
 async def get_articles(
+    request: Request,
     timeframe: int = Query(24, description="Timeframe in hours"),
     source: str = Query(None, description="Filter by source"),
-    db: Session = Depends(database.get_db)
+    limit: int = Query(settings.ARTICLES_DEFAULT_LIMIT, ge=1, le=settings.ARTICLES_MAX_LIMIT, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma separated subset of fields to return"),
+    collapse: bool = Query(False, description="Only the newest article of each near-duplicate cluster"),
+    db=Depends(database.get_async_db)
 ):
-    query = db.query(models.Article)
-    
-    if timeframe:
-        time_threshold = datetime.utcnow() - timedelta(hours=timeframe)
-        query = query.filter(models.Article.publication_date >= time_threshold)
-    
-    if source:
-        query = query.filter(models.Article.source == source)
-    
-    return query.order_by(models.Article.publication_date.desc()).all()
+    key = response_cache.key(request)
+    entry = response_cache.get(key)
+    if entry is None:
+        try:
+            selected = crud.parse_fields(fields)
+            rows, next_cursor = await db.run_sync(
+                crud.get_articles_page, timeframe, source, limit, cursor, selected, collapse
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-@app.get("/sources/")
-async def get_sources(db: Session = Depends(database.get_db)):
-    sources = db.query(models.Article.source).distinct().all()
-    return [source[0] for source in sources]
+        headers = {}
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+            next_url = request.url.include_query_params(cursor=next_cursor)
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        entry = response_cache.set(key, dump_json(rows), source=source, headers=headers)
+    return response_cache.respond(entry, request)
 
-@app.post("/refresh-articles/")
-async def refresh_articles(db: Session = Depends(database.get_db)):
-    """Trigger a fresh scrape of all articles"""
+@app.get("/articles/export")
+async def export_articles(
+    format: str = Query("ndjson", description="ndjson or csv"),
+    since: Optional[datetime] = Query(None, description="Oldest publication date (inclusive)"),
+    until: Optional[datetime] = Query(None, description="Newest publication date (exclusive)"),
+    source: str = Query(None, description="Filter by source"),
+    fields: Optional[str] = Query(None, description="Comma separated subset of fields to export"),
+):
+    """Stream every matching article as NDJSON or CSV in constant memory"""
+    if format not in export.EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
     try:
-        # Fetch new articles
-        articles = await scraper_manager.fetch_all_articles()
-        new_articles_count = 0
-        
-        # Store in database
-        for article_data in articles:
-            try:
-                # Check if article already exists
-                existing = db.query(models.Article).filter(
-                    models.Article.title == article_data["title"],
-                    models.Article.source == article_data["source"]
-                ).first()
-                
-                if not existing:
-                    new_article = models.Article(**article_data)
-                    db.add(new_article)
-                    new_articles_count += 1
-                    
-            except Exception as article_error:
-                logger.error(f"Error processing article: {article_error}")
-                continue
-        
+        selected = crud.parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    filename = f"articles.{format}"
+    return StreamingResponse(
+        export.stream_export(format, since, until, source, selected),
+        media_type=export.EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@app.get("/search")
+async def search_articles(
+    request: Request,
+    q: str = Query(..., min_length=1, description='Web-style query: words, "exact phrase", -exclude, or'),
+    timeframe: Optional[int] = Query(None, description="Timeframe in hours"),
+    source: str = Query(None, description="Filter by source"),
+    limit: int = Query(settings.SEARCH_DEFAULT_LIMIT, ge=1, le=settings.SEARCH_MAX_LIMIT, description="Page size"),
+    offset: int = Query(0, ge=0, le=1000, description="Results to skip"),
+    db=Depends(database.get_async_db)
+):
+    """Ranked full-text search over titles and summaries with highlighted matches"""
+    key = response_cache.key(request)
+    entry = response_cache.get(key)
+    if entry is None:
         try:
-            db.commit()
-            return {"message": "Articles refreshed successfully", "count": new_articles_count}
-        except Exception as commit_error:
-            db.rollback()
-            logger.error(f"Error committing to database: {commit_error}")
-            raise HTTPException(status_code=500, detail="Error saving articles to database")
-            
-    except Exception as e:
-        logger.error(f"Error in refresh_articles: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error refreshing articles: {str(e)}"
-        )
\ No newline at end of file
+            results = await db.run_sync(search.search_articles, q, timeframe, source, limit, offset)
+        except search.SearchUnavailable as e:
+            raise HTTPException(status_code=501, detail=str(e))
+        entry = response_cache.set(key, dump_json(results), source=source)
+    return response_cache.respond(entry, request)
+
+@app.get("/sources/")
+async def get_sources(request: Request, db=Depends(database.get_async_db)):
+    key = response_cache.key(request)
+    entry = response_cache.get(key)
+    if entry is None:
+        entry = response_cache.set(key, dump_json(await db.run_sync(crud.list_sources)))
+    return response_cache.respond(entry, request)
+
+@app.post("/refresh-articles/", status_code=202)
+async def refresh_articles(source: Optional[List[str]] = Query(None, description="Only refresh these sources")):
+    """Queue a scrape of all (or the given) sources and return its job id"""
+    try:
+        job = await scheduler.enqueue(source)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Unknown source: {e.args[0]}")
+    return {"job_id": job["job_id"], "status": job["status"], "sources": job["sources"]}
+
+@app.get("/refresh-articles/{job_id}")
+async def get_refresh_job(job_id: str):
+    """Status and per-source results of a refresh job"""
+    job = await scheduler.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -0,0 +1,140 @@
+"""
+Prometheus metrics for the scrape pipeline and the API, served at /metrics.
+
+Under a multi-process server set PROMETHEUS_MULTIPROC_DIR to a shared empty
+directory so every worker's samples are aggregated on scrape.
+"""
+import os
+import time
+from typing import Optional
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.routing import Match
+
+# Scrape latencies range from a cached 304 to a slow multi-page crawl
+SCRAPE_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+SCRAPER_FETCH_SECONDS = Histogram(
+    "scraper_fetch_seconds", "HTTP fetch latency per listing page", ["source"], buckets=SCRAPE_BUCKETS
+)
+SCRAPER_BYTES = Counter("scraper_downloaded_bytes", "Response bytes downloaded", ["source"])
+SCRAPER_PARSE_SECONDS = Histogram(
+    "scraper_parse_seconds", "Time to parse one listing page (pool dispatch included)", ["source"],
+    buckets=SCRAPE_BUCKETS,
+)
+SCRAPER_ITEMS = Counter("scraper_items_extracted", "Articles extracted from fetched pages", ["source"])
+SCRAPER_RUN_SECONDS = Histogram(
+    "scraper_run_seconds", "Duration of a whole source refresh", ["source"], buckets=SCRAPE_BUCKETS
+)
+SCRAPER_ERRORS = Counter("scraper_errors", "Scrape failures by exception type", ["source", "error"])
+
+# Politeness scheduler (app.scrapers.politeness)
+HOST_RATE = Gauge(
+    "scraper_host_rate", "Current request rate allowed per host (requests/s, 0 = unlimited)", ["host"],
+    multiprocess_mode="min",
+)
+HOST_THROTTLE_SECONDS = Histogram(
+    "scraper_host_throttle_seconds", "Time a request waited for its host's rate limit", ["host"],
+    buckets=SCRAPE_BUCKETS,
+)
+HTTP_RETRIES = Counter("scraper_http_retries", "Requests retried by host and status / error", ["host", "reason"])
+CIRCUIT_STATE = Gauge(
+    "scraper_circuit_state", "Circuit breaker state per source (0 closed, 1 half-open, 2 open)", ["source"],
+    multiprocess_mode="max",
+)
+CIRCUIT_REJECTIONS = Counter("scraper_circuit_rejections", "Requests refused by an open circuit", ["source"])
+
+DEDUP_CHECKS = Counter("dedup_checks", "Scraped articles checked against the seen index", ["result"])
+ARTICLES_INSERTED = Counter("articles_inserted", "Rows inserted into articles", ["source"])
+INGEST_STAGE_SECONDS = Histogram(
+    "ingest_stage_seconds", "Time spent per ingestion stage", ["stage"], buckets=SCRAPE_BUCKETS
+)
+PIPELINE_QUEUE_DEPTH = Gauge(
+    "ingest_pipeline_queue_depth", "Items waiting in an ingestion pipeline queue", ["queue"],
+    multiprocess_mode="max",
+)
+
+# Raw page archive (app.scrapers.archive)
+SNAPSHOTS_STORED = Counter("scraper_snapshots", "Fetched pages archived, new or already stored", ["source", "result"])
+SNAPSHOT_BYTES = Counter("scraper_snapshot_bytes", "Uncompressed bytes of newly archived pages", ["source"])
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "API request latency", ["method", "route", "status"]
+)
+
+
+class timed:
+    """Context manager observing the elapsed wall time on a histogram child"""
+
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started)
+        return False
+
+
+def record_error(source: str, error: BaseException) -> None:
+    SCRAPER_ERRORS.labels(source=source, error=type(error).__name__).inc()
+
+
+def render_latest() -> bytes:
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request, labelled with the route
+    template (/refresh-articles/{job_id}) rather than the raw path so label
+    cardinality stays bounded
+    """
+
+    def __init__(self, app, router):
+        self.app = app
+        self.router = router
+
+    def _route(self, scope) -> Optional[str]:
+        for route in self.router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = self._route(scope) or "unmatched"
+            HTTP_REQUEST_SECONDS.labels(
+                method=scope["method"], route=route, status=str(status["code"])
+            ).observe(time.perf_counter() - started)
+
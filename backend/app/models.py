@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import JSON, BigInteger, Column, Integer, String, DateTime, Text, UniqueConstraint, Index
 from .database import Base
 from datetime import datetime
 
 class Article(Base):
     __tablename__ = "articles"
+    __table_args__ = (
+        # Dedup key for bulk ingestion (INSERT ... ON CONFLICT DO NOTHING)
+        UniqueConstraint("source", "title", name="uq_articles_source_title"),
+    )
 
     article_id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -11,4 +15,61 @@ class Article(Base):
     link = Column(String(500), nullable=False)
     publication_date = Column(DateTime, nullable=False)
     source = Column(String(100), nullable=False)
-  
\ No newline at end of file
+    # Dedup keys (app.dedup): hash of the canonical URL and of the normalized title
+    url_hash = Column(BigInteger)
+    title_hash = Column(BigInteger)
+    # Near-duplicate cluster (app.clustering): dedup key of the cluster's first article
+    cluster_id = Column(BigInteger)
+
+# Read paths: /articles/ filters on publication_date (optionally per source)
+# and pages newest first on (publication_date, article_id), so both indexes
+# are stored in that descending order
+Index(
+    "ix_articles_source_publication_date_id",
+    Article.source, Article.publication_date.desc(), Article.article_id.desc(),
+)
+Index("ix_articles_publication_date_id", Article.publication_date.desc(), Article.article_id.desc())
+# Second dedup key: one row per canonical URL and source, whatever its title
+Index("uq_articles_source_url_hash", Article.source, Article.url_hash, unique=True)
+# ?collapse=true keeps the newest article of each cluster
+Index(
+    "ix_articles_cluster_publication_date_id",
+    Article.cluster_id, Article.publication_date.desc(), Article.article_id.desc(),
+)
+
+class Source(Base):
+    """Known sources, maintained on ingest so /sources/ avoids a DISTINCT scan"""
+    __tablename__ = "sources"
+
+    name = Column(String(100), primary_key=True)
+    article_count = Column(Integer, nullable=False, default=0)
+    last_ingested_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+class RefreshRun(Base):
+    """
+    Outcome of the latest refresh of each source, written by whichever worker
+    ran it, so the workers that waited on it return it instead of scraping again
+    """
+    __tablename__ = "refresh_runs"
+
+    source = Column(String(100), primary_key=True)
+    status = Column(String(20), nullable=False)
+    fetched = Column(Integer, nullable=False, default=0)
+    inserted = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, nullable=False)
+
+class RefreshJob(Base):
+    """On-demand refresh jobs, so their status can be read from any worker"""
+    __tablename__ = "refresh_jobs"
+
+    job_id = Column(String(32), primary_key=True)
+    status = Column(String(20), nullable=False)
+    sources = Column(JSON, nullable=False)
+    results = Column(JSON, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    created_at = Column(DateTime, nullable=False, index=True)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
@@ -0,0 +1,191 @@
+"""
+Streaming ingestion: scrape -> dedup -> batch insert as concurrent stages
+connected by bounded queues.
+
+Each source is crawled by its own producer through BaseScraper.iter_pages,
+which fetches a listing page and parses it in the parse pool before moving
+to the next one (the early stop needs the parsed page). The new articles
+of every page go through the dedup stage, then to a single writer that
+inserts them in batches of PIPELINE_BATCH_SIZE, or whatever arrived within
+PIPELINE_FLUSH_SECONDS. A fast source's articles are therefore stored while
+slow sources are still downloading, and a full queue blocks the stage
+before it, so memory is bounded by the queue sizes rather than by the
+size of a refresh.
+
+The callbacks a scraper registers with BaseScraper.after_stored (validators,
+harvest position) travel down the queues behind the articles they follow
+and are run by the writer once those are stored, so a crawl whose articles
+failed to store is not marked as done.
+"""
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+from starlette.concurrency import run_in_threadpool
+from .config import settings
+from .ingestion import filter_new_articles, store_articles
+from .metrics import PIPELINE_QUEUE_DEPTH, SCRAPER_RUN_SECONDS, record_error, timed
+from .scrapers.base_scraper import BaseScraper
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+# (source, callback) pairs waiting for the articles queued before them
+Pending = List[Tuple[str, Callable[[], None]]]
+
+
+class IngestPipeline:
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        source_timeout: Optional[float] = None,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        store: Callable[[List[Dict]], Dict[str, int]] = store_articles,
+    ):
+        self.concurrency = concurrency or settings.SCRAPER_CONCURRENCY
+        self.source_timeout = source_timeout or settings.SCRAPER_SOURCE_TIMEOUT
+        self.queue_size = queue_size or settings.PIPELINE_QUEUE_SIZE
+        self.batch_size = batch_size or settings.PIPELINE_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.PIPELINE_FLUSH_SECONDS
+        self.store = store
+
+    async def run(self, scrapers: Sequence[BaseScraper]) -> Dict[str, Dict]:
+        """
+        Scrape and store the given sources. Returns a report per source:
+        status (succeeded, failed, timed_out), articles fetched, inserted
+        and the error when there was one. Pages stored before a source
+        failed or timed out stay stored.
+        """
+        report = {
+            scraper.source_name: {"status": "running", "fetched": 0, "inserted": 0}
+            for scraper in scrapers
+        }
+        pages: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        batches: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+
+        async def produce(scraper: BaseScraper) -> None:
+            async with semaphore:
+                await self._produce(scraper, pages, report[scraper.source_name])
+
+        dedup = asyncio.ensure_future(self._dedup(pages, batches))
+        writer = asyncio.ensure_future(self._write(batches, report))
+        try:
+            await asyncio.gather(*(produce(scraper) for scraper in scrapers))
+            await pages.put(_DONE)
+            await asyncio.gather(dedup, writer)
+        finally:
+            for task in (dedup, writer):
+                task.cancel()
+        return report
+
+    async def _produce(self, scraper: BaseScraper, pages: asyncio.Queue, entry: Dict) -> None:
+        name = scraper.source_name
+
+        async def crawl() -> None:
+            async for batch in scraper.iter_pages():
+                entry["fetched"] += len(batch)
+                await pages.put((name, batch, scraper.take_stored_callbacks()))
+                PIPELINE_QUEUE_DEPTH.labels(queue="pages").set(pages.qsize())
+            # Registered after the last page, e.g. the listing's validators
+            callbacks = scraper.take_stored_callbacks()
+            if callbacks:
+                await pages.put((name, [], callbacks))
+
+        timeout = scraper.timeout or self.source_timeout
+        try:
+            with timed(SCRAPER_RUN_SECONDS.labels(source=name)):
+                await asyncio.wait_for(crawl(), timeout=timeout)
+        except asyncio.TimeoutError as e:
+            record_error(name, e)
+            logger.warning(f"Timed out fetching articles from {name} after {timeout}s")
+            entry["status"] = "timed_out"
+            scraper.take_stored_callbacks()
+        except Exception as e:
+            record_error(name, e)
+            logger.error(f"Error fetching articles from {name}: {e}")
+            entry["status"] = "failed"
+            entry["error"] = str(e)
+            scraper.take_stored_callbacks()
+        else:
+            # A failed write may already have marked the source
+            if entry["status"] == "running":
+                entry["status"] = "succeeded"
+            logger.info(f"Fetched {entry['fetched']} articles from {name}")
+
+    async def _dedup(self, pages: asyncio.Queue, batches: asyncio.Queue) -> None:
+        while True:
+            item = await pages.get()
+            PIPELINE_QUEUE_DEPTH.labels(queue="pages").set(pages.qsize())
+            if item is _DONE:
+                await batches.put(_DONE)
+                return
+            name, articles, callbacks = item
+            # Hash lookups against the in-memory index: cheap enough for the loop
+            fresh = filter_new_articles(articles)
+            if fresh or callbacks:
+                await batches.put((name, fresh, callbacks))
+                PIPELINE_QUEUE_DEPTH.labels(queue="batches").set(batches.qsize())
+
+    async def _write(self, batches: asyncio.Queue, report: Dict[str, Dict]) -> None:
+        loop = asyncio.get_event_loop()
+        buffer: List[Dict] = []
+        pending: Pending = []
+        # Sources with a batch that failed to store: their progress is never saved
+        unstored: Set[str] = set()
+        flush_at = 0.0
+        while True:
+            timeout = max(0.0, flush_at - loop.time()) if buffer else None
+            try:
+                item = await asyncio.wait_for(batches.get(), timeout)
+            except asyncio.TimeoutError:
+                await self._flush(buffer, pending, report, unstored)
+                buffer, pending = [], []
+                continue
+            PIPELINE_QUEUE_DEPTH.labels(queue="batches").set(batches.qsize())
+            if item is _DONE:
+                break
+            name, articles, callbacks = item
+            if articles and not buffer:
+                flush_at = loop.time() + self.flush_interval
+            buffer.extend(articles)
+            pending.extend((name, callback) for callback in callbacks)
+            # Callbacks behind nothing unstored run right away
+            if len(buffer) >= self.batch_size or (pending and not buffer):
+                await self._flush(buffer, pending, report, unstored)
+                buffer, pending = [], []
+        if buffer or pending:
+            await self._flush(buffer, pending, report, unstored)
+
+    async def _flush(
+        self, articles: List[Dict], pending: Pending, report: Dict[str, Dict], unstored: Set[str]
+    ) -> None:
+        # A failed batch is reported on its sources; the writer keeps
+        # draining so the producers never block on a dead consumer
+        if articles:
+            try:
+                inserted = await run_in_threadpool(self.store, articles)
+            except Exception as e:
+                logger.error(f"Storing a batch of {len(articles)} articles failed: {e}")
+                for name in {article["source"] for article in articles}:
+                    unstored.add(name)
+                    if name in report:
+                        report[name]["status"] = "failed"
+                        report[name]["error"] = str(e)
+            else:
+                for name, count in inserted.items():
+                    if name in report:
+                        report[name]["inserted"] += count
+        ready = [callback for name, callback in pending if name not in unstored]
+        if ready:
+            await run_in_threadpool(self._run_callbacks, ready)
+
+    @staticmethod
+    def _run_callbacks(callbacks: List[Callable[[], None]]) -> None:
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Could not save crawl progress: {e}")
@@ -0,0 +1,158 @@
+"""
+Re-parse archived listing pages and store what they yield, e.g. after fixing
+a source spec whose selectors stopped matching the site's new markup.
+
+    cd backend && python -m app.reparse --source "TechCrunch AI" --since 2026-01-01
+    cd backend && python -m app.reparse --dry-run      # report items per source only
+    cd backend && python -m app.reparse --prune        # apply the retention policy
+
+Snapshots are parsed in a process pool with the current scraper code, each
+one against its own fetch time so relative dates ("3 hours ago") resolve as
+they did when the page was fetched. Identical pages are parsed once, a few
+per worker in flight at a time, and the articles are inserted in batches of
+PIPELINE_BATCH_SIZE. The dedup and cluster indexes are loaded from the
+database first, as at app startup, so rows already stored are skipped
+without a query and new ones join the clusters of the stored articles.
+"""
+import argparse
+import logging
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date, datetime
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+from .config import settings
+from .ingestion import ingest_articles, load_cluster_index, load_seen_index
+from .logging_config import configure_logging
+from .scrapers.archive import Snapshot, SnapshotArchive
+from .scrapers.arxiv_scraper import ArxivScraper
+from .scrapers.base_scraper import BaseScraper
+from .scrapers.declarative import load_scrapers
+
+logger = logging.getLogger(__name__)
+
+# Parsed snapshots waiting to be consumed, per pool worker
+IN_FLIGHT_PER_WORKER = 2
+
+
+def _day(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def _parse_snapshot(scraper: BaseScraper, root: str, snapshot: Snapshot) -> List[Dict]:
+    """Worker side: the page is read from the archive here, not shipped from the parent"""
+    content = SnapshotArchive(root, retention_days=0).read(snapshot.digest)
+    scraper.fetched_at = snapshot.fetched_at
+    return scraper.parse_snapshot(snapshot.url, content)
+
+
+def reparse(
+    archive: SnapshotArchive,
+    sources: Optional[Sequence[str]] = None,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    workers: Optional[int] = None,
+    dry_run: bool = False,
+) -> Dict[str, Dict[str, int]]:
+    """
+    Parse the matching snapshots and store the articles (unless dry_run).
+    Returns per source the snapshots parsed, the ones that yielded nothing,
+    the articles extracted and the rows inserted.
+    """
+    # arXiv snapshots are OAI ListRecords responses, or listing pages in ARXIV_MODE=html
+    scrapers = {scraper.source_name: scraper for scraper in [ArxivScraper()] + load_scrapers()}
+    unknown = set(sources or ()) - set(scrapers)
+    if unknown:
+        raise ValueError(f"Unknown sources: {', '.join(sorted(unknown))}")
+
+    todo: List[Snapshot] = []
+    seen = set()
+    for snapshot in archive.snapshots(since, until):
+        if snapshot.source not in scrapers or (sources and snapshot.source not in sources):
+            continue
+        # An unchanged page fetched again parses the same; keep its first fetch
+        if (snapshot.source, snapshot.digest) in seen:
+            continue
+        seen.add((snapshot.source, snapshot.digest))
+        todo.append(snapshot)
+
+    if not dry_run:
+        logger.info(f"Dedup index warmed with {load_seen_index()} keys")
+        if settings.CLUSTER_ENABLED:
+            logger.info(f"Cluster index warmed with {load_cluster_index()} recent articles")
+
+    report: Dict[str, Dict[str, int]] = {}
+    pending: List[Dict] = []
+
+    def flush() -> None:
+        for name, count in ingest_articles(pending).items():
+            report[name]["inserted"] += count
+        pending.clear()
+
+    workers = workers or os.cpu_count() or 1
+    logger.info(f"Re-parsing {len(todo)} snapshots with {workers} workers")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # A sliding window: only a few parsed pages wait in memory at a time
+        remaining = iter(todo)
+        in_flight: Deque[Tuple[Snapshot, Future]] = deque()
+
+        def submit() -> None:
+            snapshot = next(remaining, None)
+            if snapshot is not None:
+                future = executor.submit(_parse_snapshot, scrapers[snapshot.source], archive.root, snapshot)
+                in_flight.append((snapshot, future))
+
+        for _ in range(workers * IN_FLIGHT_PER_WORKER):
+            submit()
+        while in_flight:
+            snapshot, future = in_flight.popleft()
+            submit()
+            entry = report.setdefault(snapshot.source, {"snapshots": 0, "empty": 0, "articles": 0, "inserted": 0})
+            entry["snapshots"] += 1
+            try:
+                articles = future.result()
+            except Exception as e:
+                logger.warning(f"Could not re-parse {snapshot.url} ({snapshot.digest}): {e}")
+                entry["empty"] += 1
+                continue
+            if not articles:
+                entry["empty"] += 1
+            entry["articles"] += len(articles)
+            if not dry_run:
+                pending.extend(articles)
+                if len(pending) >= settings.PIPELINE_BATCH_SIZE:
+                    flush()
+    if pending:
+        flush()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", action="append", dest="sources", help="source name to re-parse (repeatable)")
+    parser.add_argument("--since", type=_day, help="first fetch day to re-parse (YYYY-MM-DD)")
+    parser.add_argument("--until", type=_day, help="last fetch day to re-parse (YYYY-MM-DD)")
+    parser.add_argument("--workers", type=int, help="parse processes (default: one per core)")
+    parser.add_argument("--archive", help=f"archive directory (default: {settings.SNAPSHOT_DIR})")
+    parser.add_argument("--dry-run", action="store_true", help="parse and report without storing")
+    parser.add_argument("--prune", action="store_true", help="only drop snapshots past SNAPSHOT_RETENTION_DAYS")
+    args = parser.parse_args()
+    configure_logging()
+
+    archive = SnapshotArchive(args.archive)
+    if args.prune:
+        print(f"Pruned {archive.prune()} snapshots")
+        return
+    try:
+        report = reparse(archive, args.sources, args.since, args.until, args.workers, args.dry_run)
+    except ValueError as e:
+        parser.error(str(e))
+    for name, entry in sorted(report.items()):
+        print(
+            f"{name}: {entry['snapshots']} snapshots ({entry['empty']} empty), "
+            f"{entry['articles']} articles, {entry['inserted']} inserted"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+import asyncio
+import logging
+import random
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+from starlette.concurrency import run_in_threadpool
+from . import crud
+from .config import settings
+from .database import SessionLocal, engine
+from .locks import named_lock
+from .pipeline import IngestPipeline
+from .scrapers.base_scraper import BaseScraper
+from .scrapers.scraper_manager import ScraperManager
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs kept around for the status endpoint
+MAX_JOBS = 200
+
+
+def _in_session(fn, *args):
+    """Run a crud function in its own committed session. Blocking."""
+    db = SessionLocal()
+    try:
+        result = fn(db, *args)
+        db.commit()
+        return result
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def parse_intervals(raw: str) -> Dict[str, float]:
+    """Parse SCHEDULER_SOURCE_INTERVALS, e.g. "arXiv CS.AI=3600;TechCrunch AI=900" """
+    intervals = {}
+    for item in raw.split(";"):
+        if "=" in item:
+            name, seconds = item.rsplit("=", 1)
+            intervals[name.strip()] = float(seconds)
+    return intervals
+
+
+class RefreshScheduler:
+    """
+    Runs every scraper on its own interval in the background and executes
+    on-demand refresh jobs.
+
+    A source never runs twice at the same time (single flight): callers in
+    the same process share one task, and across worker processes the run is
+    guarded by a PostgreSQL advisory lock, or a file lock on other databases.
+    Periodic runs skip a source that is already running; on-demand jobs wait
+    for the running refresh and return its recorded outcome instead of
+    scraping again. Failed runs back off exponentially; every delay is
+    jittered so sources and workers do not fire in lockstep.
+    """
+
+    def __init__(
+        self,
+        manager: ScraperManager,
+        interval: Optional[float] = None,
+        jitter: Optional[float] = None,
+        max_backoff: Optional[float] = None,
+    ):
+        self.manager = manager
+        self.pipeline = IngestPipeline(concurrency=manager.concurrency, source_timeout=manager.source_timeout)
+        self.interval = interval or settings.SCHEDULER_INTERVAL
+        self.jitter = settings.SCHEDULER_JITTER if jitter is None else jitter
+        self.max_backoff = max_backoff or settings.SCHEDULER_MAX_BACKOFF
+        self.intervals = parse_intervals(settings.SCHEDULER_SOURCE_INTERVALS)
+        self.jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._flights: Dict[str, asyncio.Future] = {}
+        self._failures: Dict[str, int] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._job_tasks = set()
+
+    def _jittered(self, delay: float) -> float:
+        return max(0.0, delay * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def next_delay(self, source_name: str) -> float:
+        interval = self.intervals.get(source_name, self.interval)
+        failures = self._failures.get(source_name, 0)
+        if failures:
+            backoff = settings.SCHEDULER_BACKOFF_BASE * (2 ** (failures - 1))
+            return self._jittered(min(backoff, self.max_backoff, interval))
+        return self._jittered(interval)
+
+    def start(self) -> None:
+        """Start one periodic loop per source"""
+        if self._tasks:
+            return
+        for scraper in self.manager.scrapers:
+            self._tasks.append(asyncio.ensure_future(self._run_periodically(scraper)))
+        logger.info(f"Refresh scheduler started for {len(self._tasks)} sources")
+
+    async def stop(self) -> None:
+        tasks = self._tasks + list(self._job_tasks) + list(self._flights.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run_periodically(self, scraper: BaseScraper) -> None:
+        # Spread the first runs out instead of scraping everything at boot
+        await asyncio.sleep(random.uniform(0, settings.SCHEDULER_INITIAL_DELAY))
+        while True:
+            try:
+                await self.run_source(scraper)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Scheduled refresh of {scraper.source_name} crashed: {e}")
+            await asyncio.sleep(self.next_delay(scraper.source_name))
+
+    async def run_source(self, scraper: BaseScraper, wait: bool = False) -> Dict:
+        """
+        Scrape and ingest one source unless it is already running here or in
+        another worker. With wait, join the running refresh instead of
+        skipping and return its result (marked "shared"). Returns a small
+        per-source report.
+        """
+        name = scraper.source_name
+        flight = self._flights.get(name)
+        if flight is not None:
+            if not wait:
+                return {"status": "skipped", "reason": "already running"}
+            # Shielded: a caller giving up does not cancel the others' refresh
+            result = await asyncio.shield(flight)
+            if result["status"] != "skipped":
+                return {**result, "shared": True}
+            # Joined a periodic run that gave way to another worker: wait for that one
+
+        flight = self._flights[name] = asyncio.ensure_future(self._refresh(scraper, wait))
+        flight.add_done_callback(lambda done: self._forget_flight(name, done))
+        result = await asyncio.shield(flight)
+
+        if result["status"] == "skipped":
+            return result
+        if result["status"] != "succeeded":
+            self._failures[name] = self._failures.get(name, 0) + 1
+            logger.warning(f"Refresh of {name} {result['status'].replace('_', ' ')}: {result.get('error', '')}")
+            return result
+
+        self._failures.pop(name, None)
+        if not result.get("shared"):
+            logger.info(f"Refresh of {name} stored {result['inserted']} new articles")
+        return result
+
+    def _forget_flight(self, name: str, flight: asyncio.Future) -> None:
+        if self._flights.get(name) is flight:
+            del self._flights[name]
+
+    async def _refresh(self, scraper: BaseScraper, wait: bool) -> Dict:
+        name = scraper.source_name
+        requested_at = datetime.utcnow()
+        lock = named_lock(engine, f"refresh:{name}")
+        waited = False
+        while not await run_in_threadpool(lock.acquire):
+            if not wait:
+                return {"status": "skipped", "reason": "running in another worker"}
+            waited = True
+            await asyncio.sleep(settings.REFRESH_LOCK_POLL_SECONDS)
+
+        try:
+            if waited:
+                # Another worker refreshed the source while this one waited
+                run = await run_in_threadpool(_in_session, crud.get_refresh_run, name)
+                if run is not None and run.pop("finished_at") >= requested_at:
+                    return {**run, "shared": True}
+
+            started_at = datetime.utcnow()
+            # Pages are stored as they are crawled, not once the source is done
+            result = (await self.pipeline.run([scraper]))[name]
+            try:
+                await run_in_threadpool(
+                    _in_session, crud.record_refresh_run, name, result, started_at, datetime.utcnow()
+                )
+            except Exception as e:
+                logger.warning(f"Could not record the refresh of {name}: {e}")
+            return result
+        finally:
+            await run_in_threadpool(lock.release)
+
+    async def enqueue(self, source_names: Optional[List[str]] = None) -> Dict:
+        """Queue an on-demand refresh and return its job record"""
+        scrapers = self.manager.scrapers
+        if source_names:
+            scrapers = [self.manager.get_scraper(name) for name in source_names]
+            unknown = [name for name, scraper in zip(source_names, scrapers) if scraper is None]
+            if unknown:
+                raise KeyError(", ".join(unknown))
+
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": "queued",
+            "sources": [scraper.source_name for scraper in scrapers],
+            "created_at": datetime.utcnow(),
+            "started_at": None,
+            "finished_at": None,
+            "count": 0,
+            "results": {},
+            "timed_out": [],
+        }
+        self.jobs[job["job_id"]] = job
+        while len(self.jobs) > MAX_JOBS:
+            self.jobs.popitem(last=False)
+        await self._save_job(job)
+        task = asyncio.ensure_future(self._run_job(job, scrapers))
+        self._job_tasks.add(task)
+        task.add_done_callback(self._job_tasks.discard)
+        return job
+
+    async def get_job(self, job_id: str) -> Optional[Dict]:
+        """A job of this worker, or one another worker recorded"""
+        job = self.jobs.get(job_id)
+        if job is not None:
+            return job
+        return await run_in_threadpool(_in_session, crud.get_refresh_job, job_id)
+
+    async def _save_job(self, job: Dict) -> None:
+        try:
+            await run_in_threadpool(_in_session, crud.save_refresh_job, job)
+        except Exception as e:
+            # The job still runs; only other workers cannot report on it
+            logger.warning(f"Could not record refresh job {job['job_id']}: {e}")
+
+    async def _run_job(self, job: Dict, scrapers: List[BaseScraper]) -> None:
+        job["status"] = "running"
+        job["started_at"] = datetime.utcnow()
+        await self._save_job(job)
+        semaphore = asyncio.Semaphore(max(1, self.manager.concurrency))
+
+        async def run(scraper: BaseScraper) -> Dict:
+            async with semaphore:
+                return await self.run_source(scraper, wait=True)
+
+        tasks = {asyncio.ensure_future(run(scraper)): scraper.source_name for scraper in scrapers}
+        try:
+            # Like ScraperManager.fetch_with_report: sources finished by the
+            # deadline keep their results, the others are named as timed out
+            done, pending = await asyncio.wait(tasks.keys(), timeout=self.manager.deadline)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+            results = {}
+            for task, name in tasks.items():
+                if task in pending:
+                    results[name] = {"status": "timed_out"}
+                elif task.exception() is not None:
+                    logger.error(f"Refresh of {name} in job {job['job_id']} failed: {task.exception()}")
+                    results[name] = {"status": "failed", "error": str(task.exception())}
+                else:
+                    results[name] = task.result()
+            job["results"] = results
+            job["timed_out"] = [name for task, name in tasks.items() if task in pending]
+            job["count"] = sum(result.get("inserted", 0) for result in results.values())
+            succeeded = sum(1 for result in results.values() if result["status"] == "succeeded")
+            if succeeded == len(results):
+                job["status"] = "succeeded"
+            elif succeeded:
+                job["status"] = "partial"
+            elif job["timed_out"] and len(job["timed_out"]) == len(results):
+                job["status"] = "timed_out"
+            else:
+                job["status"] = "failed"
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"Refresh job {job['job_id']} failed: {e}")
+            job["status"] = "failed"
+            job["error"] = str(e)
+        finally:
+            job["finished_at"] = datetime.utcnow()
+            await self._save_job(job)
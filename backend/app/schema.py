@@ -0,0 +1,53 @@
+"""
+Startup schema check.
+
+Alembic owns the schema (backend/alembic/versions). A worker only builds it
+itself on an empty database, with create_all() stamped at the head
+revision so later migrations apply. Any other database must already be at
+head: create_all() next to an unmigrated schema would add tables the
+migrations then fail to create, and would never add the new columns.
+"""
+import logging
+import os
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+from . import models, search
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic")
+
+
+class SchemaError(RuntimeError):
+    """The database schema is not the one this code expects"""
+
+
+def head_revision() -> str:
+    return ScriptDirectory(MIGRATIONS_DIR).get_current_head()
+
+
+def ensure_schema(engine: Engine) -> None:
+    """Create the schema on an empty database, else require it to be at head"""
+    script = ScriptDirectory(MIGRATIONS_DIR)
+    head = script.get_current_head()
+    with engine.begin() as conn:
+        context = MigrationContext.configure(conn)
+        current = context.get_current_revision()
+        if current == head:
+            return
+        if current is not None:
+            raise SchemaError(
+                f"The database is at revision {current}, this code needs {head}: "
+                "run `alembic upgrade head` from backend/"
+            )
+        if set(inspect(conn).get_table_names()) - {"alembic_version"}:
+            raise SchemaError(
+                "The database has tables but no Alembic revision. If it predates the "
+                "migrations, run `alembic stamp 0001 && alembic upgrade head` from backend/"
+            )
+        models.Base.metadata.create_all(bind=conn)
+        context.stamp(script, head)
+    search.ensure_search_index(engine)
+    logger.info(f"Created the database schema at revision {head}")
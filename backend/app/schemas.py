@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
 
 class ArticleBase(BaseModel):
     title: str
@@ -13,6 +14,7 @@ class ArticleCreate(ArticleBase):
 
 class Article(ArticleBase):
     article_id: int
+    cluster_id: Optional[int] = None
 
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -0,0 +1,222 @@
+"""
+Content-addressed archive of the raw listing pages the scrapers fetch.
+
+Every successful listing fetch is stored, so a source whose markup changed
+under its parser can be re-parsed offline (python -m app.reparse) once the
+spec is fixed, instead of losing the pages fetched in the meantime.
+
+    <root>/objects/ab/ab12....zst    page bytes, named by their sha256
+    <root>/index/2026-01-31.jsonl    one line per fetch: source, url, time, digest
+
+Identical pages are stored once, whatever the number of fetches pointing at
+them. Pages are compressed with zstd when the optional zstandard package is
+installed, gzip otherwise; both are read back. Index files older than
+SNAPSHOT_RETENTION_DAYS are dropped, then the objects no index refers to.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Iterator, NamedTuple, Optional, Set
+from ..config import settings
+from ..metrics import SNAPSHOTS_STORED, SNAPSHOT_BYTES
+
+try:
+    import zstandard
+except ImportError:  # optional: gzip is used instead
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+ZSTD_SUFFIX = ".zst"
+GZIP_SUFFIX = ".gz"
+# Objects younger than this survive a prune even when unreferenced: their
+# index line may not be written yet
+PRUNE_GRACE_SECONDS = 3600
+PRUNE_INTERVAL_SECONDS = 86400
+
+
+class Snapshot(NamedTuple):
+    source: str
+    url: str
+    fetched_at: datetime
+    digest: str
+    size: int
+
+
+class SnapshotArchive:
+    """Thread-safe; several processes may share the same root"""
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        retention_days: Optional[float] = None,
+        level: Optional[int] = None,
+    ):
+        self.root = root or settings.SNAPSHOT_DIR
+        self.retention_days = settings.SNAPSHOT_RETENTION_DAYS if retention_days is None else retention_days
+        self.level = level or settings.SNAPSHOT_COMPRESSION_LEVEL
+        self.suffix = ZSTD_SUFFIX if zstandard is not None else GZIP_SUFFIX
+        self._lock = threading.Lock()
+        self._next_prune = 0.0
+
+    def _object_path(self, digest: str, suffix: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], digest + suffix)
+
+    def _index_path(self, day: date) -> str:
+        return os.path.join(self.root, "index", f"{day.isoformat()}.jsonl")
+
+    def _compress(self, content: bytes) -> bytes:
+        if self.suffix == ZSTD_SUFFIX:
+            # Compressor objects are not thread-safe; one per page is cheap
+            return zstandard.ZstdCompressor(level=self.level).compress(content)
+        return gzip.compress(content, compresslevel=min(self.level, 9))
+
+    def put(self, source: str, url: str, content: bytes, fetched_at: Optional[datetime] = None) -> Optional[str]:
+        """
+        Archive a fetched page; returns its digest, or None when it could
+        not be written (the scrape goes on regardless). Blocking.
+        """
+        fetched_at = fetched_at or datetime.utcnow()
+        digest = hashlib.sha256(content).hexdigest()
+        try:
+            existing = self.find(digest)
+            if existing is not None:
+                # Fresh mtime so a concurrent prune leaves it alone
+                os.utime(existing)
+                SNAPSHOTS_STORED.labels(source=source, result="duplicate").inc()
+            else:
+                self._write_object(digest, self._compress(content))
+                SNAPSHOTS_STORED.labels(source=source, result="new").inc()
+                SNAPSHOT_BYTES.labels(source=source).inc(len(content))
+            self._append_index(Snapshot(source, url, fetched_at, digest, len(content)))
+        except OSError as e:
+            logger.warning(f"Could not archive {url}: {e}")
+            return None
+        if time.monotonic() >= self._next_prune:
+            self._next_prune = time.monotonic() + PRUNE_INTERVAL_SECONDS
+            self.prune()
+        return digest
+
+    def _write_object(self, digest: str, data: bytes) -> None:
+        path = self._object_path(digest, self.suffix)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _append_index(self, snapshot: Snapshot) -> None:
+        line = json.dumps({
+            "source": snapshot.source,
+            "url": snapshot.url,
+            "fetched_at": snapshot.fetched_at.isoformat(),
+            "digest": snapshot.digest,
+            "size": snapshot.size,
+        }) + "\n"
+        path = self._index_path(snapshot.fetched_at.date())
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # A single short O_APPEND write: lines from other workers never interleave
+        with self._lock, open(path, "a", encoding="utf-8") as fh:
+            fh.write(line)
+
+    def find(self, digest: str) -> Optional[str]:
+        """Path of the stored object, whichever codec wrote it"""
+        for suffix in (ZSTD_SUFFIX, GZIP_SUFFIX):
+            path = self._object_path(digest, suffix)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def read(self, digest: str) -> bytes:
+        path = self.find(digest)
+        if path is None:
+            raise FileNotFoundError(f"No snapshot {digest} in {self.root}")
+        with open(path, "rb") as fh:
+            data = fh.read()
+        if path.endswith(GZIP_SUFFIX):
+            return gzip.decompress(data)
+        if zstandard is None:
+            raise ImportError(f"Reading {path} requires the optional 'zstandard' package")
+        return zstandard.ZstdDecompressor().decompress(data)
+
+    def _index_days(self) -> Iterator[date]:
+        try:
+            names = sorted(os.listdir(os.path.join(self.root, "index")))
+        except FileNotFoundError:
+            return
+        for name in names:
+            if name.endswith(".jsonl"):
+                try:
+                    yield date.fromisoformat(name[:-len(".jsonl")])
+                except ValueError:
+                    continue
+
+    def snapshots(self, since: Optional[date] = None, until: Optional[date] = None) -> Iterator[Snapshot]:
+        """Archived fetches between since and until (inclusive), oldest first"""
+        for day in self._index_days():
+            if (since and day < since) or (until and day > until):
+                continue
+            with open(self._index_path(day), encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        entry = json.loads(line)
+                        yield Snapshot(
+                            entry["source"], entry["url"], datetime.fromisoformat(entry["fetched_at"]),
+                            entry["digest"], entry["size"],
+                        )
+                    except (ValueError, KeyError) as e:
+                        # A line cut short by a crash
+                        logger.debug(f"Skipping bad index line in {day}: {e}")
+
+    def prune(self) -> int:
+        """Apply the retention policy; returns the number of objects removed"""
+        if not self.retention_days:
+            return 0
+        cutoff = (datetime.utcnow() - timedelta(days=self.retention_days)).date()
+        for day in list(self._index_days()):
+            if day < cutoff:
+                try:
+                    os.remove(self._index_path(day))
+                except FileNotFoundError:
+                    pass
+
+        referenced: Set[str] = {snapshot.digest for snapshot in self.snapshots()}
+        removed = 0
+        horizon = time.time() - PRUNE_GRACE_SECONDS
+        for directory, _, names in os.walk(os.path.join(self.root, "objects")):
+            for name in names:
+                digest = name.split(".", 1)[0]
+                path = os.path.join(directory, name)
+                try:
+                    if digest not in referenced and os.path.getmtime(path) < horizon:
+                        os.remove(path)
+                        removed += 1
+                except FileNotFoundError:
+                    # Removed by another worker's prune
+                    continue
+        if removed:
+            logger.info(f"Pruned {removed} snapshots older than {self.retention_days} days from {self.root}")
+        return removed
+
+
+def default_archive() -> Optional[SnapshotArchive]:
+    """The archive the scrapers write to, or None when SNAPSHOT_ARCHIVE_ENABLED is off"""
+    if not settings.SNAPSHOT_ARCHIVE_ENABLED:
+        return None
+    if zstandard is None:
+        logger.info("zstandard is not installed, archiving snapshots with gzip")
+    return SnapshotArchive()
@@ -1,73 +1,257 @@
-import re
-from datetime import datetime
-from typing import Dict, List
-import httpx
-from bs4 import BeautifulSoup
+import logging
+from datetime import date, datetime, timedelta
+from functools import partial
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional
+from starlette.concurrency import run_in_threadpool
 from .base_scraper import BaseScraper
+from .oai import ListRecordsParser, OAIError, datestamp, is_deleted, metadata
+from .parse_pool import run_in_pool
+from .store import JsonFileStore
+from ..config import settings
+from ..dates import parser_for
+from ..metrics import SCRAPER_ITEMS, SCRAPER_PARSE_SECONDS, timed
+
+logger = logging.getLogger(__name__)
+
+ARXIV_NS = "{http://arxiv.org/OAI/arXiv/}"
+
+
+# OAI "created" dates
+_DAY_FORMATS = ("%Y-%m-%d",)
+
+
+class RecordsPage(NamedTuple):
+    """What one ListRecords response yields; picklable, unlike the parser"""
+    articles: List[Dict]
+    resumption_token: Optional[str]
+    max_datestamp: Optional[str]
+    error: Optional[OAIError]
+
 
 class ArxivScraper(BaseScraper):
-    def __init__(self):
+    def __init__(self, mode: Optional[str] = None, state_path: Optional[str] = None):
         super().__init__(source_name="arXiv CS.AI")
-        self.base_url = "https://arxiv.org/list/cs.AI/new"
-
-    async def fetch_articles(self) -> List[Dict]:
-        """
-        Fetch new AI-related articles from arXiv
-        """
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(self.base_url)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.text, 'html.parser')
-                articles = []
-
-                # Find the "New submissions" section
-                new_submissions = soup.find('h3', string=re.compile(r'New submissions'))
-                if new_submissions:
-                    # Get all articles in the new submissions section
-                    dl_elements = new_submissions.find_next('dl')
-                    if dl_elements:
-                        current_article = {}
-                        for element in dl_elements.children:
-                            if element.name == 'dt':
-                                # Start of new article
-                                if current_article:
-                                    articles.append(await self.parse_article(current_article))
-                                current_article = {'id': element.get('id', '')}
-                            elif element.name == 'dd':
-                                # Article content
-                                if current_article is not None:
-                                    title_div = element.find('div', class_='list-title')
-                                    authors_div = element.find('div', class_='list-authors')
-                                    abstract_div = element.find('p', class_='mathjax')
-                                    
-                                    if title_div:
-                                        current_article['title'] = self.clean_text(title_div.text.replace('Title:', ''))
-                                    if authors_div:
-                                        current_article['authors'] = self.clean_text(authors_div.text.replace('Authors:', ''))
-                                    if abstract_div:
-                                        current_article['abstract'] = self.clean_text(abstract_div.text)
-                                    
-                                    # Extract arXiv ID and create link
-                                    if 'id' in current_article:
-                                        arxiv_id = current_article['id'].split(':')[-1]
-                                        current_article['link'] = f"https://arxiv.org/abs/{arxiv_id}"
-
-                        # Don't forget to append the last article
-                        if current_article:
-                            articles.append(await self.parse_article(current_article))
-
-                return articles
-
-        except httpx.HTTPError as e:
-            print(f"HTTP error occurred while fetching arXiv articles: {e}")
-            return []
-        except Exception as e:
-            print(f"Error occurred while fetching arXiv articles: {e}")
-            return []
-
-    async def parse_article(self, article_data: Dict) -> Dict:
+        self.base_url = f"https://arxiv.org/list/{settings.ARXIV_CATEGORY}/new"
+        self.mode = mode or settings.ARXIV_MODE
+        self.category = settings.ARXIV_CATEGORY
+        self.state_path = state_path or settings.ARXIV_STATE_PATH
+        self._state: Optional[JsonFileStore] = None
+        if self.mode != "html":
+            # A full list outlasts SCRAPER_SOURCE_TIMEOUT on a busy day
+            self.timeout = settings.ARXIV_HARVEST_TIMEOUT
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state["_state"] = None
+        return state
+
+    @property
+    def state(self) -> JsonFileStore:
+        """Persisted harvest position: last datestamp and pending resumption token"""
+        if self._state is None:
+            self._state = JsonFileStore(self.state_path)
+        return self._state
+
+    async def iter_pages(self) -> AsyncIterator[List[Dict]]:
+        """
+        One batch per ListRecords response in "oai" mode, which fetches only
+        what changed since the last harvest; per listing page in "html" mode.
+        crawl() and fetch_articles() follow the mode through it.
+        """
+        if self.mode == "html":
+            async for batch in super().iter_pages():
+                yield batch
+            return
+        async for batch in self.iter_harvest():
+            yield batch
+
+    async def harvest(self, since: Optional[date] = None, until: Optional[date] = None) -> List[Dict]:
+        """Collect iter_harvest into one list"""
+        articles: List[Dict] = []
+        async for batch in self.iter_harvest(since, until):
+            articles.extend(batch)
+        logger.info(f"{self.source_name} harvested {len(articles)} records")
+        return articles
+
+    async def iter_harvest(
+        self, since: Optional[date] = None, until: Optional[date] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Harvest ListRecords from the OAI-PMH endpoint, following resumption
+        tokens until the list is complete, yielding the articles of each
+        response as it is read.
+
+        Without arguments this is an incremental run starting at the stored
+        high-water mark (the newest datestamp seen). Progress is registered
+        with after_stored, so it is saved only once the articles read before
+        it are stored: the resumption token of each response, from which a
+        run cut short by a timeout or a crash resumes, and, once the whole
+        list has been read, the new mark. With since/until it backfills that
+        window and leaves the harvest position untouched.
+        """
+        self.fetched_at = datetime.utcnow()
+        incremental = since is None and until is None
+        params = self._window_params(since, until, incremental)
+        high_water = self.state.get("last_datestamp") if incremental else None
+        token = self.state.get("resumption_token") if incremental else None
+        if token:
+            logger.info(f"{self.source_name} resuming an interrupted harvest")
+            high_water = max(high_water or "", self.state.get("pending_datestamp") or "") or None
+
+        while True:
+            query = {"verb": "ListRecords", "resumptionToken": token} if token else params
+            page = await self._list_records(query)
+            if page.error is not None:
+                if page.error.code == "noRecordsMatch":
+                    break
+                if page.error.code == "badResumptionToken" and incremental and token:
+                    # Tokens expire: start the list over from the mark
+                    logger.info(f"{self.source_name} resumption token expired, restarting the harvest")
+                    await run_in_threadpool(self._save_position, None, None)
+                    token = None
+                    continue
+                raise page.error
+            if page.max_datestamp and (not high_water or page.max_datestamp > high_water):
+                high_water = page.max_datestamp
+            SCRAPER_ITEMS.labels(source=self.source_name).inc(len(page.articles))
+            token = page.resumption_token
+            if incremental and token:
+                self.after_stored(partial(self._save_position, token, high_water))
+            if page.articles:
+                yield page.articles
+            if not token:
+                break
+
+        if incremental:
+            # Behind the tokens registered above, which must not outlive the list
+            self.after_stored(partial(self._save_position, None, high_water))
+
+    def _save_position(self, token: Optional[str], high_water: Optional[str]) -> None:
+        """
+        Store the token an interrupted list resumes from, or, with no token,
+        close the list: advance the mark to high_water and drop the token
+        """
+        if token:
+            self.state.set("resumption_token", token)
+            self.state.set("pending_datestamp", high_water)
+            return
+        if high_water:
+            self.state.set("last_datestamp", high_water)
+        self.state.delete("resumption_token")
+        self.state.delete("pending_datestamp")
+
+    def _window_params(self, since: Optional[date], until: Optional[date], incremental: bool) -> Dict[str, str]:
+        params = {"verb": "ListRecords", "metadataPrefix": "arXiv", "set": settings.ARXIV_OAI_SET}
+        if incremental:
+            # Datestamps have day granularity and "from" is inclusive: the
+            # last harvested day is fetched again and the duplicates are
+            # dropped on insert
+            start = self.state.get("last_datestamp")
+            if not start:
+                start = (datetime.utcnow().date() - timedelta(days=settings.ARXIV_INITIAL_DAYS)).isoformat()
+            params["from"] = start
+        else:
+            if since:
+                params["from"] = since.isoformat()
+            if until:
+                params["until"] = until.isoformat()
+        return params
+
+    async def _list_records(self, params: Dict[str, str]) -> RecordsPage:
+        """
+        Fetch one ListRecords response (archived like the listing pages, see
+        parse_snapshot) and parse it in the parse pool
+        """
+        # export.arxiv.org answers 503 + Retry-After while it throttles
+        # harvesters; the client's politeness scheduler waits and retries
+        response = await self.fetch_page(settings.ARXIV_OAI_URL, params=params)
+        with timed(SCRAPER_PARSE_SECONDS.labels(source=self.source_name)):
+            return await run_in_pool(self.parse_records, response.content)
+
+    def parse_records(self, content: bytes) -> RecordsPage:
+        """
+        Extract the articles of a ListRecords response, with its resumption
+        token, highest datestamp and OAI error. No I/O, like parse_page.
+        """
+        parser = ListRecordsParser()
+        articles: List[Dict] = []
+        max_datestamp: Optional[str] = None
+        for records in (parser.feed(content), parser.close()):
+            for record in records:
+                stamp = datestamp(record)
+                if stamp and (not max_datestamp or stamp > max_datestamp):
+                    max_datestamp = stamp
+                if is_deleted(record):
+                    continue
+                data = metadata(record, ARXIV_NS)
+                # The "cs" set holds every CS category; keep the configured one
+                if self.category not in str(data.get("categories", "")).split():
+                    continue
+                articles.append(self.parse_record(data))
+        return RecordsPage(articles, parser.resumption_token, max_datestamp, parser.error)
+
+    def parse_snapshot(self, url: str, content: bytes) -> List[Dict]:
+        if url.startswith(settings.ARXIV_OAI_URL):
+            return self.parse_records(content).articles
+        return super().parse_snapshot(url, content)
+
+    def parse_record(self, data: Dict) -> Dict:
+        """Map arXiv OAI metadata to the fields parse_article expects"""
+        authors = []
+        for author in data.get("authors") or []:
+            name = " ".join(part for part in (author.get("forenames"), author.get("keyname"), author.get("suffix")) if part)
+            if name:
+                authors.append(name)
+        arxiv_id = data.get("id", "")
+        return self.parse_article({
+            "id": arxiv_id,
+            "title": self.clean_text(data.get("title", "")),
+            "authors": ", ".join(authors),
+            "abstract": self.clean_text(data.get("abstract", "")),
+            "link": f"https://arxiv.org/abs/{arxiv_id}" if arxiv_id else "",
+            # Submission date of the first version
+            "date": parser_for(self.source_name, _DAY_FORMATS).parse(data.get("created")),
+        })
+
+    def parse_page(self, html: str) -> List[Dict]:
+        """
+        Extract new AI-related articles from the arXiv listing page
+        """
+        doc = self.parse_document(html)
+        articles = []
+
+        # The "New submissions" section is the first definition list on the page
+        submissions = doc.select_one('dl')
+        if submissions:
+            # Each submission is a <dt> (identifier) followed by a <dd> (metadata)
+            for dt, dd in zip(submissions.select('dt'), submissions.select('dd')):
+                current_article = {'id': dt.attr('id', '')}
+                if not current_article['id']:
+                    abs_link = dt.select_one('a[href^="/abs/"]')
+                    if abs_link:
+                        current_article['id'] = abs_link.attr('href', '').rsplit('/', 1)[-1]
+
+                title_div = dd.select_one('div.list-title')
+                authors_div = dd.select_one('div.list-authors')
+                abstract_div = dd.select_one('p.mathjax')
+
+                if title_div:
+                    current_article['title'] = self.clean_text(title_div.text().replace('Title:', ''))
+                if authors_div:
+                    current_article['authors'] = self.clean_text(authors_div.text().replace('Authors:', ''))
+                if abstract_div:
+                    current_article['abstract'] = self.clean_text(abstract_div.text())
+
+                # Extract arXiv ID and create link
+                if current_article['id']:
+                    arxiv_id = current_article['id'].split(':')[-1]
+                    current_article['link'] = f"https://arxiv.org/abs/{arxiv_id}"
+
+                articles.append(self.parse_article(current_article))
+
+        return articles
+
+    def parse_article(self, article_data: Dict) -> Dict:
         """
         Parse article data into standardized format
         """
@@ -85,7 +269,8 @@ class ArxivScraper(BaseScraper):
             "summary": summary,
             "link": article_data.get('link', ''),
             "source": self.source_name,
-            "publication_date": datetime.utcnow()  # arXiv shows current date for new submissions
+            # The listing page carries no date: new submissions are stamped now
+            "publication_date": article_data.get('date') or self.reference_time()
         }
 
     def clean_text(self, text: str) -> str:
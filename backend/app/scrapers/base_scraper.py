@@ -1,21 +1,267 @@
+import asyncio
+import logging
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Dict
+from functools import partial
+from typing import AsyncIterator, Callable, List, Dict, Optional, Set, Tuple
+import httpx
+from starlette.concurrency import run_in_threadpool
+from .archive import SnapshotArchive
+from .http_client import HttpClient
+from .parse_pool import run_in_pool
+from .parsers import Node, parse_html
+from ..config import settings
+from ..dedup import SeenIndex
+from ..metrics import SCRAPER_BYTES, SCRAPER_FETCH_SECONDS, SCRAPER_ITEMS, SCRAPER_PARSE_SECONDS, record_error, timed
+
+logger = logging.getLogger(__name__)
 
 class BaseScraper(ABC):
-    def __init__(self, source_name: str):
+    base_url: str = ""
+    # Listing pages walked per refresh; scrapers overriding page_url raise it
+    max_pages: int = 1
+    # Crawl budget in seconds; None means settings.SCRAPER_SOURCE_TIMEOUT
+    timeout: Optional[float] = None
+
+    def __init__(self, source_name: str, http: Optional[HttpClient] = None, parser: Optional[str] = None):
         self.source_name = source_name
+        self.http = http
+        # HTML parser backend; None means settings.HTML_PARSER
+        self.parser = parser
+        self.seen_index: Optional[SeenIndex] = None
+        self.archive: Optional[SnapshotArchive] = None
+        # Start of the current crawl, the "now" of relative dates and of
+        # undated items; pickled along with the scraper into the parse pool
+        self.fetched_at: Optional[datetime] = None
+        # Progress of the current crawl (validators, harvest position) to
+        # save once the articles yielded before it are stored
+        self._on_stored: List[Callable[[], None]] = []
+
+    def __getstate__(self):
+        # Scrapers are shipped to the process parse pool; the HTTP client
+        # (sockets, asyncio primitives) stays behind
+        state = self.__dict__.copy()
+        state["http"] = None
+        state["seen_index"] = None
+        state["archive"] = None
+        state["_on_stored"] = []
+        return state
+
+    def bind_http(self, http: HttpClient) -> None:
+        """
+        Attach the shared HTTP client owned by the ScraperManager
+        """
+        self.http = http
+
+    def bind_seen_index(self, seen_index: SeenIndex) -> None:
+        """
+        Attach the index of already stored articles the crawl stops at
+        """
+        self.seen_index = seen_index
+
+    def bind_archive(self, archive: Optional[SnapshotArchive]) -> None:
+        """
+        Attach the archive every fetched listing page is saved to
+        """
+        self.archive = archive
+
+    def after_stored(self, callback: Callable[[], None]) -> None:
+        """
+        Register a blocking callback to run once every article yielded so
+        far by iter_pages is stored; it is dropped if storing them fails
+        """
+        self._on_stored.append(callback)
+
+    def take_stored_callbacks(self) -> List[Callable[[], None]]:
+        """
+        Hand the callbacks registered since the last call over to the caller
+        storing the crawl's articles (see IngestPipeline)
+        """
+        callbacks, self._on_stored = self._on_stored, []
+        return callbacks
+
+    def is_known(self, link: str) -> bool:
+        return self.seen_index is not None and self.seen_index.contains(self.source_name, link=link)
+
+    def reference_time(self) -> datetime:
+        """
+        The fetch time of the current crawl (naive UTC), or now outside of one
+        """
+        return self.fetched_at or datetime.utcnow()
+
+    def page_url(self, page: int) -> Optional[str]:
+        """
+        URL of the 1-based listing page, or None when the listing has no such page
+        """
+        return self.base_url if page == 1 else None
+
+    async def fetch_page(self, url: str, conditional: bool = False, **kwargs) -> Optional[httpx.Response]:
+        """
+        GET a page through the shared client and raise on HTTP errors.
+
+        With conditional=True the request carries the cached validators for
+        the URL and None is returned when the page has not changed.
+        """
+        if self.http is None:
+            # Standalone use (scripts, shell): lazily create a private client
+            self.http = HttpClient()
+        with timed(SCRAPER_FETCH_SECONDS.labels(source=self.source_name)):
+            if conditional:
+                response = await self.http.get_if_modified(url, self.source_name, **kwargs)
+            else:
+                response = await self.http.get(url, self.source_name, **kwargs)
+        if response is None:
+            return None
+        SCRAPER_BYTES.labels(source=self.source_name).inc(len(response.content))
+        response.raise_for_status()
+        if self.archive is not None:
+            await run_in_threadpool(
+                self.archive.put, self.source_name, str(response.url), response.content, self.fetched_at
+            )
+        return response
 
-    @abstractmethod
     async def fetch_articles(self) -> List[Dict]:
         """
         Fetch articles from the source
         Returns a list of dictionaries containing article data
+
+        Network I/O happens here on the event loop; the CPU-bound parse of the
+        page runs in the shared parse pool.
+        """
+        try:
+            return await self.crawl()
+
+        except httpx.HTTPError as e:
+            record_error(self.source_name, e)
+            logger.warning(f"HTTP error occurred while fetching {self.source_name} articles: {e}")
+            return []
+        except Exception as e:
+            record_error(self.source_name, e)
+            logger.exception(f"Error occurred while fetching {self.source_name} articles: {e}")
+            return []
+
+    async def crawl(self) -> List[Dict]:
+        """
+        Walk the listing and return every article not stored yet (iter_pages
+        collected). The raising form of fetch_articles, for callers that
+        report failures.
+
+        The crawl's progress is not saved: a caller storing the articles runs
+        take_stored_callbacks() afterwards.
+        """
+        articles = []
+        async for batch in self.iter_pages():
+            articles.extend(batch)
+        return articles
+
+    async def iter_pages(self) -> AsyncIterator[List[Dict]]:
+        """
+        Async-iterator form of the crawl: yields the new articles of each
+        listing page, newest page first, as soon as it is parsed, so the
+        ingestion pipeline can store them while later pages download.
+
+        The first page is fetched alone and conditionally, so an unchanged or
+        fully known listing costs one request. Further pages are fetched
+        settings.SCRAPER_PAGE_CONCURRENCY at a time up to max_pages, and the
+        walk stops at the first page holding nothing new. Unlike
+        fetch_articles, errors propagate: a deeper page that fails ends the
+        crawl as a failure once the pages before it are yielded, not as the
+        end of the listing.
+
+        The first page's validators are registered with after_stored once the
+        walk is over, so a listing that failed to crawl or whose articles
+        failed to store is fetched in full again next time.
+        """
+        self.fetched_at = datetime.utcnow()
+        self._on_stored = []
+        first_url = self.page_url(1)
+        response = await self.fetch_page(first_url, conditional=True)
+        if response is None:
+            logger.debug(f"{self.source_name} listing not modified since last fetch, skipping")
+            return
+
+        seen: Set[str] = set()
+        fresh, exhausted = self._new_articles(await self.parse_listing(response.text), seen)
+        if fresh:
+            yield fresh
+        depth = min(self.max_pages, settings.SCRAPER_MAX_PAGES)
+        page = 2
+        while not exhausted and page <= depth:
+            urls = []
+            for number in range(page, min(page + max(1, settings.SCRAPER_PAGE_CONCURRENCY), depth + 1)):
+                url = self.page_url(number)
+                if url is None:
+                    break
+                urls.append(url)
+            if not urls:
+                break
+
+            # Gathered in page order; pages after the first exhausted or failed one are dropped
+            results = await asyncio.gather(*(self._fetch_listing_page(url) for url in urls), return_exceptions=True)
+            for parsed in results:
+                if isinstance(parsed, BaseException):
+                    raise parsed
+                fresh, exhausted = self._new_articles(parsed, seen)
+                if fresh:
+                    yield fresh
+                if exhausted:
+                    break
+            page += len(urls)
+
+        if page > 2:
+            logger.debug(f"{self.source_name} crawled {page - 1} listing pages")
+        self.after_stored(partial(self.http.remember_validators, first_url, response))
+
+    async def _fetch_listing_page(self, url: str) -> List[Dict]:
+        response = await self.fetch_page(url)
+        return await self.parse_listing(response.text)
+
+    async def parse_listing(self, html: str) -> List[Dict]:
+        """
+        Run parse_page in the parse pool, recording parse time and item count
+        """
+        with timed(SCRAPER_PARSE_SECONDS.labels(source=self.source_name)):
+            articles = await run_in_pool(self.parse_page, html)
+        SCRAPER_ITEMS.labels(source=self.source_name).inc(len(articles))
+        return articles
+
+    def _new_articles(self, parsed: List[Dict], seen: Set[str]) -> Tuple[List[Dict], bool]:
+        """
+        Drop articles already stored or met earlier in this crawl; the page
+        exhausts the crawl when nothing is left
+        """
+        fresh = []
+        for article in parsed:
+            link = article.get("link")
+            if link in seen or (link and self.is_known(link)):
+                continue
+            if link:
+                seen.add(link)
+            fresh.append(article)
+        return fresh, not fresh
+
+    def parse_snapshot(self, url: str, content: bytes) -> List[Dict]:
+        """
+        Extract articles from an archived page fetched from url (app.reparse)
+        """
+        return self.parse_page(content.decode("utf-8", errors="replace"))
+
+    def parse_document(self, html: str) -> Node:
+        """
+        Parse HTML with this scraper's parser backend
+        """
+        return parse_html(html, self.parser)
+
+    @abstractmethod
+    def parse_page(self, html: str) -> List[Dict]:
+        """
+        Extract articles from a fetched listing page
+        Pure function of the HTML: no I/O, safe to run in a worker process
         """
         pass
 
     @abstractmethod
-    async def parse_article(self, article_data) -> Dict:
+    def parse_article(self, article_data) -> Dict:
         """
         Parse individual article data
         Returns a dictionary with article details
@@ -28,4 +274,4 @@ class BaseScraper(ABC):
         """
         if text:
             return " ".join(text.split())
-        return "" 
\ No newline at end of file
+        return ""
@@ -0,0 +1,315 @@
+"""
+Scrapers defined by data instead of code.
+
+A source spec (see sources.json) names the listing URL, the pagination
+template, the CSS selector of the items and, per output field, one or more
+ways to extract it; the first alternative yielding a non-empty value wins:
+
+    {"css": "h2 a", "attr": "href", "absolute": true}
+    {"css": "div.authors a", "all": true, "join": ", "}
+    {"css": "div.meta", "split": "•", "index": 1, "remove": ["By"]}
+    {"contains": ["days ago", "hours ago"]}   # first matching text node
+
+Dates are parsed by app.dates with the item group's date_formats ("iso",
+"relative" or strptime patterns), and the summary is built from templates over the
+extracted fields, a part being dropped when a field it uses is empty.
+
+Specs are compiled once when loaded: keys are validated, templates are
+pre-split into the fields they need and the selectors are translated up
+front for the lxml backend, so parsing a page only runs the extraction.
+"""
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from string import Formatter
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urljoin
+from .base_scraper import BaseScraper
+from .parsers import Node, precompile
+from ..config import settings
+from ..dates import DateParser, parser_for
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOURCES_PATH = os.path.join(os.path.dirname(__file__), "sources.json")
+
+_EXTRACTOR_KEYS = {"css", "attr", "all", "join", "split", "index", "remove", "absolute", "contains"}
+_GROUP_KEYS = {"selector", "fields", "date_field", "date_formats"}
+_SPEC_KEYS = {
+    "name", "url", "next_page", "max_pages", "container", "page_fields", "items",
+    "summary", "recent_hours", "fallback_latest",
+}
+
+
+class SpecError(ValueError):
+    pass
+
+
+def _check_keys(where: str, spec: Dict, allowed: set) -> None:
+    unknown = set(spec) - allowed
+    if unknown:
+        raise SpecError(f"{where}: unknown keys {', '.join(sorted(unknown))}")
+
+
+def _clean(text: Optional[str]) -> str:
+    return " ".join(text.split()) if text else ""
+
+
+class Extractor:
+    """One way of reading a field from an item node"""
+
+    __slots__ = ("css", "attr", "all", "join", "split", "index", "remove", "absolute", "contains")
+
+    def __init__(self, spec: Dict, where: str, parser: Optional[str]):
+        _check_keys(where, spec, _EXTRACTOR_KEYS)
+        self.css: Optional[str] = spec.get("css")
+        self.attr: Optional[str] = spec.get("attr")
+        self.all: bool = bool(spec.get("all", False))
+        self.join: str = spec.get("join", " ")
+        self.split: Optional[str] = spec.get("split")
+        self.index: int = int(spec.get("index", 0))
+        self.remove: Tuple[str, ...] = tuple(spec.get("remove", ()))
+        self.absolute: bool = bool(spec.get("absolute", False))
+        self.contains: Tuple[str, ...] = tuple(needle.lower() for needle in spec.get("contains", ()))
+        if self.css:
+            try:
+                precompile(self.css, parser)
+            except Exception as e:
+                raise SpecError(f"{where}: invalid selector {self.css!r}: {e}") from e
+
+    def _read(self, node: Node) -> Optional[str]:
+        if self.contains:
+            for text in node.strings():
+                lowered = text.lower()
+                if any(needle in lowered for needle in self.contains):
+                    return text
+            return None
+        return node.attr(self.attr) if self.attr else node.text()
+
+    def extract(self, item: Node, base_url: str) -> Optional[str]:
+        if self.all:
+            nodes = item.select(self.css) if self.css else [item]
+            values = [_clean(self._read(node)) for node in nodes]
+            value = self.join.join(value for value in values if value)
+        else:
+            node = item.select_one(self.css) if self.css else item
+            if node is None:
+                return None
+            value = self._read(node)
+        if value is None:
+            return None
+        if self.split is not None:
+            parts = [part.strip() for part in value.split(self.split)]
+            value = parts[self.index] if len(parts) > self.index else None
+            if value is None:
+                return None
+        for text in self.remove:
+            value = value.replace(text, "")
+        value = _clean(value)
+        if value and self.absolute:
+            value = urljoin(base_url, value)
+        return value or None
+
+
+class Field:
+    __slots__ = ("name", "extractors")
+
+    def __init__(self, name: str, spec, where: str, parser: Optional[str]):
+        self.name = name
+        alternatives = spec if isinstance(spec, list) else [spec]
+        self.extractors = tuple(
+            Extractor(alternative, f"{where}.{name}[{i}]", parser) for i, alternative in enumerate(alternatives)
+        )
+
+    def extract(self, item: Node, base_url: str) -> Optional[str]:
+        for extractor in self.extractors:
+            value = extractor.extract(item, base_url)
+            if value:
+                return value
+        return None
+
+
+class ItemGroup:
+    """Items matched by one selector, with their fields and date handling"""
+
+    __slots__ = ("selector", "fields", "date_field", "date_key", "date_formats")
+
+    def __init__(self, spec: Dict, where: str, parser: Optional[str]):
+        _check_keys(where, spec, _GROUP_KEYS)
+        if "selector" not in spec or "fields" not in spec:
+            raise SpecError(f"{where}: 'selector' and 'fields' are required")
+        self.selector: str = spec["selector"]
+        precompile(self.selector, parser)
+        self.fields = tuple(Field(name, field, where, parser) for name, field in spec["fields"].items())
+        self.date_field: str = spec.get("date_field", "date")
+        self.date_formats: Tuple[str, ...] = tuple(spec.get("date_formats", ("iso",)))
+        # Parsers live in app.dates, keyed per group, so the format order
+        # they learn is kept across pages instead of travelling with the spec
+        self.date_key = where
+        try:
+            DateParser(self.date_formats)
+        except ValueError as e:
+            raise SpecError(f"{where}: invalid date_formats: {e}") from e
+
+    def parse_date(self, text: str, reference: datetime) -> Optional[datetime]:
+        return parser_for(self.date_key, self.date_formats).parse(text, reference)
+
+
+class Template:
+    """A summary part: rendered only when every field it uses has a value"""
+
+    __slots__ = ("text", "requires")
+
+    def __init__(self, spec):
+        if isinstance(spec, dict):
+            self.text = spec["text"]
+            extra = spec.get("if", ())
+            extra = (extra,) if isinstance(extra, str) else tuple(extra)
+        else:
+            self.text, extra = spec, ()
+        names = tuple(name for _, name, _, _ in Formatter().parse(self.text) if name)
+        self.requires = names + extra
+
+    def render(self, values: Dict) -> Optional[str]:
+        if not all(values.get(name) for name in self.requires):
+            return None
+        return self.text.format_map(values)
+
+
+class SourceSpec:
+    """A validated, compiled source definition"""
+
+    def __init__(self, spec: Dict, parser: Optional[str] = None):
+        name = spec.get("name") or "<unnamed>"
+        where = f"source {name!r}"
+        _check_keys(where, spec, _SPEC_KEYS)
+        if not spec.get("name") or not spec.get("url") or not spec.get("items"):
+            raise SpecError(f"{where}: 'name', 'url' and 'items' are required")
+        self.name: str = spec["name"]
+        self.url: str = spec["url"]
+        self.next_page: Optional[str] = spec.get("next_page")
+        default_pages = settings.SCRAPER_MAX_PAGES if self.next_page else 1
+        self.max_pages: int = int(spec.get("max_pages", default_pages))
+        self.container: Optional[str] = spec.get("container")
+        if self.container:
+            precompile(self.container, parser)
+        self.page_fields = tuple(
+            Field(field_name, field, f"{where}.page_fields", parser)
+            for field_name, field in spec.get("page_fields", {}).items()
+        )
+        self.groups = tuple(ItemGroup(group, f"{where}.items[{i}]", parser) for i, group in enumerate(spec["items"]))
+        summary = spec.get("summary", {})
+        self.summary_parts = tuple(Template(part) for part in summary.get("parts", ()))
+        self.summary_prefix = Template(summary["prefix"]) if summary.get("prefix") else None
+        self.summary_separator: str = summary.get("separator", " | ")
+        self.summary_default: str = summary.get("default", "No details available")
+        self.recent_hours: Optional[float] = spec.get("recent_hours")
+        self.fallback_latest: Optional[int] = spec.get("fallback_latest")
+
+
+def load_specs(path: str, parser: Optional[str] = None) -> List[SourceSpec]:
+    """Read and compile the list of source specs stored in a JSON file"""
+    with open(path, encoding="utf-8") as fh:
+        raw = json.load(fh)
+    if not isinstance(raw, list):
+        raise SpecError(f"{path}: expected a list of source specs")
+    specs = [SourceSpec(spec, parser) for spec in raw]
+    names = [spec.name for spec in specs]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise SpecError(f"{path}: duplicate source names {', '.join(sorted(duplicates))}")
+    return specs
+
+
+class DeclarativeScraper(BaseScraper):
+    """Generic listing scraper driven by a SourceSpec"""
+
+    def __init__(self, spec: SourceSpec, parser: Optional[str] = None):
+        super().__init__(source_name=spec.name, parser=parser)
+        self.spec = spec
+        self.base_url = spec.url
+        self.max_pages = spec.max_pages
+
+    def page_url(self, page: int) -> Optional[str]:
+        if page == 1:
+            return self.base_url
+        if not self.spec.next_page:
+            return None
+        return self.spec.next_page.format(url=self.base_url, page=page)
+
+    def parse_page(self, html: str) -> List[Dict]:
+        spec = self.spec
+        doc = self.parse_document(html)
+        now = self.reference_time()
+        page_data = {field.name: field.extract(doc, self.base_url) for field in spec.page_fields}
+
+        root = doc
+        if spec.container:
+            root = doc.select_one(spec.container)
+            if root is None:
+                logger.warning(f"{self.source_name}: no {spec.container!r} on the page")
+                return []
+
+        articles = []
+        for group in spec.groups:
+            for item in root.select(group.selector):
+                try:
+                    article_data = dict(page_data)
+                    for field in group.fields:
+                        article_data[field.name] = field.extract(item, self.base_url)
+                    if not article_data.get("title"):
+                        continue
+                    date_text = article_data.get(group.date_field)
+                    if date_text:
+                        parsed = group.parse_date(date_text, now)
+                        if parsed is None:
+                            logger.debug(f"{self.source_name}: could not parse date {date_text!r}")
+                        article_data["date"] = parsed or now
+                    else:
+                        article_data.pop("date", None)
+                    articles.append(self.parse_article(article_data))
+                except Exception as e:
+                    logger.warning(f"Error parsing {self.source_name} item: {e}")
+
+        logger.debug(f"{self.source_name}: parsed {len(articles)} articles")
+        return self._select_recent(articles, now)
+
+    def _select_recent(self, articles: List[Dict], now: datetime) -> List[Dict]:
+        """
+        With recent_hours, keep only the articles of that window, or the
+        fallback_latest newest ones when the window is empty
+        """
+        hours = self.spec.recent_hours
+        if not hours:
+            return articles
+
+        horizon = now - timedelta(hours=hours)
+        recent = [article for article in articles if article["publication_date"] >= horizon]
+        if recent:
+            return recent
+        latest = sorted(articles, key=lambda article: article["publication_date"], reverse=True)
+        return latest[:self.spec.fallback_latest] if self.spec.fallback_latest else latest
+
+    def parse_article(self, article_data: Dict) -> Dict:
+        spec = self.spec
+        parts = [part for part in (template.render(article_data) for template in spec.summary_parts) if part]
+        summary = spec.summary_separator.join(parts) if parts else spec.summary_default
+        if spec.summary_prefix is not None:
+            prefix = spec.summary_prefix.render(article_data)
+            if prefix:
+                summary = prefix + summary
+
+        return {
+            "title": article_data.get("title", ""),
+            "summary": summary,
+            "link": article_data.get("link") or "",
+            "source": self.source_name,
+            "publication_date": article_data.get("date") or self.reference_time(),
+        }
+
+
+def load_scrapers(path: Optional[str] = None) -> List[DeclarativeScraper]:
+    """Scrapers for every spec in the file (settings.SCRAPER_SOURCES_PATH or the bundled sources.json)"""
+    path = path or settings.SCRAPER_SOURCES_PATH or DEFAULT_SOURCES_PATH
+    return [DeclarativeScraper(spec) for spec in load_specs(path)]
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+import httpx
+from .politeness import PolitenessScheduler
+from .validator_cache import ValidatorCache
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': settings.SCRAPER_USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class HttpClient:
+    """
+    App-lifetime HTTP client shared by every scraper.
+
+    Wraps a single pooled httpx.AsyncClient so connections (and their TLS
+    sessions) stay warm across refreshes, and caps the number of in-flight
+    requests per host on top of the global pool limits. Requests are paced,
+    retried and circuit-broken by the PolitenessScheduler.
+    """
+
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        per_host_limit: Optional[int] = None,
+        http2: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        validators: Optional[ValidatorCache] = None,
+        politeness: Optional[PolitenessScheduler] = None,
+    ):
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self.limits = httpx.Limits(
+            max_connections=max_connections or settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=max_keepalive_connections or settings.HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        )
+        self.per_host_limit = per_host_limit or settings.HTTP_PER_HOST_LIMIT
+        self.http2 = settings.HTTP2 if http2 is None else http2
+        self.timeout = timeout or settings.HTTP_TIMEOUT
+        self.transport = transport
+        if validators is None and settings.HTTP_CACHE_ENABLED:
+            validators = ValidatorCache()
+        self.validators = validators
+        self.politeness = politeness or PolitenessScheduler()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def is_open(self) -> bool:
+        return self._client is not None and not self._client.is_closed
+
+    async def start(self) -> None:
+        """Open the underlying connection pool"""
+        if self.is_open:
+            return
+        http2 = self.http2
+        if http2 and self.transport is None and not _http2_available():
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            limits=self.limits,
+            timeout=self.timeout,
+            http2=http2,
+            follow_redirects=True,
+            transport=self.transport,
+        )
+
+    async def close(self) -> None:
+        """Close all pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _slot(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.per_host_limit)
+        return slot
+
+    async def _fetch_robots(self, url: str) -> Optional[str]:
+        """robots.txt body for the politeness scheduler, None when missing or unreachable"""
+        try:
+            async with self._slot(url):
+                response = await self._client.get(url)
+        except httpx.HTTPError as e:
+            logger.debug(f"Could not fetch {url}: {e}")
+            return None
+        return response.text if response.is_success else None
+
+    async def _send(self, url: str, source: Optional[str], stream: bool, hold_slot: bool, **kwargs) -> httpx.Response:
+        """
+        GET with the politeness policy: wait for the host's token, retry
+        retryable statuses and transport errors after Retry-After or a
+        jittered backoff, and report the outcome to the source's breaker
+        """
+        if not self.is_open:
+            await self.start()
+        request = self._client.build_request("GET", url, **kwargs)
+        attempt = 0
+        while True:
+            await self.politeness.acquire(url, source, self._fetch_robots)
+            try:
+                if hold_slot:
+                    async with self._slot(url):
+                        response = await self._client.send(request, stream=stream)
+                else:
+                    response = await self._client.send(request, stream=stream)
+            except httpx.TransportError as e:
+                delay = self.politeness.failed(url, source, attempt, e)
+                if delay is None:
+                    raise
+                logger.debug(f"{type(e).__name__} on {url}, retrying in {delay:.1f}s")
+            else:
+                delay = self.politeness.completed(url, source, attempt, response)
+                if delay is None:
+                    return response
+                await response.aclose()
+                logger.debug(f"{response.status_code} on {url}, retrying in {delay:.1f}s")
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def get(self, url: str, source: Optional[str] = None, **kwargs) -> httpx.Response:
+        """
+        Issue a GET through the shared pool, respecting the per-host limit.
+        source names the circuit breaker; the host is used when omitted.
+        """
+        return await self._send(url, source, stream=False, hold_slot=True, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, url: str, source: Optional[str] = None, **kwargs) -> AsyncIterator[httpx.Response]:
+        """
+        Streaming GET: the body is read by the caller (aiter_bytes) while the
+        per-host slot is held, instead of being buffered in memory.
+        """
+        async with self._slot(url):
+            response = await self._send(url, source, stream=True, hold_slot=False, **kwargs)
+            try:
+                yield response
+            finally:
+                await response.aclose()
+
+    async def get_if_modified(self, url: str, source: Optional[str] = None, **kwargs) -> Optional[httpx.Response]:
+        """
+        Conditional GET using the stored ETag / Last-Modified validators.
+
+        Returns None when the server answers 304 Not Modified. The validators
+        of a new response are not saved here: the caller saves them with
+        remember_validators once the page's articles are stored, or a failed
+        store would turn the next fetch into a 304 and lose them.
+        """
+        if self.validators is None:
+            return await self.get(url, source, **kwargs)
+        headers = {**self.validators.request_headers(url), **kwargs.pop("headers", {})}
+        response = await self.get(url, source, headers=headers, **kwargs)
+        if response.status_code == 304:
+            return None
+        return response
+
+    def remember_validators(self, url: str, response: httpx.Response) -> None:
+        """Save the validators of a response to get_if_modified. Blocking."""
+        if self.validators is not None and response.is_success:
+            self.validators.update(url, response)
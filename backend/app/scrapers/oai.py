@@ -0,0 +1,91 @@
+"""
+Incremental parser for OAI-PMH ListRecords responses.
+
+Bytes are fed in chunks and each <record> is handed out as soon as its
+closing tag is seen, then cleared from the tree, so the parsed tree stays
+small however many records a response holds.
+"""
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List, Optional
+
+OAI_NS = "{http://www.openarchives.org/OAI/2.0/}"
+
+
+class OAIError(Exception):
+    def __init__(self, code: str, message: str):
+        super().__init__(f"{code}: {message}")
+        self.code = code
+        self.message = message
+
+    def __reduce__(self):
+        # Raised from parses run in the process pool
+        return OAIError, (self.code, self.message)
+
+
+class ListRecordsParser:
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        # Open elements, so a finished record can be detached from its parent
+        self._stack: List[ET.Element] = []
+        self.resumption_token: Optional[str] = None
+        self.complete_list_size: Optional[int] = None
+        self.error: Optional[OAIError] = None
+
+    def feed(self, chunk: bytes) -> Iterator[ET.Element]:
+        """Feed raw bytes; yield every <record> completed by this chunk"""
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> Iterator[ET.Element]:
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> Iterator[ET.Element]:
+        for event, element in self._parser.read_events():
+            if event == "start":
+                self._stack.append(element)
+                continue
+            self._stack.pop()
+            if element.tag == OAI_NS + "record":
+                yield element
+                # Drop the finished record so the tree never grows
+                if self._stack:
+                    self._stack[-1].remove(element)
+                element.clear()
+            elif element.tag == OAI_NS + "resumptionToken":
+                self.resumption_token = (element.text or "").strip() or None
+                size = element.get("completeListSize")
+                if size and size.isdigit():
+                    self.complete_list_size = int(size)
+            elif element.tag == OAI_NS + "error":
+                self.error = OAIError(element.get("code", "unknown"), (element.text or "").strip())
+
+
+def is_deleted(record: ET.Element) -> bool:
+    header = record.find(OAI_NS + "header")
+    return header is not None and header.get("status") == "deleted"
+
+
+def datestamp(record: ET.Element) -> Optional[str]:
+    return record.findtext(f"{OAI_NS}header/{OAI_NS}datestamp")
+
+
+def metadata(record: ET.Element, namespace: str) -> Dict[str, object]:
+    """
+    Flatten the metadata element of a record: simple child elements map to
+    their text, repeated or nested ones (authors) to a list of child dicts.
+    """
+    root = record.find(f"{OAI_NS}metadata/{namespace}arXiv")
+    data: Dict[str, object] = {}
+    if root is None:
+        return data
+    for child in root:
+        name = child.tag.replace(namespace, "")
+        if len(child):
+            items: List[Dict[str, str]] = []
+            for item in child:
+                items.append({part.tag.replace(namespace, ""): (part.text or "").strip() for part in item})
+            data[name] = items
+        else:
+            data[name] = (child.text or "").strip()
+    return data
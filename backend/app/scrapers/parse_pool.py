@@ -0,0 +1,70 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor: Optional[Executor] = None
+
+# Parse threads per web worker when "auto" runs several of them
+THREADS_PER_WEB_WORKER = 2
+
+
+def pool_kind() -> str:
+    """
+    PARSE_POOL, with "auto" resolved: a process pool in a single-worker
+    server, a small thread pool in each worker when WEB_CONCURRENCY runs
+    several (the web workers already spread the parsing over the cores, and
+    a process pool per worker would start workers x cores processes)
+    """
+    if settings.PARSE_POOL != "auto":
+        return settings.PARSE_POOL
+    return "thread" if settings.WEB_CONCURRENCY > 1 else "process"
+
+
+def pool_size() -> int:
+    if settings.PARSE_WORKERS:
+        return settings.PARSE_WORKERS
+    if settings.PARSE_POOL == "auto" and settings.WEB_CONCURRENCY > 1:
+        return THREADS_PER_WEB_WORKER
+    return min(4, os.cpu_count() or 1)
+
+
+def get_executor() -> Optional[Executor]:
+    """
+    The shared parse pool, created on first use.
+
+    PARSE_POOL selects "process" (parsing uses every core), "thread" (keeps
+    the event loop free; lxml releases the GIL while parsing), "inline"
+    (parse on the event loop) or "auto" (see pool_kind).
+    """
+    global _executor
+    kind = pool_kind()
+    if _executor is None and kind != "inline":
+        workers = pool_size()
+        if kind == "process":
+            _executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parse")
+        logger.info(f"Started {kind} parse pool with {workers} workers")
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+
+
+async def run_in_pool(func: Callable[..., T], *args) -> T:
+    """Run a CPU-bound, picklable callable in the parse pool"""
+    executor = get_executor()
+    if executor is None:
+        return func(*args)
+    return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
@@ -0,0 +1,177 @@
+"""
+Pluggable HTML parser backends for the scrapers.
+
+Scrapers describe what to extract with CSS selectors and talk to a small
+node interface (select / select_one / text / strings / attr), so the same
+extraction rules run on any backend:
+
+- "html.parser": BeautifulSoup with the pure-Python parser (the original
+  behaviour, slowest)
+- "lxml": lxml.html with selectors compiled once to XPath (cssselect)
+- "selectolax": the lexbor CSS engine, when the optional package is installed
+"""
+from typing import Dict, Iterator, List, Optional
+from ..config import settings
+
+# Joins text nodes in Node.strings(); never occurs in real page text
+_STRING_SEPARATOR = "\x1f"
+
+
+class Node:
+    """Backend independent view of an element"""
+
+    __slots__ = ("_el",)
+
+    def __init__(self, el):
+        self._el = el
+
+    def select(self, css: str) -> List["Node"]:
+        raise NotImplementedError
+
+    def select_one(self, css: str) -> Optional["Node"]:
+        found = self.select(css)
+        return found[0] if found else None
+
+    def text(self) -> str:
+        """All descendant text, concatenated"""
+        raise NotImplementedError
+
+    def strings(self) -> Iterator[str]:
+        """Non-empty descendant text nodes, stripped (like bs4 stripped_strings)"""
+        raise NotImplementedError
+
+    def attr(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        raise NotImplementedError
+
+
+class SoupNode(Node):
+    __slots__ = ()
+
+    def select(self, css: str) -> List[Node]:
+        return [SoupNode(el) for el in self._el.select(css)]
+
+    def select_one(self, css: str) -> Optional[Node]:
+        el = self._el.select_one(css)
+        return SoupNode(el) if el is not None else None
+
+    def text(self) -> str:
+        return self._el.get_text()
+
+    def strings(self) -> Iterator[str]:
+        return iter(self._el.stripped_strings)
+
+    def attr(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        value = self._el.get(name, default)
+        # bs4 splits multi-valued attributes such as class into lists
+        return " ".join(value) if isinstance(value, list) else value
+
+
+class LxmlNode(Node):
+    __slots__ = ()
+
+    def select(self, css: str) -> List[Node]:
+        return [LxmlNode(el) for el in _compiled_xpath(css)(self._el)]
+
+    def text(self) -> str:
+        return self._el.text_content()
+
+    def strings(self) -> Iterator[str]:
+        for text in self._el.itertext():
+            text = text.strip()
+            if text:
+                yield text
+
+    def attr(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self._el.get(name, default)
+
+
+class SelectolaxNode(Node):
+    __slots__ = ()
+
+    def select(self, css: str) -> List[Node]:
+        return [SelectolaxNode(el) for el in self._el.css(css)]
+
+    def select_one(self, css: str) -> Optional[Node]:
+        el = self._el.css_first(css)
+        return SelectolaxNode(el) if el is not None else None
+
+    def text(self) -> str:
+        return self._el.text(deep=True)
+
+    def strings(self) -> Iterator[str]:
+        text = self._el.text(deep=True, separator=_STRING_SEPARATOR, strip=True)
+        return (part for part in text.split(_STRING_SEPARATOR) if part)
+
+    def attr(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        value = self._el.attributes.get(name, default)
+        return default if value is None else value
+
+
+_xpath_cache: Dict[str, object] = {}
+
+
+def _compiled_xpath(css: str):
+    """Translate a CSS selector to a compiled XPath once per process"""
+    compiled = _xpath_cache.get(css)
+    if compiled is None:
+        from cssselect import HTMLTranslator
+        from lxml import etree
+
+        compiled = etree.XPath(HTMLTranslator().css_to_xpath(css, prefix="descendant::"))
+        _xpath_cache[css] = compiled
+    return compiled
+
+
+def precompile(css: str, backend: Optional[str] = None) -> None:
+    """
+    Compile a selector ahead of use where the backend supports it (lxml),
+    which also rejects invalid selectors at load time
+    """
+    if (backend or settings.HTML_PARSER) == "lxml":
+        _compiled_xpath(css)
+
+
+def _parse_soup(html: str) -> Node:
+    from bs4 import BeautifulSoup
+
+    return SoupNode(BeautifulSoup(html, "html.parser"))
+
+
+def _parse_lxml(html: str) -> Node:
+    import lxml.html
+    from lxml.etree import ParserError
+
+    try:
+        return LxmlNode(lxml.html.document_fromstring(html))
+    except ValueError:
+        # Pages starting with an XML encoding declaration must be given as bytes
+        return LxmlNode(lxml.html.document_fromstring(html.encode("utf-8")))
+    except ParserError:
+        # Empty document
+        return LxmlNode(lxml.html.document_fromstring("<html></html>"))
+
+
+def _parse_selectolax(html: str) -> Node:
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+    except ImportError as e:
+        raise ImportError("HTML_PARSER=selectolax requires the optional 'selectolax' package") from e
+
+    return SelectolaxNode(LexborHTMLParser(html).root)
+
+
+BACKENDS = {
+    "html.parser": _parse_soup,
+    "lxml": _parse_lxml,
+    "selectolax": _parse_selectolax,
+}
+
+
+def parse_html(html: str, backend: Optional[str] = None) -> Node:
+    """Parse a document with the configured (or given) backend"""
+    name = backend or settings.HTML_PARSER
+    try:
+        parse = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown HTML parser backend: {name}") from None
+    return parse(html)
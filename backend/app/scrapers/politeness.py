@@ -0,0 +1,289 @@
+"""
+Per-host request scheduling for the scrapers.
+
+Every request first takes a token from its host's bucket. The bucket rate
+is the configured rate, lowered to the robots.txt Crawl-delay / Request-rate
+of the host, and halved on each 429 / 503 before creeping back up on
+successes (AIMD). Retryable failures are retried with exponential backoff
+and full jitter, or after the server's Retry-After, which also pauses every
+other request to that host. A circuit breaker per source stops hammering a
+source that keeps failing until a cooldown has passed.
+"""
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+import httpx
+from ..config import settings
+from ..metrics import (
+    CIRCUIT_REJECTIONS,
+    CIRCUIT_STATE,
+    HOST_RATE,
+    HOST_THROTTLE_SECONDS,
+    HTTP_RETRIES,
+)
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 502, 503, 504}
+# Statuses telling the client to slow down, as opposed to a flaky upstream
+THROTTLE_STATUSES = {429, 503}
+MIN_RATE = 0.05
+RECOVERY_STEP = 0.05
+
+RobotsFetcher = Callable[[str], Awaitable[Optional[str]]]
+
+
+class CircuitOpen(httpx.HTTPError):
+    """Raised instead of sending a request while a source's breaker is open"""
+
+
+class TokenBucket:
+    """
+    Reservation-style token bucket: a caller takes its token immediately
+    (the balance may go negative) and sleeps for the returned delay, so
+    concurrent callers are spaced out in arrival order without a lock
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def reserve(self) -> float:
+        """Take a token; returns the seconds to wait before using it"""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= 1
+        deficit = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(0.0, self.updated - now) + deficit
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no token for the next seconds (Retry-After)"""
+        until = time.monotonic() + seconds
+        if until > self.updated:
+            self._refill(time.monotonic())
+            self.updated = until
+            self.tokens = min(self.tokens, 1.0)
+
+    def set_rate(self, rate: float) -> None:
+        self._refill(time.monotonic())
+        self.rate = rate
+
+
+class CircuitBreaker:
+    """
+    Closed until `threshold` consecutive failures, then open (requests are
+    rejected) for `cooldown` seconds, then half-open: one trial request
+    closes it again on success or re-opens it on failure
+    """
+
+    CLOSED, HALF_OPEN, OPEN = 0, 1, 2
+
+    def __init__(self, name: str, threshold: int, cooldown: float):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        # Start of the half-open trial request; a trial that never reported
+        # back (cancelled by a timeout) is replaced after another cooldown
+        self._trial_at: Optional[float] = None
+
+    def _set_state(self, state: int) -> None:
+        if state != self.state:
+            logger.info(f"Circuit for {self.name} is now {('closed', 'half-open', 'open')[state]}")
+        self.state = state
+        CIRCUIT_STATE.labels(source=self.name).set(state)
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self._set_state(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN:
+            now = time.monotonic()
+            if self._trial_at is not None and now - self._trial_at < self.cooldown:
+                return False
+            self._trial_at = now
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._trial_at = None
+        self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_at = None
+        if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+            self._set_state(self.OPEN)
+
+
+class HostState:
+    def __init__(self, host: str, rate: float, burst: float):
+        self.host = host
+        # Ceiling of the adaptive rate: the configured rate or robots.txt's
+        self.max_rate = rate
+        self.bucket = TokenBucket(rate, burst)
+        self.robots_checked_at: Optional[float] = None
+        self.robots_lock = asyncio.Lock()
+
+    def set_rate(self, rate: float) -> None:
+        self.bucket.set_rate(rate)
+        HOST_RATE.labels(host=self.host).set(rate)
+
+
+def retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds asked for by a Retry-After header (delta or HTTP date)"""
+    value = response.headers.get("Retry-After", "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class PolitenessScheduler:
+    """Per-host rate limits, retry policy and per-source circuit breakers for HttpClient"""
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+        backoff_max: Optional[float] = None,
+        max_retry_after: Optional[float] = None,
+        respect_robots: Optional[bool] = None,
+        breaker_threshold: Optional[int] = None,
+        breaker_cooldown: Optional[float] = None,
+    ):
+        self.rate = settings.HTTP_HOST_RATE if rate is None else rate
+        self.burst = burst or settings.HTTP_HOST_BURST
+        self.max_retries = settings.HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = backoff_base or settings.HTTP_BACKOFF_BASE
+        self.backoff_max = backoff_max or settings.HTTP_BACKOFF_MAX
+        self.max_retry_after = max_retry_after or settings.HTTP_MAX_RETRY_AFTER
+        self.respect_robots = settings.HTTP_RESPECT_ROBOTS if respect_robots is None else respect_robots
+        self.breaker_threshold = breaker_threshold or settings.CIRCUIT_FAILURE_THRESHOLD
+        self.breaker_cooldown = breaker_cooldown or settings.CIRCUIT_COOLDOWN
+        self._hosts: Dict[str, HostState] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def host(self, url: str) -> HostState:
+        host = urlsplit(url).netloc
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = HostState(host, self.rate, self.burst)
+            HOST_RATE.labels(host=host).set(self.rate)
+        return state
+
+    def breaker(self, key: str) -> CircuitBreaker:
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker(key, self.breaker_threshold, self.breaker_cooldown)
+        return breaker
+
+    async def _apply_robots(self, state: HostState, url: str, fetch_robots: RobotsFetcher) -> None:
+        """Lower the host rate to its robots.txt Crawl-delay / Request-rate, refreshed every HTTP_ROBOTS_TTL"""
+        async with state.robots_lock:
+            now = time.monotonic()
+            if state.robots_checked_at is not None and now - state.robots_checked_at < settings.HTTP_ROBOTS_TTL:
+                return
+            state.robots_checked_at = now
+            parts = urlsplit(url)
+            text = await fetch_robots(f"{parts.scheme}://{parts.netloc}/robots.txt")
+            rate = self.rate
+            if text:
+                robots = RobotFileParser()
+                robots.parse(text.splitlines())
+                # crawl_delay() answers None until the rules are marked as fetched
+                robots.modified()
+                agent = settings.SCRAPER_USER_AGENT
+                delay = robots.crawl_delay(agent)
+                request_rate = robots.request_rate(agent)
+                if delay:
+                    rate = min(rate, 1 / float(delay)) if rate > 0 else 1 / float(delay)
+                if request_rate and request_rate.requests and request_rate.seconds:
+                    allowed = request_rate.requests / request_rate.seconds
+                    rate = min(rate, allowed) if rate > 0 else allowed
+            if rate != state.max_rate:
+                logger.info(f"robots.txt of {state.host} limits it to {rate:.3f} requests/s")
+            state.max_rate = rate
+            state.set_rate(rate)
+
+    async def acquire(self, url: str, source: Optional[str], fetch_robots: RobotsFetcher) -> None:
+        """Wait for the breaker and the host's next token before a request"""
+        key = source or urlsplit(url).netloc
+        if not self.breaker(key).allow():
+            CIRCUIT_REJECTIONS.labels(source=key).inc()
+            raise CircuitOpen(f"Circuit open for {key}, not requesting {url}")
+        state = self.host(url)
+        if self.respect_robots:
+            await self._apply_robots(state, url, fetch_robots)
+        delay = state.bucket.reserve()
+        HOST_THROTTLE_SECONDS.labels(host=state.host).observe(delay)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter: uniform in [0, min(max, base * 2^attempt)]"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def completed(self, url: str, source: Optional[str], attempt: int, response: httpx.Response) -> Optional[float]:
+        """
+        Account for a response; returns the delay before retrying it, or
+        None when the response is final
+        """
+        state = self.host(url)
+        breaker = self.breaker(source or state.host)
+        status = response.status_code
+        if status not in RETRY_STATUSES:
+            breaker.record_success()
+            if state.bucket.rate < state.max_rate:
+                state.set_rate(min(state.max_rate, state.bucket.rate + RECOVERY_STEP))
+            return None
+
+        asked = retry_after(response)
+        if status in THROTTLE_STATUSES:
+            # Multiplicative decrease, and everyone waits out Retry-After
+            if state.bucket.rate > 0:
+                state.set_rate(max(MIN_RATE, state.bucket.rate / 2))
+            if asked:
+                state.bucket.pause(min(asked, self.max_retry_after))
+        if attempt >= self.max_retries or (asked is not None and asked > self.max_retry_after):
+            breaker.record_failure()
+            return None
+        HTTP_RETRIES.labels(host=state.host, reason=str(status)).inc()
+        return asked if asked is not None else self.backoff(attempt)
+
+    def failed(self, url: str, source: Optional[str], attempt: int, error: Exception) -> Optional[float]:
+        """Account for a transport error; returns the retry delay or None to give up"""
+        state = self.host(url)
+        if attempt >= self.max_retries:
+            self.breaker(source or state.host).record_failure()
+            return None
+        HTTP_RETRIES.labels(host=state.host, reason=type(error).__name__).inc()
+        return self.backoff(attempt)
@@ -1,46 +1,161 @@
-from typing import List, Dict
+import asyncio
+import time
+from typing import List, Dict, Optional, Tuple
+from .archive import SnapshotArchive, default_archive
 from .arxiv_scraper import ArxivScraper
-from .papers_with_code_scraper import PapersWithCodeScraper
-from .jair_scraper import JAIRScraper
-from .techcrunch_scraper import TechCrunchScraper
-from .nature_scraper import NatureAIScraper
-from .huggingface_scraper import HuggingFaceScraper
+from .base_scraper import BaseScraper
+from .declarative import load_scrapers
+from .http_client import HttpClient
+from .parse_pool import shutdown_executor
+from ..config import settings
+from ..dedup import SeenIndex, seen_index as default_seen_index
+from ..metrics import SCRAPER_RUN_SECONDS, record_error, timed
 import logging
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 class ScraperManager:
-    def __init__(self):
-        self.scrapers = [
-            ArxivScraper(),
-            PapersWithCodeScraper(),
-            JAIRScraper(),
-            TechCrunchScraper(),
-            NatureAIScraper(),
-            HuggingFaceScraper(),
-        ]
-
-    async def fetch_all_articles(self) -> List[Dict]:
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        source_timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+        http: Optional[HttpClient] = None,
+        seen_index: Optional[SeenIndex] = None,
+        sources_path: Optional[str] = None,
+        archive: Optional[SnapshotArchive] = None,
+    ):
+        self.http = http or HttpClient()
+        self.seen_index = seen_index or default_seen_index
+        self.archive = archive or default_archive()
+        # arXiv keeps its own scraper (OAI-PMH harvesting); every listing
+        # site is a declarative spec (settings.SCRAPER_SOURCES_PATH)
+        self.scrapers: List[BaseScraper] = [ArxivScraper()]
+        self.scrapers.extend(load_scrapers(sources_path))
+        self.concurrency = concurrency or settings.SCRAPER_CONCURRENCY
+        self.source_timeout = source_timeout or settings.SCRAPER_SOURCE_TIMEOUT
+        self.deadline = deadline or settings.SCRAPER_DEADLINE
+        for scraper in self.scrapers:
+            scraper.bind_http(self.http)
+            scraper.bind_seen_index(self.seen_index)
+            scraper.bind_archive(self.archive)
+
+    async def startup(self) -> None:
+        """
+        Open the shared HTTP connection pool used by every scraper
+        """
+        await self.http.start()
+
+    async def shutdown(self) -> None:
+        """
+        Close the shared HTTP connection pool and the parse pool
+        """
+        await self.http.close()
+        shutdown_executor()
+
+    @property
+    def source_names(self) -> List[str]:
+        return [scraper.source_name for scraper in self.scrapers]
+
+    def get_scraper(self, source_name: str) -> Optional[BaseScraper]:
+        for scraper in self.scrapers:
+            if scraper.source_name == source_name:
+                return scraper
+        return None
+
+    def timeout_for(self, scraper: BaseScraper) -> float:
+        """The crawl budget of a source: its scraper's own, else source_timeout"""
+        return scraper.timeout or self.source_timeout
+
+    async def fetch_source(self, scraper: BaseScraper) -> List[Dict]:
+        """
+        Fetch a single source, bounded by the per-source timeout (or the
+        scraper's own budget). Errors propagate, so the report names the
+        sources that failed.
+        """
+        logger.debug(f"Starting to fetch articles from {scraper.source_name}")
+        timeout = self.timeout_for(scraper)
+        try:
+            with timed(SCRAPER_RUN_SECONDS.labels(source=scraper.source_name)):
+                articles = await asyncio.wait_for(scraper.crawl(), timeout=timeout)
+        except Exception as e:
+            record_error(scraper.source_name, e)
+            raise
+        logger.info(f"Fetched {len(articles)} articles from {scraper.source_name}")
+        return articles
+
+    async def fetch_all_articles(self, concurrent: bool = True) -> List[Dict]:
         """
         Fetch articles from all configured scrapers
         """
+        if not concurrent:
+            return await self._fetch_sequential()
+        articles, _ = await self.fetch_with_report()
+        return articles
+
+    async def fetch_with_report(self) -> Tuple[List[Dict], Dict]:
+        """
+        Run every scraper concurrently, bounded by the concurrency cap, a
+        per-source timeout and an overall deadline.
+
+        Returns the articles gathered before the deadline together with a
+        report naming the sources that succeeded, failed or timed out.
+        """
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+
+        async def run(scraper: BaseScraper) -> List[Dict]:
+            async with semaphore:
+                return await self.fetch_source(scraper)
+
+        tasks = {asyncio.ensure_future(run(scraper)): scraper for scraper in self.scrapers}
+        done, pending = await asyncio.wait(tasks.keys(), timeout=self.deadline)
+
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        all_articles = []
+        report = {"succeeded": {}, "failed": {}, "timed_out": []}
+        for task, scraper in tasks.items():
+            name = scraper.source_name
+            if task in pending:
+                logger.warning(f"Deadline reached before {name} finished")
+                report["timed_out"].append(name)
+                continue
+            error = task.exception()
+            if isinstance(error, asyncio.TimeoutError):
+                logger.warning(f"Timed out fetching articles from {name} after {self.timeout_for(scraper)}s")
+                report["timed_out"].append(name)
+            elif error is not None:
+                logger.error(f"Error fetching articles from {name}: {error}")
+                report["failed"][name] = str(error)
+            else:
+                articles = task.result()
+                report["succeeded"][name] = len(articles)
+                all_articles.extend(articles)
+
+        report["duration"] = round(time.monotonic() - started, 3)
+        logger.info(f"Total articles fetched from all sources: {len(all_articles)} in {report['duration']}s")
+        return all_articles, report
+
+    async def _fetch_sequential(self) -> List[Dict]:
         all_articles = []
         for scraper in self.scrapers:
             try:
-                logger.info(f"Starting to fetch articles from {scraper.source_name}")
-                articles = await scraper.fetch_articles()
-                logger.info(f"Successfully fetched {len(articles)} articles from {scraper.source_name}")
-                
-                # Log the first article from each source for debugging
+                logger.debug(f"Starting to fetch articles from {scraper.source_name}")
+                with timed(SCRAPER_RUN_SECONDS.labels(source=scraper.source_name)):
+                    articles = await scraper.crawl()
+                logger.info(f"Fetched {len(articles)} articles from {scraper.source_name}")
                 if articles:
-                    logger.info(f"Sample article from {scraper.source_name}:")
-                    logger.info(f"Title: {articles[0].get('title')}")
-                    logger.info(f"Link: {articles[0].get('link')}")
-                
+                    logger.debug(f"Sample article from {scraper.source_name}: {articles[0].get('title')} <{articles[0].get('link')}>")
+
                 all_articles.extend(articles)
             except Exception as e:
+                record_error(scraper.source_name, e)
                 logger.error(f"Error fetching articles from {scraper.source_name}: {e}")
-        
+
         logger.info(f"Total articles fetched from all sources: {len(all_articles)}")
-        return all_articles
\ No newline at end of file
+        return all_articles
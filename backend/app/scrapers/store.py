@@ -0,0 +1,98 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Tuple
+from ..locks import FileLock
+
+logger = logging.getLogger(__name__)
+
+
+class JsonFileStore:
+    """
+    Small key/value store persisted as a JSON document on local disk.
+
+    The web workers share the file: a write re-reads the document under an
+    exclusive file lock and changes only its own key, and reads pick up the
+    other workers' writes once the file has changed. Writes go to a
+    temporary file that is atomically renamed over the original, so a crash
+    mid-write never leaves a truncated store behind. set and delete block on
+    disk I/O: call them off the event loop.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # Next to the store, so every process sharing the file shares the lock
+        self._file_lock = FileLock(os.path.basename(path), os.path.dirname(os.path.abspath(path)))
+        self._stamp: Optional[Tuple[int, int, int]] = None
+        self._data: Dict[str, Any] = {}
+        self._refresh()
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _refresh(self) -> None:
+        """Reload the document when another process replaced it"""
+        stamp = self._stat()
+        if stamp != self._stamp:
+            self._data = self._load()
+            self._stamp = stamp
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable store {self.path}: {e}")
+            return {}
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        self._refresh()
+        return self._data.get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        self._update(key, value)
+
+    def delete(self, key: str) -> None:
+        self._update(key, None, remove=True)
+
+    def _update(self, key: str, value: Any, remove: bool = False) -> None:
+        with self._lock:
+            self._file_lock.acquire(blocking=True)
+            try:
+                # Merge into the latest document, not this process's copy
+                data = self._load()
+                if remove:
+                    if data.pop(key, None) is None:
+                        self._data, self._stamp = data, self._stat()
+                        return
+                else:
+                    data[key] = value
+                self._save(data)
+                self._data, self._stamp = data, self._stat()
+            finally:
+                self._file_lock.release()
+
+    def _save(self, data: Dict[str, Any]) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".store-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(data, fh)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist store {self.path}: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
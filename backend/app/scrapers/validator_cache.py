@@ -0,0 +1,40 @@
+from typing import Dict, Optional
+import httpx
+from .store import JsonFileStore
+from ..config import settings
+
+
+class ValidatorCache:
+    """
+    Per-URL ETag / Last-Modified validators, persisted across restarts.
+
+    Used by BaseScraper.fetch_page to turn unchanged listing pages into a
+    304 Not Modified instead of a full download and re-parse.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.store = JsonFileStore(path or settings.HTTP_CACHE_PATH)
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for a previously seen URL"""
+        validators = self.store.get(url) or {}
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    def update(self, url: str, response: httpx.Response) -> None:
+        """Remember the validators sent with a 200 response"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            validators = {"etag": etag, "last_modified": last_modified}
+            if self.store.get(url) != validators:
+                self.store.set(url, validators)
+        else:
+            self.store.delete(url)
+
+    def forget(self, url: str) -> None:
+        self.store.delete(url)
@@ -0,0 +1,265 @@
+"""
+Full-text search over article titles and summaries.
+
+PostgreSQL: a stored generated tsvector column (title weighted above the
+summary) with a GIN index, queried with websearch_to_tsquery and ranked with
+ts_rank_cd. SQLite (local development): an external-content FTS5 table kept
+in sync by triggers, ranked with bm25. In both cases the source and
+timeframe filters run in the same indexed query, and highlights are only
+computed for the rows of the requested page.
+"""
+import html
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import BigInteger, DateTime, bindparam, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+# The database wraps matches in these private-use characters; the scraped
+# text around them is HTML-escaped before they become the tags above
+MATCH_START = "\ue000"
+MATCH_STOP = "\ue001"
+
+RESULT_FIELDS = ("article_id", "title", "summary", "link", "source", "publication_date", "cluster_id")
+
+# Applied to databases built by create_all(); migration 0007 has its own copy
+POSTGRES_DDL = (
+    """
+    ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(summary, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_articles_search_vector ON articles USING GIN (search_vector)",
+)
+
+SQLITE_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        title, summary, content='articles', content_rowid='article_id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts(rowid, title, summary) VALUES (new.article_id, new.title, new.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, summary)
+        VALUES ('delete', old.article_id, old.title, old.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, summary ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, summary)
+        VALUES ('delete', old.article_id, old.title, old.summary);
+        INSERT INTO articles_fts(rowid, title, summary) VALUES (new.article_id, new.title, new.summary);
+    END
+    """,
+)
+
+SQLITE_DROP = (
+    "DROP TRIGGER IF EXISTS articles_fts_update",
+    "DROP TRIGGER IF EXISTS articles_fts_delete",
+    "DROP TRIGGER IF EXISTS articles_fts_insert",
+    "DROP TABLE IF EXISTS articles_fts",
+)
+
+POSTGRES_DROP = (
+    "DROP INDEX IF EXISTS ix_articles_search_vector",
+    "ALTER TABLE articles DROP COLUMN IF EXISTS search_vector",
+)
+
+
+class SearchUnavailable(Exception):
+    pass
+
+
+def is_search_object(name: Optional[str]) -> bool:
+    """
+    Whether a schema object is one of the search objects above, which the
+    models do not declare (Alembic autogenerate must leave them alone)
+    """
+    if not name:
+        return False
+    return name.startswith("articles_fts") or name in ("search_vector", "ix_articles_search_vector")
+
+
+def create_search_index(conn: Connection) -> None:
+    """Idempotently create the search column/index (PostgreSQL) or FTS table (SQLite)"""
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        # ALTER TABLE takes an exclusive lock even when the column exists
+        exists = conn.execute(text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_name = 'articles' AND column_name = 'search_vector'"
+        )).first()
+        for statement in POSTGRES_DDL[1:] if exists else POSTGRES_DDL:
+            conn.execute(text(statement))
+    elif dialect == "sqlite":
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'")
+        ).first()
+        for statement in SQLITE_DDL:
+            conn.execute(text(statement))
+        if not exists:
+            # Index the rows stored before the table existed
+            conn.execute(text("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')"))
+
+
+def drop_search_index(conn: Connection) -> None:
+    dialect = conn.dialect.name
+    statements = POSTGRES_DROP if dialect == "postgresql" else SQLITE_DROP if dialect == "sqlite" else ()
+    for statement in statements:
+        conn.execute(text(statement))
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """For databases created by create_all(), which knows nothing of the search objects"""
+    try:
+        with engine.begin() as conn:
+            create_search_index(conn)
+    except Exception as e:
+        logger.warning(f"Full-text search index unavailable: {e}")
+
+
+_TERM = re.compile(r'"[^"]*"|\S+')
+
+
+def fts5_query(query: str) -> str:
+    """
+    Translate a web-style query ("exact phrase", -excluded, or) into FTS5
+    syntax, quoting every term so user input can never be a syntax error
+    """
+    include, exclude = [], []
+    pending_or = False
+    for token in _TERM.findall(query):
+        negate = token.startswith("-") and len(token) > 1
+        word = token[1:] if negate else token
+        if word.lower() == "or" and not negate:
+            pending_or = bool(include)
+            continue
+        word = word.strip('"')
+        if not word:
+            continue
+        term = '"' + word.replace('"', '""') + '"'
+        if negate:
+            exclude.append(term)
+        elif pending_or:
+            include[-1] = f"({include[-1]} OR {term})"
+            pending_or = False
+        else:
+            include.append(term)
+    if not include:
+        return ""
+    expression = " AND ".join(include)
+    for term in exclude:
+        expression = f"{expression} NOT {term}"
+    return expression
+
+
+def _typed(statement, params: Dict):
+    """Bind and read dates through SQLAlchemy's DateTime so SQLite text round-trips"""
+    if "since" in params:
+        statement = statement.bindparams(bindparam("since", type_=DateTime))
+    return statement.columns(publication_date=DateTime, cluster_id=BigInteger)
+
+
+def _postgres_search(db: Session, query: str, filters: str, params: Dict) -> List:
+    # The page is ranked on the index first, ts_headline only runs on its rows
+    statement = text(f"""
+        SELECT page.*,
+               ts_headline('english', page.title, page.q, :title_options) AS title_highlight,
+               ts_headline('english', coalesce(page.summary, ''), page.q, :summary_options) AS summary_highlight
+        FROM (
+            SELECT {", ".join("a." + name for name in RESULT_FIELDS)}, ts_rank_cd(a.search_vector, q) AS rank, q
+            FROM articles a, websearch_to_tsquery('english', :query) q
+            WHERE a.search_vector @@ q {filters}
+            ORDER BY rank DESC, a.publication_date DESC, a.article_id DESC
+            LIMIT :limit OFFSET :offset
+        ) page
+        ORDER BY page.rank DESC, page.publication_date DESC, page.article_id DESC
+    """)
+    options = f"StartSel={MATCH_START}, StopSel={MATCH_STOP}"
+    params.update(
+        query=query,
+        title_options=f"{options}, HighlightAll=true",
+        summary_options=f"{options}, MaxWords=35, MinWords=15, MaxFragments=2",
+    )
+    return db.execute(_typed(statement, params), params).fetchall()
+
+
+def _sqlite_search(db: Session, query: str, filters: str, params: Dict) -> List:
+    match = fts5_query(query)
+    if not match:
+        return []
+    # bm25() is lower for better matches; the title column weighs 10x the summary
+    statement = text(f"""
+        SELECT {", ".join("a." + name for name in RESULT_FIELDS)},
+               -bm25(articles_fts, 10.0, 1.0) AS rank,
+               highlight(articles_fts, 0, :start, :stop) AS title_highlight,
+               snippet(articles_fts, 1, :start, :stop, '…', 32) AS summary_highlight
+        FROM articles_fts JOIN articles a ON a.article_id = articles_fts.rowid
+        WHERE articles_fts MATCH :match {filters}
+        ORDER BY bm25(articles_fts, 10.0, 1.0), a.publication_date DESC, a.article_id DESC
+        LIMIT :limit OFFSET :offset
+    """)
+    params.update(match=match, start=MATCH_START, stop=MATCH_STOP)
+    return db.execute(_typed(statement, params), params).fetchall()
+
+
+def highlight_html(fragment: Optional[str]) -> str:
+    """Escape a highlighted fragment of scraped text, then mark its matches"""
+    escaped = html.escape(fragment or "")
+    return escaped.replace(MATCH_START, HIGHLIGHT_START).replace(MATCH_STOP, HIGHLIGHT_STOP)
+
+
+def search_articles(
+    db: Session,
+    query: str,
+    timeframe: Optional[int] = None,
+    source: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> List[Dict]:
+    """
+    Ranked matches for a web-style query, best first, each with the article
+    fields, its rank and highlighted title / summary fragments (HTML-escaped
+    text with the matches wrapped in <mark>)
+    """
+    filters = ""
+    params: Dict = {"limit": limit, "offset": offset}
+    if source:
+        filters += " AND a.source = :source"
+        params["source"] = source
+    if timeframe:
+        filters += " AND a.publication_date >= :since"
+        params["since"] = datetime.utcnow() - timedelta(hours=timeframe)
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        rows = _postgres_search(db, query, filters, params)
+    elif dialect == "sqlite":
+        rows = _sqlite_search(db, query, filters, params)
+    else:
+        raise SearchUnavailable(f"Full-text search is not supported on {dialect}")
+
+    results = []
+    for row in rows:
+        mapping = row._mapping
+        result = {name: mapping[name] for name in RESULT_FIELDS}
+        result["rank"] = round(float(mapping["rank"]), 6)
+        result["highlights"] = {
+            "title": highlight_html(mapping["title_highlight"]),
+            "summary": highlight_html(mapping["summary_highlight"]),
+        }
+        results.append(result)
+    return results
@@ -0,0 +1,154 @@
+"""
+Recorded-style HTML fixtures for the scraper benchmarks.
+
+Each builder renders a deterministic listing page in the markup the
+matching scraper expects, sized by the number of items, so benchmarks run
+offline and produce identical pages on every machine. Real pages saved
+under a snapshot directory can be used instead (see load_pages).
+"""
+import os
+from typing import Callable, Dict, Optional
+
+LOREM = (
+    "We study large language models for multi-agent planning and propose a "
+    "benchmark covering reasoning, tool use &amp; retrieval under distribution shift."
+)
+
+
+def arxiv(items: int) -> str:
+    rows = []
+    for i in range(items):
+        arxiv_id = f"2401.{i:05d}"
+        rows.append(
+            f"""<dt><a name="item{i}">[{i}]</a> <a href="/abs/{arxiv_id}" title="Abstract" id="{arxiv_id}">arXiv:{arxiv_id}</a></dt>
+<dd><div class="meta">
+  <div class="list-title mathjax"><span class="descriptor">Title:</span> Paper {i}: Scaling
+    agents with <em>sparse</em> experts</div>
+  <div class="list-authors"><span class="descriptor">Authors:</span>
+    <a href="/a/doe_j_1">Jane Doe</a>, <a href="/a/roe_r_1">Richard Roe</a></div>
+  <div class="list-subjects"><span class="descriptor">Subjects:</span> Artificial Intelligence (cs.AI)</div>
+  <p class="mathjax">{LOREM} Item {i}.</p>
+</div></dd>"""
+        )
+    return (
+        "<html><head><title>Artificial Intelligence new submissions</title></head><body>"
+        f"<h3>New submissions (showing {items} of {items} entries)</h3>"
+        f"<dl id='articles'>{''.join(rows)}</dl>"
+        "<h3>Cross-lists</h3><dl></dl></body></html>"
+    )
+
+
+def papers_with_code(items: int) -> str:
+    rows = []
+    for i in range(items):
+        date = "3 days ago" if i % 3 == 0 else ("12 Jan 2024" if i % 3 == 1 else "2024-01-12")
+        rows.append(
+            f"""<div class="row infinite-item item paper-card">
+  <div class="col-lg-9 item-content">
+    <h1><a href="/paper/paper-{i}">Paper {i}: Efficient Retrieval Augmented Agents</a></h1>
+    <p class="author-section"><span class="author-span">Jane Doe</span></p>
+    <span class="item-date date">{date}</span>
+    <p class="item-strip-abstract">{LOREM} Item {i}.</p>
+    <span class="badge github-stars">{i * 7} stars</span>
+  </div>
+</div>"""
+        )
+    return f"<html><body><div class='infinite-container'>{''.join(rows)}</div></body></html>"
+
+
+def jair(items: int) -> str:
+    rows = []
+    for i in range(items):
+        rows.append(
+            f"""<div class="obj_article_summary">
+  <div class="title"><a href="/index.php/jair/article/view/{1000 + i}">Article {i}: Provable Planning Guarantees</a></div>
+  <div class="meta"><div class="authors"><a>Jane Doe</a>, <a>Richard Roe</a></div>
+  <div class="pages">Pages: {i * 20 + 1}-{i * 20 + 19}</div></div>
+  <ul class="galleys_links"><li><a class="obj_galley_link pdf" href="/index.php/jair/article/view/{1000 + i}/pdf">PDF</a></li></ul>
+</div>"""
+        )
+    return (
+        "<html><body><div class='obj_issue_toc'>"
+        "<div class='published'><span class='label'>Published:</span> <span class='value'>2024-01-05</span></div>"
+        f"<section class='articles'>{''.join(rows)}</section></div></body></html>"
+    )
+
+
+def techcrunch(items: int) -> str:
+    rows = []
+    for i in range(items):
+        rows.append(
+            f"""<div class="post-block post-block--image post-block--unread">
+  <header class="post-block__header">
+    <h2 class="post-block__title"><a class="post-block__title__link" href="https://techcrunch.com/2024/01/12/story-{i}/">Startup {i} raises a round for AI copilots</a></h2>
+    <div class="river-byline">
+      <span class="river-byline__authors"><a href="/author/jane-doe/">Jane Doe</a></span>
+      <time class="river-byline__time" datetime="2024-01-12T{i % 24:02d}:15:00">January 12, 2024</time>
+      <span class="river-byline__categories"><a>AI</a> <a>Startups</a></span>
+    </div>
+  </header>
+  <div class="post-block__content">{LOREM} Item {i}.</div>
+</div>"""
+        )
+    return f"<html><body><div class='river'>{''.join(rows)}</div></body></html>"
+
+
+def nature(items: int) -> str:
+    rows = []
+    for i in range(items):
+        rows.append(
+            f"""<li class="app-article-list-row__item app-article-list-row">
+  <div class="c-card"><h3 class="c-card__title"><a class="c-card__link u-link-inherit" href="/articles/s41586-024-{i:05d}-x">Neural model {i} predicts protein dynamics</a></h3>
+  <div class="c-card__summary u-mb-16"><p>{LOREM} Item {i}.</p></div>
+  <div class="c-card__footer"><time class="c-meta__item" datetime="2024-01-{i % 28 + 1:02d}">{i % 28 + 1} Jan 2024</time></div></div>
+</li>"""
+        )
+    return f"<html><body><ul class='app-article-list-row'>{''.join(rows)}</ul></body></html>"
+
+
+def huggingface(items: int) -> str:
+    rows = []
+    for i in range(items):
+        when = f"{i % 5 + 1} days ago" if i % 2 else f"{i % 20 + 1} hours ago"
+        rows.append(
+            f"""<div class="flex flex-col" role="article">
+  <a class="text-lg font-semibold" href="/blog/community/post-{i}">Fine-tuning recipe {i} for small models</a>
+  <div class="flex items-center text-sm"><a class="hover:underline text-gray-700" href="/user{i}">user{i}</a>
+  <span>•</span><span>{when}</span><span class="ml-1">{i * 3}</span></div>
+</div>"""
+        )
+    featured = (
+        "<article class='flex flex-col'><a class='text-2xl' href='/blog/featured-post'>Featured: Open models</a>"
+        "<div class='text-sm'>By hf • January 10, 2024</div></article>"
+    )
+    return f"<html><body>{featured}{''.join(rows)}</body></html>"
+
+
+BUILDERS: Dict[str, Callable[[int], str]] = {
+    "arXiv CS.AI": arxiv,
+    "Papers with Code": papers_with_code,
+    "Journal of AI Research": jair,
+    "TechCrunch AI": techcrunch,
+    "Nature AI Special": nature,
+    "Hugging Face Blog": huggingface,
+}
+
+
+def slug(source_name: str) -> str:
+    return "".join(ch if ch.isalnum() else "_" for ch in source_name.lower()).strip("_")
+
+
+def load_pages(items: int, snapshot_dir: Optional[str] = None) -> Dict[str, str]:
+    """
+    One listing page per source: a saved snapshot (<snapshot_dir>/<slug>.html)
+    when present, otherwise the synthetic fixture with `items` entries.
+    """
+    pages = {}
+    for source_name, build in BUILDERS.items():
+        path = os.path.join(snapshot_dir, f"{slug(source_name)}.html") if snapshot_dir else None
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as fh:
+                pages[source_name] = fh.read()
+        else:
+            pages[source_name] = build(items)
+    return pages
@@ -0,0 +1,85 @@
+"""
+Compare HTML parser backends on the recorded listing pages.
+
+Runs every scraper's parse_page() with each available backend, checks the
+extracted articles are identical across backends and reports the parse
+time per page. Every run parses against one pinned fetch time, so relative
+dates ("3 hours ago") and undated items resolve the same for each backend.
+
+    cd backend && python -m benchmarks.parser_backends --items 300 --repeat 5
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Dict, List
+
+from app.scrapers.parsers import BACKENDS
+from app.scrapers.scraper_manager import ScraperManager
+from benchmarks.fixtures import load_pages
+
+def available_backends() -> List[str]:
+    names = []
+    for name, parse in BACKENDS.items():
+        try:
+            parse("<html></html>")
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def same_articles(a: List[Dict], b: List[Dict]) -> bool:
+    # Exact: dates (and the summaries embedding them) derive from the pinned fetch time
+    return a == b
+
+
+def run(items: int, repeat: int, snapshot_dir: str = None) -> Dict:
+    pages = load_pages(items, snapshot_dir)
+    backends = available_backends()
+    fetched_at = datetime.utcnow().replace(microsecond=0)
+    results = {}
+    for scraper in ScraperManager().scrapers:
+        html = pages[scraper.source_name]
+        timings, outputs = {}, {}
+        for backend in backends:
+            scraper.parser = backend
+            scraper.fetched_at = fetched_at
+            best = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                articles = scraper.parse_page(html)
+                best = min(best, time.perf_counter() - started)
+            timings[backend] = round(best * 1000, 3)
+            outputs[backend] = articles
+
+        reference = outputs[backends[0]]
+        results[scraper.source_name] = {
+            "bytes": len(html.encode("utf-8")),
+            "articles": len(reference),
+            "parse_ms": timings,
+            "identical": all(same_articles(reference, outputs[b]) for b in backends[1:]),
+        }
+    return {"items": items, "repeat": repeat, "backends": backends, "sources": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=300, help="entries per synthetic listing page")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per backend; the best is reported")
+    parser.add_argument("--snapshots", help="directory of saved <source>.html pages to use instead")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = run(args.items, args.repeat, args.snapshots)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text)
+    print(text)
+    if not all(source["identical"] for source in report["sources"].values()):
+        raise SystemExit("Backends disagree on extracted articles")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+"""
+Offline benchmark suite for the scrapers and the API.
+
+Scrapers fetch recorded listing pages through a local mock transport (no
+network), the API is exercised in-process against a seeded SQLite (or the
+database in --database-url) and all numbers are written as JSON so runs can
+be diffed for regressions.
+
+    cd backend && python -m benchmarks.run --rows 20000 --output bench.json
+
+Sections:
+    scrapers  fetch_articles() end to end and parse_page() alone, per source
+    manager   ScraperManager.fetch_all_articles(), concurrent and sequential
+    api       latency percentiles for /articles/, /sources/, /refresh-articles/
+    dates     date strings parsed per second: strptime cascade vs app.dates
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+SECTIONS = ("scrapers", "manager", "api", "dates")
+
+
+def configure_environment(args) -> None:
+    """Must run before any app module is imported: settings are read at import"""
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        path = os.path.join(tempfile.mkdtemp(prefix="bench-"), "bench.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ["HTTP_CACHE_ENABLED"] = "false"
+    os.environ["SCHEDULER_ENABLED"] = "false"
+    # The fixtures are listing pages; the OAI harvester is not benchmarked
+    os.environ["ARXIV_MODE"] = "html"
+    # Measure the scrapers, not the per-host pacing meant for real sites
+    os.environ["HTTP_HOST_RATE"] = "0"
+    os.environ["HTTP_RESPECT_ROBOTS"] = "false"
+    os.environ["SNAPSHOT_ARCHIVE_ENABLED"] = "false"
+    if args.no_response_cache:
+        os.environ["RESPONSE_CACHE_TTL"] = "0"
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 3),
+        "p50_ms": round(pick(0.50) * 1000, 3),
+        "p95_ms": round(pick(0.95) * 1000, 3),
+        "p99_ms": round(pick(0.99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def mock_transport(pages: Dict[str, str], latency: float):
+    """Serve each scraper's listing page from memory after a fixed latency"""
+    import httpx
+    from benchmarks.fixtures import BUILDERS
+    from app.scrapers.scraper_manager import ScraperManager
+
+    by_host = {}
+    for scraper in ScraperManager().scrapers:
+        by_host[httpx.URL(scraper.base_url).host] = pages[scraper.source_name]
+    empty = next(iter(BUILDERS.values()))(0)
+
+    async def handler(request):
+        if latency:
+            await asyncio.sleep(latency)
+        return httpx.Response(200, text=by_host.get(request.url.host, empty))
+
+    return httpx.MockTransport(handler)
+
+
+def make_manager(transport):
+    from app.scrapers.http_client import HttpClient
+    from app.scrapers.scraper_manager import ScraperManager
+
+    return ScraperManager(http=HttpClient(transport=transport, validators=None))
+
+
+async def bench_scrapers(pages: Dict[str, str], transport, repeat: int) -> Dict:
+    manager = make_manager(transport)
+    await manager.startup()
+    results = {}
+    try:
+        for scraper in manager.scrapers:
+            html = pages[scraper.source_name]
+            fetch, parse = [], []
+            articles = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                articles = await scraper.fetch_articles()
+                fetch.append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                scraper.parse_page(html)
+                parse.append(time.perf_counter() - started)
+            results[scraper.source_name] = {
+                "bytes": len(html.encode("utf-8")),
+                "articles": len(articles),
+                "fetch_articles": percentiles(fetch),
+                "parse_page": percentiles(parse),
+            }
+    finally:
+        await manager.shutdown()
+    return results
+
+
+async def bench_manager(transport, repeat: int) -> Dict:
+    manager = make_manager(transport)
+    await manager.startup()
+    results = {}
+    try:
+        for mode, concurrent in (("concurrent", True), ("sequential", False)):
+            samples, count = [], 0
+            for _ in range(repeat):
+                started = time.perf_counter()
+                count = len(await manager.fetch_all_articles(concurrent=concurrent))
+                samples.append(time.perf_counter() - started)
+            results[mode] = {"articles": count, **percentiles(samples)}
+    finally:
+        await manager.shutdown()
+    return results
+
+
+def date_corpus(size: int) -> List[str]:
+    """Listing-style dates: mostly one format per page, with repeats, as scraped"""
+    rng = random.Random(42)
+    base = datetime(2024, 1, 1)
+    makers = (
+        lambda day: f"{rng.randint(1, 23)} hours ago",
+        lambda day: f"about {rng.randint(1, 12)} hours ago",
+        lambda day: f"{rng.randint(1, 30)} days ago",
+        lambda day: day.strftime("%d %b %Y"),
+        lambda day: day.strftime("%Y-%m-%d"),
+        lambda day: day.strftime("%B %d, %Y"),
+        lambda day: (day + timedelta(minutes=rng.randint(0, 1440))).strftime("%Y-%m-%dT%H:%M:%S-04:00"),
+    )
+    corpus = []
+    while len(corpus) < size:
+        make = rng.choice(makers)
+        for _ in range(rng.randint(10, 40)):
+            corpus.append(make(base + timedelta(days=rng.randint(0, 365))))
+    return corpus[:size]
+
+
+def bench_dates(items: int, repeat: int) -> Dict:
+    import re
+    from app.dates import DateParser
+
+    formats = ["%B %d, %Y", "%Y-%m-%d", "%d %b %Y", "iso", "relative"]
+    corpus = date_corpus(max(1000, items * 50))
+    relative = re.compile(r"(\d+)\s+(hour|day)s?\s+ago")
+
+    def cascade(text: str):
+        # What the hand-written scrapers did: try every pattern, catch the miss
+        match = relative.search(text)
+        if match:
+            unit = "hours" if match.group(2) == "hour" else "days"
+            return datetime.utcnow() - timedelta(**{unit: int(match.group(1))})
+        for fmt in formats:
+            if fmt in ("iso", "relative"):
+                try:
+                    return datetime.fromisoformat(text)
+                except ValueError:
+                    continue
+            try:
+                return datetime.strptime(text, fmt)
+            except ValueError:
+                continue
+        return None
+
+    def measure(make_parse) -> Dict:
+        samples = []
+        parsed = 0
+        for _ in range(repeat):
+            parse = make_parse()
+            reference = datetime.utcnow()
+            started = time.perf_counter()
+            parsed = sum(1 for text in corpus if parse(text, reference) is not None)
+            samples.append(time.perf_counter() - started)
+        best = min(samples)
+        return {"strings": len(corpus), "parsed": parsed, "per_second": round(len(corpus) / best), **percentiles(samples)}
+
+    return {
+        "strptime_cascade": measure(lambda: lambda text, reference: cascade(text)),
+        "date_parser": measure(lambda: DateParser(formats, cache_size=0).parse),
+        "date_parser_memoized": measure(lambda: DateParser(formats).parse),
+    }
+
+
+def seed_database(rows: int, sources: List[str]) -> float:
+    """Insert `rows` synthetic articles spread over the last 30 days"""
+    from app import crud, models
+    from app.database import SessionLocal, engine
+
+    models.Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        batch = []
+        for i in range(rows):
+            batch.append({
+                "title": f"Seeded article {i}",
+                "summary": f"Summary of seeded article {i}. " * 8,
+                "link": f"https://example.com/articles/{i}",
+                "source": sources[i % len(sources)],
+                "publication_date": now - timedelta(minutes=rng.randint(0, 30 * 24 * 60)),
+            })
+            if len(batch) == 5000:
+                crud.bulk_insert_articles(db, batch)
+                batch = []
+        crud.bulk_insert_articles(db, batch)
+        db.commit()
+    finally:
+        db.close()
+    return time.perf_counter() - started
+
+
+async def load(client, method: str, make_url: Callable[[int], str], requests: int, concurrency: int) -> Dict:
+    samples, statuses = [], {}
+    counter = iter(range(requests))
+    started = time.perf_counter()
+
+    async def worker():
+        for i in counter:
+            begin = time.perf_counter()
+            response = await client.request(method, make_url(i))
+            samples.append(time.perf_counter() - begin)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {"rps": round(requests / elapsed, 1), "statuses": statuses, **percentiles(samples)}
+
+
+async def bench_api(transport, rows: int, requests: int, concurrency: int) -> Dict:
+    import httpx
+    from app import main
+
+    sources = main.scraper_manager.source_names
+    seed_seconds = seed_database(rows, sources)
+
+    # Route the app's scrapers through the mock transport as well
+    mocked = make_manager(transport)
+    main.scraper_manager.http = mocked.http
+    for scraper in main.scraper_manager.scrapers:
+        scraper.bind_http(mocked.http)
+    await main.scraper_manager.startup()
+
+    timeframes = (24, 72, 168, 720)
+    results = {"rows": rows, "seed_seconds": round(seed_seconds, 3)}
+    try:
+        async with httpx.AsyncClient(app=main.app, base_url="http://bench") as client:
+            results["articles"] = await load(
+                client, "GET",
+                lambda i: f"/articles/?timeframe={timeframes[i % len(timeframes)]}",
+                requests, concurrency,
+            )
+            results["articles_by_source"] = await load(
+                client, "GET",
+                lambda i: f"/articles/?timeframe=720&source={sources[i % len(sources)]}",
+                requests, concurrency,
+            )
+            results["sources"] = await load(client, "GET", lambda i: "/sources/", requests, concurrency)
+            results["refresh_articles"] = await load(
+                client, "POST", lambda i: "/refresh-articles/", max(1, requests // 50), 1
+            )
+            await asyncio.gather(*main.scheduler._job_tasks)
+    finally:
+        await main.scraper_manager.shutdown()
+    return results
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(args) -> Dict:
+    from benchmarks.fixtures import load_pages
+
+    pages = load_pages(args.items, args.snapshots)
+    transport = mock_transport(pages, args.latency / 1000)
+    report = {
+        "revision": git_revision(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "parameters": {
+            "items": args.items,
+            "repeat": args.repeat,
+            "latency_ms": args.latency,
+            "rows": args.rows,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "response_cache": not args.no_response_cache,
+        },
+    }
+    if "scrapers" in args.sections:
+        report["scrapers"] = await bench_scrapers(pages, transport, args.repeat)
+    if "manager" in args.sections:
+        report["manager"] = await bench_manager(transport, args.repeat)
+    if "api" in args.sections:
+        report["api"] = await bench_api(transport, args.rows, args.requests, args.concurrency)
+    if "dates" in args.sections:
+        report["dates"] = bench_dates(args.items, args.repeat)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=200, help="entries per synthetic listing page")
+    parser.add_argument("--snapshots", help="directory of saved <source>.html pages to replay instead")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per scraper / manager measurement")
+    parser.add_argument("--latency", type=float, default=50, help="simulated network latency per request (ms)")
+    parser.add_argument("--rows", type=int, default=10000, help="articles seeded into the database")
+    parser.add_argument("--requests", type=int, default=300, help="requests per API endpoint")
+    parser.add_argument("--concurrency", type=int, default=10, help="concurrent API clients")
+    parser.add_argument("--database-url", help="benchmark against this database instead of a temporary SQLite file")
+    parser.add_argument("--no-response-cache", action="store_true", help="disable the in-process response cache")
+    parser.add_argument("--sections", default=",".join(SECTIONS), help="comma separated subset of: " + ", ".join(SECTIONS))
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+    args.sections = {name.strip() for name in args.sections.split(",") if name.strip()}
+    unknown = args.sections - set(SECTIONS)
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(sorted(unknown))}")
+
+    configure_environment(args)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
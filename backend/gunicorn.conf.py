@@ -0,0 +1,42 @@
+"""
+Production server: gunicorn supervising uvicorn workers.
+
+    cd backend && gunicorn app.main:app -c gunicorn.conf.py
+
+WEB_CONCURRENCY sets the number of worker processes (default: one per core).
+Each worker runs its own event loop, scrapers and caches; refreshes are
+single-flight across them (see app.scheduler), so more workers add API
+throughput without multiplying the requests sent to the scraped sites.
+"""
+import glob
+import multiprocessing
+import os
+from app.config import settings
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = settings.WEB_CONCURRENCY or multiprocessing.cpu_count()
+# Forked workers inherit it: PARSE_POOL=auto then parses in a few threads per worker
+settings.WEB_CONCURRENCY = workers
+worker_class = "uvicorn.workers.UvicornWorker"
+# Refreshes run in the background, requests themselves stay short
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+# Not preloaded: every worker opens its own database pools and HTTP client
+preload_app = False
+
+
+def on_starting(server):
+    # Samples left by a previous run would be aggregated with the new ones
+    directory = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        for path in glob.glob(os.path.join(directory, "*.db")):
+            os.remove(path)
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
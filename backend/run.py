@@ -1,4 +1,14 @@
+import os
 import uvicorn
+from app.config import settings
 
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    port = int(os.getenv("PORT", "8000"))
+    if os.getenv("ENVIRONMENT") == "production":
+        # Several workers, no auto-reload; gunicorn.conf.py is the usual entry point
+        workers = settings.WEB_CONCURRENCY or os.cpu_count() or 1
+        # Read by the spawned workers' settings (PARSE_POOL=auto)
+        os.environ["WEB_CONCURRENCY"] = str(workers)
+        uvicorn.run("app.main:app", host="0.0.0.0", port=port, workers=workers)
+    else:
+        uvicorn.run("app.main:app", host="0.0.0.0", port=port, reload=True)
@@ -0,0 +1,47 @@
+"""
+Settings are read when app.config is imported, so the test environment is
+set up here, before any test module imports the app: a throwaway SQLite
+database, no background scheduler, no on-disk caches and inline parsing.
+"""
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="tests-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{os.path.join(_tmp, 'test.db')}",
+    SCHEDULER_ENABLED="false",
+    HTTP_CACHE_ENABLED="false",
+    HTTP_CACHE_PATH=os.path.join(_tmp, "http_validators.json"),
+    ARXIV_STATE_PATH=os.path.join(_tmp, "arxiv_state.json"),
+    SNAPSHOT_ARCHIVE_ENABLED="false",
+    SNAPSHOT_DIR=os.path.join(_tmp, "snapshots"),
+    LOCK_DIR=os.path.join(_tmp, "locks"),
+    PARSE_POOL="inline",
+    HTTP_HOST_RATE="0",
+    HTTP_RESPECT_ROBOTS="false",
+    REFRESH_LOCK_POLL_SECONDS="0.05",
+)
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    from app.database import engine
+    from app.schema import ensure_schema
+
+    ensure_schema(engine)
+    yield
+    engine.dispose()
+
+
+@pytest.fixture
+def db():
+    from app.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
@@ -0,0 +1,70 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional
+import httpx
+from app.scrapers.base_scraper import BaseScraper
+
+
+def article(source: str, n: int, **extra) -> Dict:
+    data = {
+        "title": f"{source} article {n}",
+        "summary": "",
+        "link": f"https://example.com/{source.replace(' ', '-').lower()}/{n}",
+        "source": source,
+        "publication_date": datetime(2024, 1, 1, 12),
+    }
+    data.update(extra)
+    return data
+
+
+def api_get(path: str, headers: Optional[Dict] = None, **params) -> httpx.Response:
+    """GET an endpoint of the app in process (startup events do not run)"""
+    from app import database
+    from app.main import app
+
+    async def call():
+        try:
+            async with httpx.AsyncClient(app=app, base_url="http://testserver") as client:
+                return await client.get(path, params=params, headers=headers)
+        finally:
+            # The async engine's connections belong to this event loop
+            await database.dispose_async_engine()
+
+    return asyncio.run(call())
+
+
+class FakeScraper(BaseScraper):
+    """Yields canned batches; optionally sleeps first or raises"""
+
+    def __init__(self, name: str, batches: Optional[List[List[Dict]]] = None, delay: float = 0, error: Exception = None):
+        super().__init__(source_name=name)
+        self.batches = batches if batches is not None else [[article(name, 1)]]
+        self.delay = delay
+        self.error = error
+        self.runs = 0
+
+    async def iter_pages(self):
+        self.runs += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        for batch in self.batches:
+            yield batch
+
+    def parse_page(self, html: str) -> List[Dict]:
+        return []
+
+    def parse_article(self, article_data) -> Dict:
+        return article_data
+
+
+class FakeManager:
+    def __init__(self, scrapers: List[BaseScraper], deadline: float = 5, source_timeout: float = 5):
+        self.scrapers = scrapers
+        self.concurrency = 4
+        self.source_timeout = source_timeout
+        self.deadline = deadline
+
+    def get_scraper(self, name: str) -> Optional[BaseScraper]:
+        return next((scraper for scraper in self.scrapers if scraper.source_name == name), None)
@@ -0,0 +1,130 @@
+import asyncio
+import pickle
+from typing import Dict, List
+import httpx
+from app.config import settings
+from app.pipeline import IngestPipeline
+from app.reparse import reparse
+from app.scrapers.archive import SnapshotArchive
+from app.scrapers.arxiv_scraper import ArxivScraper
+from app.scrapers.http_client import HttpClient
+
+
+def record(n: int, day: str) -> str:
+    return (
+        f"<record><header><identifier>oai:arXiv.org:2401.{n:05d}</identifier><datestamp>{day}</datestamp></header>"
+        f'<metadata><arXiv xmlns="http://arxiv.org/OAI/arXiv/"><id>2401.{n:05d}</id><created>{day}</created>'
+        f"<title>Paper {n}</title><categories>cs.AI</categories><abstract>Abstract {n}</abstract></arXiv></metadata>"
+        "</record>"
+    )
+
+
+def response(records: List[str], token: str = "") -> httpx.Response:
+    resumption = f"<resumptionToken>{token}</resumptionToken>" if token else ""
+    body = (
+        '<?xml version="1.0"?><OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">'
+        f"<ListRecords>{''.join(records)}{resumption}</ListRecords></OAI-PMH>"
+    )
+    return httpx.Response(200, content=body.encode())
+
+
+class Endpoint:
+    """Two-response list; the second one hangs until slow is cleared"""
+
+    def __init__(self):
+        self.slow = True
+        self.requests: List[Dict[str, str]] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        self.requests.append(params)
+        if params.get("resumptionToken") == "tok1":
+            if self.slow:
+                await asyncio.sleep(5)
+            return response([record(2, "2024-01-06")])
+        return response([record(1, "2024-01-05")], token="tok1")
+
+
+def harvest(scraper: ArxivScraper, endpoint: Endpoint, stored: List[Dict]) -> Dict:
+    scraper.bind_http(HttpClient(transport=httpx.MockTransport(endpoint), validators=None))
+
+    def store(articles):
+        stored.extend(articles)
+        return {scraper.source_name: len(articles)}
+
+    async def scenario():
+        try:
+            return await IngestPipeline(store=store).run([scraper])
+        finally:
+            await scraper.http.close()
+
+    return asyncio.run(scenario())[scraper.source_name]
+
+
+def test_interrupted_harvest_resumes_from_the_stored_token(tmp_path):
+    endpoint, stored = Endpoint(), []
+    scraper = ArxivScraper(mode="oai", state_path=str(tmp_path / "state.json"))
+    scraper.timeout = 0.5
+
+    assert harvest(scraper, endpoint, stored)["status"] == "timed_out"
+    assert [article["link"] for article in stored] == ["https://arxiv.org/abs/2401.00001"]
+    assert scraper.state.get("resumption_token") == "tok1"
+
+    endpoint.slow = False
+    assert harvest(scraper, endpoint, stored)["status"] == "succeeded"
+    # The second run asked for the rest of the list only
+    assert endpoint.requests[-1] == {"verb": "ListRecords", "resumptionToken": "tok1"}
+    assert stored[-1]["link"] == "https://arxiv.org/abs/2401.00002"
+    assert scraper.state.get("resumption_token") is None
+    assert scraper.state.get("last_datestamp") == "2024-01-06"
+
+
+def test_harvest_has_its_own_budget():
+    assert ArxivScraper(mode="oai").timeout == settings.ARXIV_HARVEST_TIMEOUT
+    assert ArxivScraper(mode="html").timeout is None
+
+
+def test_mark_stays_put_when_the_harvest_is_not_stored(tmp_path):
+    endpoint = Endpoint()
+    endpoint.slow = False
+    scraper = ArxivScraper(mode="oai", state_path=str(tmp_path / "state.json"))
+    scraper.bind_http(HttpClient(transport=httpx.MockTransport(endpoint), validators=None))
+
+    def broken(articles):
+        raise RuntimeError("database is locked")
+
+    async def scenario():
+        try:
+            return await IngestPipeline(store=broken).run([scraper])
+        finally:
+            await scraper.http.close()
+
+    assert asyncio.run(scenario())[scraper.source_name]["status"] == "failed"
+    assert scraper.state.get("last_datestamp") is None
+    assert scraper.state.get("resumption_token") is None
+
+
+def test_harvest_responses_are_archived_and_reparsed(tmp_path):
+    endpoint, stored = Endpoint(), []
+    endpoint.slow = False
+    scraper = ArxivScraper(mode="oai", state_path=str(tmp_path / "state.json"))
+    archive = SnapshotArchive(str(tmp_path / "snapshots"), retention_days=0)
+    scraper.bind_archive(archive)
+    assert harvest(scraper, endpoint, stored)["status"] == "succeeded"
+
+    snapshots = list(archive.snapshots())
+    assert len(snapshots) == 2
+    assert all(snapshot.url.startswith(settings.ARXIV_OAI_URL) for snapshot in snapshots)
+    # Parsed in a worker process, like the listing pages
+    report = reparse(archive, sources=[scraper.source_name], workers=1, dry_run=True)
+    assert report[scraper.source_name]["articles"] == len(stored) == 2
+
+
+def test_parsed_responses_cross_process_boundaries():
+    page = ArxivScraper(mode="oai").parse_records(
+        b'<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/"><error code="badResumptionToken">expired</error></OAI-PMH>'
+    )
+    copy = pickle.loads(pickle.dumps(page))
+    assert copy.articles == [] and copy.resumption_token is None
+    assert copy.error.code == "badResumptionToken"
+    assert str(copy.error) == "badResumptionToken: expired"
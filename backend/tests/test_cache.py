@@ -0,0 +1,99 @@
+import types
+import uuid
+from datetime import datetime
+import pytest
+from starlette.requests import Request
+from app import cache, crud
+from app.cache import ResponseCache, response_cache
+from app.ingestion import ingest_articles
+from helpers import api_get, article
+
+
+def request(path: str = "/articles/", query: str = "", etag: str = "") -> Request:
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": query.encode(), "headers": headers})
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_key_ignores_param_order_and_empty_values():
+    assert ResponseCache.key(request(query="source=A&limit=5&cursor=")) == ResponseCache.key(request(query="limit=5&source=A"))
+
+
+def test_entries_expire_after_the_ttl(clock):
+    responses = ResponseCache(max_entries=4, ttl=60)
+    responses.set("k", b"[]")
+    clock[0] += 59
+    assert responses.get("k").body == b"[]"
+    clock[0] += 1
+    assert responses.get("k") is None
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    responses = ResponseCache(max_entries=2, ttl=60)
+    responses.set("a", b"1")
+    responses.set("b", b"2")
+    responses.get("a")
+    responses.set("c", b"3")
+    assert [key for key in "abc" if responses.get(key)] == ["a", "c"]
+
+
+def test_matching_etag_answers_304():
+    entry = ResponseCache(ttl=60).set("k", b'[{"title":"x"}]', headers={"X-Next-Cursor": "abc"})
+    full = ResponseCache.respond(entry, request())
+    assert full.status_code == 200 and full.body == entry.body
+    assert full.headers["etag"] == entry.etag and full.headers["x-next-cursor"] == "abc"
+    for etag in (entry.etag, f'W/{entry.etag}', f'"other", {entry.etag}', "*"):
+        assert ResponseCache.respond(entry, request(etag=etag)).status_code == 304
+    assert ResponseCache.respond(entry, request(etag='"other"')).status_code == 200
+
+
+def test_sources_invalidate_their_entries_and_the_unfiltered_ones():
+    responses = ResponseCache(ttl=60)
+    responses.set("a", b"", source="A")
+    responses.set("b", b"", source="B")
+    responses.set("all", b"")
+    assert responses.invalidate_sources(["A"]) == 2
+    assert [key for key in ("a", "b", "all") if responses.get(key)] == ["b"]
+    assert responses.invalidate_sources([]) == 0
+
+
+def test_versions_from_other_workers_evict_what_changed():
+    responses = ResponseCache(ttl=60)
+    # The first sync only records the versions
+    assert responses.sync_versions({"A": 1, "B": 1}) == 0
+    responses.set("a", b"", source="A")
+    responses.set("b", b"", source="B")
+    assert responses.sync_versions({"A": 1, "B": 1}) == 0
+    assert responses.sync_versions({"A": 2, "B": 1}) == 1
+    assert responses.get("a") is None and responses.get("b") is not None
+
+
+def test_stored_articles_invalidate_cached_responses(db):
+    source = f"Cached {uuid.uuid4().hex[:8]}"
+    now = datetime.utcnow()
+    ingest_articles([article(source, 1, title="Cached agents one", publication_date=now)])
+
+    def fetch():
+        return api_get("/articles/", source=source), api_get("/search", q="agents", source=source)
+
+    listing, found = fetch()
+    assert len(listing.json()) == len(found.json()) == 1
+    assert api_get("/articles/", {"If-None-Match": listing.headers["etag"]}, source=source).status_code == 304
+
+    # Another worker's insert: seen here once the source versions are synced
+    response_cache.sync_versions(crud.source_versions(db))
+    crud.bulk_insert_articles(db, [article(source, 2, title="Cached agents two", publication_date=now)])
+    db.commit()
+    assert [len(response.json()) for response in fetch()] == [1, 1]
+    assert response_cache.sync_versions(crud.source_versions(db)) >= 2
+    assert [len(response.json()) for response in fetch()] == [2, 2]
+
+    # This worker's own insert evicts them right away
+    ingest_articles([article(source, 3, title="Cached agents three", publication_date=now)])
+    assert [len(response.json()) for response in fetch()] == [3, 3]
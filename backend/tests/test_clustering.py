@@ -0,0 +1,51 @@
+from datetime import datetime
+import pytest
+from app import crud, ingestion
+from app.clustering import ClusterIndex, cluster_index, shingles, similarity
+from helpers import article
+
+STORY = "OpenAI releases a new reasoning model for scientific research"
+
+
+def story(source: str, n: int, title: str = STORY) -> dict:
+    return article(source, n, title=title, summary="", publication_date=datetime.utcnow())
+
+
+def test_near_duplicates_of_a_batch_share_a_cluster():
+    index = ClusterIndex(threshold=0.5)
+    first, copy = story("A", 1), story("B", 1, title=STORY + " today")
+    other = story("C", 1, title="Robotics startup raises funding for warehouse automation arms")
+    index.assign([first, copy, other])
+    assert copy["cluster_id"] == first["cluster_id"]
+    assert other["cluster_id"] != first["cluster_id"]
+
+
+def test_assign_leaves_the_index_alone_until_add():
+    index = ClusterIndex(threshold=0.5)
+    first = story("A", 1)
+    pending = index.assign([first])
+    assert len(index) == 0
+
+    later = story("B", 2)
+    index.assign([later])
+    assert later["cluster_id"] != first["cluster_id"]
+
+    index.add(pending)
+    index.assign([later])
+    assert later["cluster_id"] == first["cluster_id"]
+
+
+def test_similarity_of_identical_shingles_is_one():
+    signature = ClusterIndex().hasher.signature(shingles(STORY, "summary"))
+    assert similarity(signature, signature) == 1.0
+
+
+def test_failed_insert_adds_nothing_to_the_cluster_index(monkeypatch):
+    def broken(db, articles):
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(crud, "bulk_insert_articles_by_source", broken)
+    before = len(cluster_index)
+    with pytest.raises(RuntimeError):
+        ingestion.store_articles([story("Rolled back", 1, title="A story whose insert is rolled back for good")])
+    assert len(cluster_index) == before
@@ -0,0 +1,49 @@
+import uuid
+from datetime import datetime
+import pytest
+from app import crud
+from helpers import article
+
+
+def test_cursor_round_trip():
+    cursor = crud.encode_cursor(datetime(2024, 1, 1, 12, 30, 5, 123), 42)
+    assert "=" not in cursor
+    assert crud.decode_cursor(cursor) == (datetime(2024, 1, 1, 12, 30, 5, 123), 42)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor",
+    "e30",                                   # {}
+    crud.encode_cursor(datetime(2024, 1, 1), 1)[:-3],
+    "WyJ5ZXN0ZXJkYXkiLCAxXQ",                # ["yesterday", 1]
+])
+def test_garbage_cursors_are_rejected(cursor):
+    with pytest.raises(crud.InvalidCursor):
+        crud.decode_cursor(cursor)
+
+
+def test_fields_keep_the_column_order():
+    assert crud.parse_fields(None) == crud.ARTICLE_FIELDS
+    assert crud.parse_fields(" link, title ,") == ("title", "link")
+    with pytest.raises(ValueError, match="Unknown fields: body"):
+        crud.parse_fields("title,body")
+
+
+def test_paging_visits_every_article_once(db):
+    source = f"Paged {uuid.uuid4().hex[:8]}"
+    # Ties on publication_date are broken by article_id
+    articles = [article(source, n, publication_date=datetime(2024, 1, 1 + n % 3, 12)) for n in range(7)]
+    crud.bulk_insert_articles(db, articles)
+    db.commit()
+
+    seen, cursor = [], None
+    for _ in range(len(articles)):
+        rows, cursor = crud.get_articles_page(db, None, source, 3, cursor, fields=("title", "publication_date"))
+        assert set(rows[0]) == {"title", "publication_date"}
+        seen.extend(rows)
+        if cursor is None:
+            break
+    assert cursor is None
+    assert sorted(row["title"] for row in seen) == sorted(a["title"] for a in articles)
+    dates = [row["publication_date"] for row in seen]
+    assert dates == sorted(dates, reverse=True)
@@ -0,0 +1,52 @@
+import asyncio
+import uuid
+from datetime import datetime
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import crud, database
+from helpers import api_get, article
+
+
+@pytest.fixture
+def stored(db):
+    source = f"Async {uuid.uuid4().hex[:8]}"
+    crud.bulk_insert_articles(db, [article(source, n, publication_date=datetime.utcnow()) for n in range(3)])
+    db.commit()
+    return source
+
+
+def query_through_dependency(source: str):
+    async def scenario():
+        dependency = database.get_async_db()
+        session = await dependency.__anext__()
+        try:
+            rows, _ = await session.run_sync(crud.get_articles_page, 24, source, 10, None, ("title", "source"))
+            return session, rows
+        finally:
+            await dependency.aclose()
+            await database.dispose_async_engine()
+
+    return asyncio.run(scenario())
+
+
+def test_handlers_query_through_aiosqlite(stored):
+    assert database.async_engine is not None
+    assert database.async_engine.url.drivername == "sqlite+aiosqlite"
+    session, rows = query_through_dependency(stored)
+    assert isinstance(session, AsyncSession)
+    assert sorted(row["title"] for row in rows) == [f"{stored} article {n}" for n in range(3)]
+
+
+def test_threadpool_session_without_an_async_driver(monkeypatch, stored):
+    monkeypatch.setattr(database, "AsyncSessionLocal", None)
+    session, rows = query_through_dependency(stored)
+    assert isinstance(session, database.ThreadpoolSession)
+    assert len(rows) == 3
+
+
+def test_articles_endpoint_reads_through_the_async_engine(stored):
+    response = api_get("/articles/", source=stored, fields="title")
+    assert response.status_code == 200
+    assert sorted(response.json(), key=lambda row: row["title"]) == [
+        {"title": f"{stored} article {n}"} for n in range(3)
+    ]
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+import pytest
+from app.dates import ISO, RELATIVE, DateParser, format_pattern, parser_for
+
+NOW = datetime(2024, 3, 10, 12, 0)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2024-03-01", datetime(2024, 3, 1)),
+    ("2024-03-01T08:30:00Z", datetime(2024, 3, 1, 8, 30)),
+    # Aware timestamps come back as naive UTC
+    ("2024-03-01T10:30:00+02:00", datetime(2024, 3, 1, 8, 30)),
+    ("2024-03-01 08:30:00.250", datetime(2024, 3, 1, 8, 30, 0, 250000)),
+])
+def test_iso(text, expected):
+    assert DateParser([ISO]).parse(text) == expected
+
+
+@pytest.mark.parametrize("text, offset", [
+    ("3 hours ago", timedelta(hours=3)),
+    ("about an hour ago", timedelta(hours=1)),
+    ("Posted 2 days ago", timedelta(days=2)),
+    ("15 mins ago", timedelta(minutes=15)),
+    ("yesterday", timedelta(days=1)),
+    ("just now", timedelta()),
+])
+def test_relative_dates_are_taken_back_from_the_reference(text, offset):
+    assert DateParser([RELATIVE]).parse(text, NOW) == NOW - offset
+
+
+def test_memoized_relative_dates_follow_the_reference():
+    parser = DateParser([RELATIVE])
+    assert parser.parse("2 hours ago", NOW) == NOW - timedelta(hours=2)
+    later = NOW + timedelta(days=1)
+    assert parser.parse("2 hours ago", later) == later - timedelta(hours=2)
+
+
+def test_strptime_formats_and_misses():
+    parser = DateParser(["%B %d, %Y", "%d %b %Y"])
+    assert parser.parse("March 5, 2024") == datetime(2024, 3, 5)
+    assert parser.parse("  5 Mar   2024 ") == datetime(2024, 3, 5)
+    # Right shape, impossible value
+    assert parser.parse("31 Feb 2024") is None
+    assert parser.parse("not a date") is None
+    assert parser.parse("") is None
+    assert parser.parse(None) is None
+
+
+def test_formats_that_match_more_often_move_first():
+    parser = DateParser(["%Y-%m-%d", "%d %b %Y"], cache_size=0)
+    for day in range(1, 4):
+        parser.parse(f"{day} Mar 2024")
+    assert parser.order == ("%d %b %Y", "%Y-%m-%d")
+
+
+def test_format_pattern_prefilters_strptime():
+    pattern = format_pattern("%d %b %Y")
+    assert pattern.fullmatch("05 Mar 2024")
+    assert not pattern.fullmatch("2024-03-05")
+
+
+def test_parser_for_shares_one_parser_per_source_and_formats():
+    assert parser_for("Source A", ("%Y",)) is parser_for("Source A", ["%Y"])
+    assert parser_for("Source A", ("%Y",)) is not parser_for("Source B", ("%Y",))
+
+
+def test_a_parser_needs_formats():
+    with pytest.raises(ValueError):
+        DateParser([])
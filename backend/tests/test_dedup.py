@@ -0,0 +1,85 @@
+import uuid
+import pytest
+from app import crud, models
+from app.dedup import (
+    LINK_MAX_LENGTH, TITLE_MAX_LENGTH, BloomFilter, SeenIndex, article_keys, canonical_url, title_fingerprint, title_hash,
+    url_hash,
+)
+from helpers import article
+
+
+@pytest.mark.parametrize("variant", [
+    "http://www.example.com/post/",
+    "https://example.com/post?utm_source=feed",
+    "https://EXAMPLE.com:443/post#comments",
+    "https://example.com/post?fbclid=abc",
+])
+def test_url_variants_share_a_canonical_form(variant):
+    assert canonical_url(variant) == "https://example.com/post"
+    assert url_hash(variant) == url_hash("https://example.com/post")
+
+
+def test_canonical_url_keeps_meaningful_query_sorted():
+    assert canonical_url("https://example.com/list?b=2&a=1") == "https://example.com/list?a=1&b=2"
+
+
+def test_arxiv_versions_are_one_article():
+    assert canonical_url("https://arxiv.org/pdf/2401.00001v3.pdf") == "https://arxiv.org/abs/2401.00001"
+    assert url_hash("http://export.arxiv.org/abs/2401.00001v1") == url_hash("https://arxiv.org/abs/2401.00001")
+
+
+def test_title_fingerprint_ignores_case_punctuation_and_spacing():
+    assert title_fingerprint("  OpenAI's  NEW model -- out now! ") == "openai s new model out now"
+    assert title_hash("OpenAI's new model, out now") == title_hash("openai s NEW model: out now")
+    assert title_hash("") is None
+    assert url_hash("   ") is None
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000)
+    bloom.update(range(0, 10_000, 10))
+    assert all(key in bloom for key in range(0, 10_000, 10))
+
+
+def test_seen_index_matches_by_url_or_title_per_source():
+    index = SeenIndex(capacity=16)
+    index.add_articles([article("A", 1), article("A", 2, link="")])
+
+    assert index.contains("A", link="http://www.example.com/a/1/")
+    assert not index.contains("B", link="https://example.com/a/1")
+    # Without a link, the title identifies the article
+    assert index.contains("A", title="A ARTICLE 2")
+    # Same story re-published under a new URL but an unchanged title
+    assert index.is_known(article("A", 1, link="https://example.com/moved"))
+    assert index.filter_new([article("A", 1), article("A", 3)]) == [article("A", 3)]
+
+
+def test_seen_index_grows_and_reloads():
+    index = SeenIndex(capacity=4)
+    index.add_articles([article("A", n) for n in range(50)])
+    assert all(index.is_known(article("A", n)) for n in range(50))
+
+    rows = [("A", url_hash(a["link"]), title_hash(a["title"])) for a in (article("A", n) for n in range(3))]
+    assert index.load(rows) == 6
+    assert index.is_known(article("A", 2))
+    assert not index.is_known(article("A", 10))
+
+
+def test_key_lengths_match_the_columns():
+    columns = models.Article.__table__.c
+    assert (columns.link.type.length, columns.title.type.length) == (LINK_MAX_LENGTH, TITLE_MAX_LENGTH)
+
+
+def test_long_articles_are_known_after_a_reload(db):
+    source = f"Long {uuid.uuid4().hex[:8]}"
+    long_one = article(source, 1, title="Benchmarks " * 40, link="https://example.com/" + "x" * 600)
+    crud.bulk_insert_articles(db, [long_one])
+    db.commit()
+
+    # The index of a restarted worker, warmed from the stored (truncated) rows
+    rows = [row for row in crud.iter_dedup_keys(db) if row[0] == source]
+    assert rows == [(source, *article_keys(long_one))]
+    index = SeenIndex(capacity=16)
+    index.load(rows)
+    assert index.is_known(long_one)
+    assert index.contains(source, link=long_one["link"])
@@ -0,0 +1,71 @@
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+import pytest
+from app import crud, export
+from helpers import api_get, article
+
+ROWS = [(n, f"Title {n}", datetime(2024, 1, n)) for n in range(1, 6)]
+FIELDS = ("article_id", "title", "publication_date")
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(export, "CHUNK_ROWS", 2)
+
+
+@pytest.mark.parametrize("count, sizes", [(5, [2, 2, 1]), (4, [2, 2]), (0, [])])
+def test_ndjson_chunks_hold_chunk_rows_lines(small_chunks, count, sizes):
+    chunks = list(export._ndjson_chunks(iter(ROWS[:count]), FIELDS))
+    assert [chunk.count("\n") for chunk in chunks] == sizes
+    lines = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert lines[:1] == [{"article_id": 1, "title": "Title 1", "publication_date": "2024-01-01T00:00:00"}][:count]
+
+
+@pytest.mark.parametrize("count, sizes", [(5, [3, 2, 1]), (4, [3, 2]), (0, [1])])
+def test_csv_chunks_start_with_the_header(small_chunks, count, sizes):
+    chunks = list(export._csv_chunks(iter(ROWS[:count]), FIELDS))
+    assert [len(chunk.splitlines()) for chunk in chunks] == sizes
+    rows = list(csv.reader(io.StringIO("".join(chunks))))
+    assert rows[0] == list(FIELDS)
+    assert rows[1:2] == [["1", "Title 1", "2024-01-01T00:00:00"]][:count]
+
+
+@pytest.fixture
+def stored(db):
+    source = f"Export {uuid.uuid4().hex[:8]}"
+    crud.bulk_insert_articles(db, [
+        article(source, n, title=f"Export, \"{n}\"", publication_date=datetime(2024, 2, n)) for n in range(1, 6)
+    ])
+    crud.bulk_insert_articles(db, [article(f"{source} other", 1, publication_date=datetime(2024, 2, 3))])
+    db.commit()
+    return source
+
+
+def test_ndjson_export_applies_the_filters(stored):
+    response = api_get(
+        "/articles/export", format="ndjson", source=stored, since="2024-02-02T00:00:00", until="2024-02-05T00:00:00", fields="link,title"
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert 'filename="articles.ndjson"' in response.headers["content-disposition"]
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    # Newest first, since inclusive, until exclusive, fields in column order
+    assert [list(line) for line in lines] == [["title", "link"]] * 3
+    assert [line["title"] for line in lines] == ['Export, "4"', 'Export, "3"', 'Export, "2"']
+
+
+def test_csv_export_quotes_values(stored):
+    response = api_get("/articles/export", format="csv", source=stored, fields="title,publication_date")
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["title", "publication_date"]
+    assert rows[1] == ['Export, "5"', "2024-02-05T00:00:00"]
+    assert len(rows) == 6
+
+
+def test_export_rejects_unknown_formats_and_fields():
+    assert api_get("/articles/export", format="xml").status_code == 400
+    assert api_get("/articles/export", fields="title,body").status_code == 400
@@ -0,0 +1,39 @@
+import importlib.util
+import os
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine
+from app import dedup, models, search
+from app.schema import MIGRATIONS_DIR, ensure_schema
+
+
+def load_migration(filename: str):
+    spec = importlib.util.spec_from_file_location(filename[:-3], os.path.join(MIGRATIONS_DIR, "versions", filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_dedup_migration_hashes_like_the_app():
+    migration = load_migration("0005_articles_dedup_hashes.py")
+    for url in (
+        "https://www.arxiv.org/abs/2401.00001v2",
+        "http://example.com/post/?utm_source=x&b=2&a=1#top",
+        "  ",
+    ):
+        assert migration.url_hash(url) == dedup.url_hash(url)
+    for title in ("OpenAI's New Model!", "", None):
+        assert migration.title_hash(title) == dedup.title_hash(title)
+
+
+def test_autogenerate_leaves_the_search_objects_alone(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'head.db'}")
+    ensure_schema(engine)
+    with engine.connect() as conn:
+        unfiltered = compare_metadata(MigrationContext.configure(conn), models.Base.metadata)
+        context = MigrationContext.configure(
+            conn, opts={"include_object": lambda obj, name, *rest: not search.is_search_object(name)}
+        )
+        filtered = compare_metadata(context, models.Base.metadata)
+    assert any("articles_fts" in str(diff) for diff in unfiltered)
+    assert not any("articles_fts" in str(diff) for diff in filtered)
@@ -0,0 +1,21 @@
+from app.config import settings
+from app.scrapers.parse_pool import THREADS_PER_WEB_WORKER, pool_kind, pool_size
+
+
+def test_auto_pool_uses_a_few_threads_under_several_web_workers(monkeypatch):
+    monkeypatch.setattr(settings, "PARSE_POOL", "auto")
+    monkeypatch.setattr(settings, "PARSE_WORKERS", 0)
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 4)
+    # Parsing stays off the event loop
+    assert pool_kind() == "thread"
+    assert pool_size() == THREADS_PER_WEB_WORKER
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 0)
+    assert pool_kind() == "process"
+    monkeypatch.setattr(settings, "PARSE_WORKERS", 3)
+    assert pool_size() == 3
+
+
+def test_explicit_pool_kind_wins(monkeypatch):
+    monkeypatch.setattr(settings, "PARSE_POOL", "inline")
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 4)
+    assert pool_kind() == "inline"
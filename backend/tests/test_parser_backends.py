@@ -0,0 +1,8 @@
+from benchmarks import parser_backends
+
+
+def test_backends_extract_identical_articles():
+    report = parser_backends.run(items=10, repeat=1)
+    assert report["sources"]
+    for name, source in report["sources"].items():
+        assert source["identical"], name
@@ -0,0 +1,131 @@
+import asyncio
+import uuid
+from typing import Dict, List
+import httpx
+from app.pipeline import IngestPipeline
+from app.scrapers.base_scraper import BaseScraper
+from app.scrapers.http_client import HttpClient
+from app.scrapers.validator_cache import ValidatorCache
+from helpers import article
+
+LISTING = "https://listing.example.com/news"
+
+
+class ListingScraper(BaseScraper):
+    base_url = LISTING
+
+    def parse_page(self, html: str) -> List[Dict]:
+        return [article(self.source_name, n) for n in html.split()]
+
+    def parse_article(self, article_data) -> Dict:
+        return article_data
+
+
+def listing_transport() -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text="1 2 3", headers={"ETag": '"v1"'})
+
+    return httpx.MockTransport(handler)
+
+
+def refresh(tmp_path, store) -> Dict:
+    validators = ValidatorCache(str(tmp_path / "validators.json"))
+    scraper = ListingScraper(f"Listing {uuid.uuid4().hex[:8]}")
+    scraper.bind_http(HttpClient(transport=listing_transport(), validators=validators))
+
+    async def scenario():
+        try:
+            return await IngestPipeline(store=store).run([scraper])
+        finally:
+            await scraper.http.close()
+
+    report = asyncio.run(scenario())
+    return {"report": report[scraper.source_name], "validators": validators.request_headers(LISTING)}
+
+
+def test_validators_are_saved_once_the_listing_is_stored(tmp_path):
+    result = refresh(tmp_path, lambda articles: {articles[0]["source"]: len(articles)})
+    assert result["report"]["status"] == "succeeded"
+    assert result["report"]["inserted"] == 3
+    assert result["validators"] == {"If-None-Match": '"v1"'}
+
+
+def test_validators_are_not_saved_when_storing_fails(tmp_path):
+    def broken(articles):
+        raise RuntimeError("database is locked")
+
+    result = refresh(tmp_path, broken)
+    assert result["report"]["status"] == "failed"
+    # The next refresh downloads the listing again instead of getting a 304
+    assert result["validators"] == {}
+
+
+class PagedScraper(ListingScraper):
+    max_pages = 3
+
+    def page_url(self, page: int) -> str:
+        return LISTING if page == 1 else f"{LISTING}?page={page}"
+
+
+def test_paginated_listing_keeps_the_first_page_validators(tmp_path):
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        page = request.url.params.get("page", "1")
+        if request.headers.get("If-None-Match") == f'"p{page}"':
+            return httpx.Response(304)
+        return httpx.Response(200, text=f"{page}1 {page}2", headers={"ETag": f'"p{page}"'})
+
+    validators = ValidatorCache(str(tmp_path / "validators.json"))
+    scraper = PagedScraper(f"Paged {uuid.uuid4().hex[:8]}")
+    scraper.bind_http(HttpClient(transport=httpx.MockTransport(handler), validators=validators))
+    stored: List[Dict] = []
+
+    def store(articles):
+        stored.extend(articles)
+        return {scraper.source_name: len(articles)}
+
+    async def scenario():
+        try:
+            first = await IngestPipeline(store=store).run([scraper])
+            second = await IngestPipeline(store=store).run([scraper])
+            return first, second
+        finally:
+            await scraper.http.close()
+
+    first, second = asyncio.run(scenario())
+    assert first[scraper.source_name]["inserted"] == 6
+    assert validators.request_headers(LISTING) == {"If-None-Match": '"p1"'}
+    assert validators.request_headers(f"{LISTING}?page=3") == {}
+    # The second crawl is a single conditional request answered with a 304
+    assert len(requests) == 4
+    assert requests[-1].headers.get("If-None-Match") == '"p1"'
+    assert second[scraper.source_name]["inserted"] == 0
+
+
+def test_failed_deeper_page_fails_the_crawl(tmp_path):
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = request.url.params.get("page", "1")
+        if page == "2":
+            return httpx.Response(404)
+        return httpx.Response(200, text=f"{page}1 {page}2", headers={"ETag": f'"p{page}"'})
+
+    validators = ValidatorCache(str(tmp_path / "validators.json"))
+    scraper = PagedScraper(f"Paged {uuid.uuid4().hex[:8]}")
+    scraper.bind_http(HttpClient(transport=httpx.MockTransport(handler), validators=validators))
+
+    async def scenario():
+        try:
+            return await IngestPipeline(store=lambda articles: {scraper.source_name: len(articles)}).run([scraper])
+        finally:
+            await scraper.http.close()
+
+    report = asyncio.run(scenario())[scraper.source_name]
+    assert report["status"] == "failed"
+    assert "404" in report["error"]
+    # Page 1 is stored, but not marked unchanged: the next refresh crawls again
+    assert report["inserted"] == 2
+    assert validators.request_headers(LISTING) == {}
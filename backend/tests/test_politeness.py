@@ -0,0 +1,179 @@
+import asyncio
+import types
+from typing import Dict, List
+import httpx
+import pytest
+from app.scrapers import http_client, politeness
+from app.scrapers.http_client import HttpClient
+from app.scrapers.politeness import CircuitOpen, PolitenessScheduler
+
+URL = "https://news.example.com/list"
+_sleep = asyncio.sleep
+
+
+class FakeClock:
+    """
+    time.monotonic and asyncio.sleep for the scheduler: a sleeper lets the
+    other ready tasks run, then moves the clock to its wake-up time
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: List[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        wake = self.now + seconds
+        await _sleep(0)
+        self.now = max(self.now, wake)
+
+
+class _Asyncio:
+    def __init__(self, clock: FakeClock):
+        self.sleep = clock.sleep
+
+    def __getattr__(self, name):
+        return getattr(asyncio, name)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(politeness, "time", clock)
+    monkeypatch.setattr(politeness, "asyncio", _Asyncio(clock))
+    monkeypatch.setattr(http_client, "asyncio", _Asyncio(clock))
+    # Backoff at the top of its jitter range
+    monkeypatch.setattr(politeness, "random", types.SimpleNamespace(uniform=lambda low, high: high))
+    return clock
+
+
+async def no_robots(url: str):
+    return None
+
+
+def scheduler(**options) -> PolitenessScheduler:
+    defaults = dict(rate=2, burst=1, max_retries=3, backoff_base=0.5, backoff_max=1.5, respect_robots=False)
+    return PolitenessScheduler(**{**defaults, **options})
+
+
+def test_requests_to_a_host_are_spaced_in_arrival_order(clock):
+    polite = scheduler()
+
+    async def scenario():
+        await asyncio.gather(*(polite.acquire(URL, None, no_robots) for _ in range(3)))
+        # Another host has its own bucket
+        await polite.acquire("https://other.example.com/", None, no_robots)
+
+    asyncio.run(scenario())
+    assert clock.sleeps == [0.5, 1.0]
+
+
+def test_robots_crawl_delay_lowers_the_rate(clock):
+    polite = scheduler(respect_robots=True)
+
+    async def robots(url: str):
+        assert url == "https://news.example.com/robots.txt"
+        return "User-agent: *\nCrawl-delay: 4\n"
+
+    async def scenario():
+        for _ in range(2):
+            await polite.acquire(URL, None, robots)
+
+    asyncio.run(scenario())
+    assert polite.host(URL).bucket.rate == 0.25
+    assert clock.sleeps == [4.0]
+
+
+def test_retry_after_pauses_the_host_and_halves_its_rate(clock):
+    polite = scheduler(rate=10, burst=5)
+    response = httpx.Response(429, headers={"Retry-After": "3"})
+    assert polite.completed(URL, None, 0, response) == 3.0
+    assert polite.host(URL).bucket.rate == 5
+    # Every other request to the host waits it out too
+    assert polite.host(URL).bucket.reserve() == 3.0
+    # Longer than HTTP_MAX_RETRY_AFTER: give up instead of waiting
+    assert polite.completed(URL, None, 0, httpx.Response(503, headers={"Retry-After": "600"})) is None
+
+
+def client_for(responses: List[httpx.Response], polite: PolitenessScheduler):
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return responses.pop(0)
+
+    return HttpClient(transport=httpx.MockTransport(handler), validators=None, politeness=polite), requests
+
+
+def get(client: HttpClient, url: str = URL) -> httpx.Response:
+    async def scenario():
+        try:
+            return await client.get(url, "News")
+        finally:
+            await client.close()
+
+    return asyncio.run(scenario())
+
+
+def test_retryable_statuses_back_off_exponentially(clock):
+    client, requests = client_for(
+        [httpx.Response(502), httpx.Response(504), httpx.Response(502), httpx.Response(200, text="ok")],
+        scheduler(rate=0),
+    )
+    assert get(client).text == "ok"
+    assert len(requests) == 4
+    # base * 2^attempt, capped at backoff_max
+    assert clock.sleeps == [0.5, 1.0, 1.5]
+
+
+def test_retry_after_is_honoured_by_the_client(clock):
+    client, requests = client_for(
+        [httpx.Response(503, headers={"Retry-After": "7"}), httpx.Response(200)], scheduler(rate=10, burst=5)
+    )
+    assert get(client).status_code == 200
+    assert clock.sleeps == [7.0]
+
+
+def test_breaker_opens_after_repeated_failures_and_recovers(clock):
+    polite = scheduler(rate=0, max_retries=0, breaker_threshold=2, breaker_cooldown=30)
+    client, requests = client_for([httpx.Response(503)] * 2 + [httpx.Response(200)], polite)
+    assert get(client).status_code == 503
+    assert get(client).status_code == 503
+    with pytest.raises(CircuitOpen):
+        get(client)
+    assert len(requests) == 2
+
+    clock.now += 30
+    # Half-open: one trial request, which closes the breaker again
+    assert get(client).status_code == 200
+    assert polite.breaker("News").state == polite.breaker("News").CLOSED
+
+
+def test_in_flight_requests_are_capped_per_host():
+    in_flight: Dict[str, int] = {}
+    peak: Dict[str, int] = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        in_flight[host] = in_flight.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), in_flight[host])
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        return httpx.Response(200)
+
+    client = HttpClient(
+        transport=httpx.MockTransport(handler), validators=None, per_host_limit=2, politeness=scheduler(rate=0)
+    )
+
+    async def scenario():
+        try:
+            urls = [f"{URL}?page={n}" for n in range(6)] + ["https://other.example.com/a", "https://other.example.com/b"]
+            await asyncio.gather(*(client.get(url) for url in urls))
+        finally:
+            await client.close()
+
+    asyncio.run(scenario())
+    assert peak == {"news.example.com": 2, "other.example.com": 2}
@@ -0,0 +1,37 @@
+from datetime import datetime
+from app import models
+from app.clustering import cluster_index
+from app.dedup import seen_index
+from app.ingestion import ingest_articles
+from app.reparse import reparse
+from app.scrapers.archive import SnapshotArchive
+from app.scrapers.declarative import load_scrapers
+from benchmarks.fixtures import load_pages
+
+# Relative dates: parsed at a recent fetch time, its articles fall in the cluster window
+SOURCE = "Hugging Face Blog"
+
+
+def test_reparse_clusters_with_articles_stored_before_it_ran(tmp_path, db):
+    html = load_pages(5)[SOURCE]
+    fetched_at = datetime.utcnow().replace(microsecond=0)
+    scraper = next(scraper for scraper in load_scrapers() if scraper.source_name == SOURCE)
+    scraper.fetched_at = fetched_at
+    first = scraper.parse_page(html)[0]
+
+    # The same story stored earlier from another source, then a fresh process
+    ingest_articles([{**first, "source": "Reparse Elsewhere", "link": "https://elsewhere.example.com/story"}])
+    seen_index.load([])
+    cluster_index.load([])
+
+    archive = SnapshotArchive(str(tmp_path / "snapshots"), retention_days=0)
+    archive.put(SOURCE, scraper.base_url, html.encode("utf-8"), fetched_at)
+    report = reparse(archive, sources=[SOURCE], workers=1)
+
+    assert report[SOURCE]["snapshots"] == 1
+    assert report[SOURCE]["inserted"] == report[SOURCE]["articles"] > 0
+    rows = {
+        row.link: row.cluster_id
+        for row in db.query(models.Article).filter(models.Article.link.in_([first["link"], "https://elsewhere.example.com/story"]))
+    }
+    assert rows[first["link"]] == rows["https://elsewhere.example.com/story"]
@@ -0,0 +1,51 @@
+import asyncio
+import uuid
+from app.scheduler import RefreshScheduler
+from helpers import FakeManager, FakeScraper
+
+
+def unique(prefix: str) -> str:
+    return f"{prefix} {uuid.uuid4().hex[:8]}"
+
+
+async def finished(scheduler: RefreshScheduler, job_id: str) -> dict:
+    for _ in range(200):
+        job = await scheduler.get_job(job_id)
+        if job["finished_at"] is not None:
+            return job
+        await asyncio.sleep(0.05)
+    raise AssertionError("job never finished")
+
+
+def test_job_keeps_finished_results_and_names_timed_out_sources():
+    fast, slow = FakeScraper(unique("Fast")), FakeScraper(unique("Slow"), delay=5)
+
+    async def scenario():
+        scheduler = RefreshScheduler(FakeManager([fast, slow], deadline=0.5))
+        job = await scheduler.enqueue()
+        job = await finished(scheduler, job["job_id"])
+        await scheduler.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job["status"] == "partial"
+    assert job["results"][fast.source_name]["status"] == "succeeded"
+    assert job["count"] == 1
+    assert job["timed_out"] == [slow.source_name]
+    assert job["results"][slow.source_name] == {"status": "timed_out"}
+
+
+def test_job_where_every_source_failed_is_failed():
+    broken = FakeScraper(unique("Broken"), error=RuntimeError("markup changed"))
+
+    async def scenario():
+        scheduler = RefreshScheduler(FakeManager([broken]))
+        job = await scheduler.enqueue()
+        job = await finished(scheduler, job["job_id"])
+        await scheduler.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job["status"] == "failed"
+    assert job["results"][broken.source_name]["status"] == "failed"
+    assert "markup changed" in job["results"][broken.source_name]["error"]
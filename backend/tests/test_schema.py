@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+import pytest
+from sqlalchemy import create_engine, text
+from app import models, search
+from app.schema import SchemaError, ensure_schema, head_revision
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def alembic(url: str, *args: str) -> None:
+    subprocess.run(
+        [sys.executable, "-m", "alembic", *args],
+        cwd=BACKEND_DIR, env={**os.environ, "DATABASE_URL": url}, check=True, capture_output=True,
+    )
+
+
+def revision(engine) -> str:
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+def test_empty_database_is_created_at_head(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    ensure_schema(engine)
+    assert revision(engine) == head_revision()
+    # Later starts find it at head and leave it alone
+    ensure_schema(engine)
+
+
+def test_database_behind_head_is_refused(tmp_path):
+    url = f"sqlite:///{tmp_path / 'behind.db'}"
+    alembic(url, "upgrade", "0004")
+    with pytest.raises(SchemaError, match="alembic upgrade head"):
+        ensure_schema(create_engine(url))
+
+
+def test_database_served_before_stamping_upgrades_and_fills_sources(tmp_path):
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE articles (article_id INTEGER PRIMARY KEY, title VARCHAR(255) NOT NULL, summary TEXT, "
+            "link VARCHAR(500) NOT NULL, publication_date DATETIME NOT NULL, source VARCHAR(100) NOT NULL)"
+        ))
+        for n, source in enumerate(("Nature AI Special", "Nature AI Special", "TechCrunch AI")):
+            conn.execute(
+                text("INSERT INTO articles (title, link, publication_date, source) VALUES (:t, :l, '2024-01-0' || :d, :s)"),
+                {"t": f"Article {n}", "l": f"https://example.com/{n}", "d": n + 1, "s": source},
+            )
+    # What the previous startup's create_all() added next to the legacy table
+    models.Base.metadata.create_all(bind=engine)
+    search.ensure_search_index(engine)
+    with pytest.raises(SchemaError, match="alembic stamp 0001"):
+        ensure_schema(engine)
+
+    alembic(url, "stamp", "0001")
+    alembic(url, "upgrade", "head")
+    ensure_schema(engine)
+    with engine.connect() as conn:
+        counts = dict(conn.execute(text("SELECT name, article_count FROM sources")).fetchall())
+    assert counts == {"Nature AI Special": 2, "TechCrunch AI": 1}
+
+
+def test_search_migration_indexes_existing_rows(tmp_path):
+    url = f"sqlite:///{tmp_path / 'search.db'}"
+    alembic(url, "upgrade", "0006")
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO articles (title, summary, link, publication_date, source) "
+            "VALUES ('Sparse attention explained', '', 'https://example.com/1', '2024-01-01', 'Blog')"
+        ))
+
+    def matches() -> int:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT count(*) FROM articles_fts WHERE articles_fts MATCH 'attention'")).scalar()
+
+    alembic(url, "upgrade", "0007")
+    assert matches() == 1
+    alembic(url, "downgrade", "0006")
+    with engine.connect() as conn:
+        assert "articles_fts" not in set(conn.execute(text("SELECT name FROM sqlite_master")).scalars())
+    alembic(url, "upgrade", "head")
+    assert matches() == 1
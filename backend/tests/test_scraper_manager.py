@@ -0,0 +1,36 @@
+import asyncio
+from app.scrapers.scraper_manager import ScraperManager
+from helpers import FakeScraper
+
+
+def test_report_names_the_sources_that_failed():
+    manager = ScraperManager()
+    manager.scrapers = [FakeScraper("Working"), FakeScraper("Broken", error=RuntimeError("markup changed"))]
+
+    async def scenario():
+        try:
+            return await manager.fetch_with_report()
+        finally:
+            await manager.shutdown()
+
+    articles, report = asyncio.run(scenario())
+    assert len(articles) == 1
+    assert report["succeeded"] == {"Working": 1}
+    assert report["failed"] == {"Broken": "markup changed"}
+
+
+def test_timeout_is_reported_with_the_scraper_budget(caplog):
+    manager = ScraperManager(source_timeout=5)
+    slow = FakeScraper("Slow harvest", delay=1)
+    slow.timeout = 0.05
+    manager.scrapers = [slow]
+
+    async def scenario():
+        try:
+            return await manager.fetch_with_report()
+        finally:
+            await manager.shutdown()
+
+    _, report = asyncio.run(scenario())
+    assert report["timed_out"] == ["Slow harvest"]
+    assert "Timed out fetching articles from Slow harvest after 0.05s" in caplog.text
@@ -0,0 +1,64 @@
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from app import crud, search
+from helpers import api_get, article
+
+
+@pytest.fixture
+def stored(db):
+    source = f"Search {uuid.uuid4().hex[:8]}"
+    now = datetime.utcnow()
+    articles = [
+        article(source, 1, title="Transformers scale to a trillion parameters", summary="A new model family",
+                publication_date=now - timedelta(hours=1)),
+        article(source, 2, title="Robots learn <script>alert(1)</script> tricks", summary="Transformers & robots",
+                publication_date=now - timedelta(hours=2)),
+        article(source, 3, title="Diffusion models for video", summary="Older news",
+                publication_date=now - timedelta(days=10)),
+    ]
+    crud.bulk_insert_articles(db, articles)
+    db.commit()
+    return source
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("large model", '"large" AND "model"'),
+    ('"exact phrase" -noise', '"exact phrase" NOT "noise"'),
+    ("gpt or llama", '("gpt" OR "llama")'),
+    ('AND NEAR( "" -', '"AND" AND "NEAR(" AND "-"'),
+    ('say "hi', '"say" AND "hi"'),
+    ("-only -excluded", ""),
+])
+def test_fts5_query_quotes_every_term(query, expected):
+    assert search.fts5_query(query) == expected
+
+
+def test_matches_are_ranked_and_filtered(db, stored):
+    results = search.search_articles(db, "transformers", source=stored)
+    # The title match outranks the summary match
+    assert [r["title"] for r in results] == [
+        "Transformers scale to a trillion parameters",
+        "Robots learn <script>alert(1)</script> tricks",
+    ]
+    assert results[0]["rank"] > results[1]["rank"]
+    assert search.search_articles(db, "diffusion", source=stored, timeframe=24) == []
+    assert len(search.search_articles(db, "diffusion", source=stored)) == 1
+    assert search.search_articles(db, "transformers -robots", source=stored)[0]["link"].endswith("/1")
+
+
+def test_highlights_escape_the_scraped_text(db, stored):
+    result = search.search_articles(db, "robots", source=stored)[0]
+    assert result["highlights"]["title"] == (
+        "<mark>Robots</mark> learn &lt;script&gt;alert(1)&lt;/script&gt; tricks"
+    )
+    assert result["highlights"]["summary"] == "Transformers &amp; <mark>robots</mark>"
+
+
+def test_search_endpoint(stored):
+    response = api_get("/search", q="trillion", source=stored)
+    assert response.status_code == 200
+    assert [r["highlights"]["title"] for r in response.json()] == [
+        "Transformers scale to a <mark>trillion</mark> parameters"
+    ]
+    assert api_get("/search", q="").status_code == 422
@@ -0,0 +1,33 @@
+import multiprocessing
+from app.scrapers.store import JsonFileStore
+
+
+def write_keys(path: str, prefix: str, count: int) -> None:
+    store = JsonFileStore(path)
+    for n in range(count):
+        store.set(f"{prefix}{n}", n)
+
+
+def test_writers_sharing_a_file_keep_each_others_keys(tmp_path):
+    path = str(tmp_path / "state.json")
+    first, second = JsonFileStore(path), JsonFileStore(path)
+    first.set("a", 1)
+    second.set("b", 2)
+    assert JsonFileStore(path).get("a") == 1
+    # Reads see the other instance's writes
+    assert first.get("b") == 2
+    second.delete("a")
+    assert first.get("a") is None
+
+
+def test_concurrent_processes_lose_no_writes(tmp_path):
+    path = str(tmp_path / "state.json")
+    workers = [
+        multiprocessing.Process(target=write_keys, args=(path, prefix, 25)) for prefix in ("x", "y", "z")
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    store = JsonFileStore(path)
+    assert all(store.get(f"{prefix}{n}") == n for prefix in ("x", "y", "z") for n in range(25))